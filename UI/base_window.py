@@ -1,7 +1,6 @@
-import os
-import sys
-from PyQt6 import QtWidgets, uic
-from src.utils import resource_path
+from PyQt6 import QtWidgets
+
+from UI.ui_window import Ui_Dialog
 
 
 class BaseWindow(QtWidgets.QDialog):
@@ -9,18 +8,19 @@ class BaseWindow(QtWidgets.QDialog):
     Base window class that provides common functionality for UI windows.
     """
 
-    def __init__(self, ui_file="window.ui"):
+    def __init__(self, ui_class=Ui_Dialog):
         """
         Initialize the base window.
 
         Args:
-            ui_file: Name of the UI file in the UI directory
+            ui_class: UI class compiled from a .ui file with pyuic6
+                (pyuic6 UI/window.ui -o UI/ui_window.py)
         """
         super(BaseWindow, self).__init__()
 
-        # Load UI
-        ui_path = resource_path(os.path.join("UI", ui_file))
-        uic.loadUi(ui_path, self)
+        # Build the precompiled UI instead of parsing the .ui file at runtime
+        self.ui = ui_class()
+        self.ui.setupUi(self)
 
         # Store selected file paths
         self.selected_files = []
@@ -34,9 +34,9 @@ class BaseWindow(QtWidgets.QDialog):
             self.button_choose_statements.clicked.connect(self.open_file_dialog)
 
     def open_file_dialog(self):
-        """Open file dialog to select Amazon statement CSV files"""
+        """Open file dialog to select Amazon statement CSV or XLSX files"""
         options = QtWidgets.QFileDialog.Option.ReadOnly
-        file_filter = "CSV Files (*.csv);;All Files (*)"
+        file_filter = "Statements (*.csv *.xlsx);;CSV Files (*.csv);;Excel Workbooks (*.xlsx);;All Files (*)"
 
         files, _ = QtWidgets.QFileDialog.getOpenFileNames(
             self,
@@ -0,0 +1,73 @@
+from PyQt6 import QtCore
+
+
+STAGE_LABELS = {
+    'read': "Read",
+    'dates': "Converted dates",
+    'fx': "Converted currency",
+    'cached': "Reused unchanged statement",
+    'merge': "Merged statements"
+}
+
+
+class MergeWorker(QtCore.QObject):
+    """
+    Runs StatementMerger.merge_statements off the GUI thread.
+    Progress and the result are reported back through signals, so the Qt
+    event loop keeps running while statements are processed.
+    """
+
+    progress = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, merger, file_paths):
+        """
+        Initialize the worker.
+
+        Args:
+            merger: StatementMerger used for processing
+            file_paths: Statement files to merge
+        """
+        super(MergeWorker, self).__init__()
+        self.merger = merger
+        self.file_paths = file_paths
+        self._cancel_requested = False
+
+    def cancel(self):
+        """
+        Request cancellation. Called directly from the GUI thread, since the
+        worker thread is busy and would not process a queued slot call.
+        """
+        self._cancel_requested = True
+
+    def is_cancelled(self):
+        return self._cancel_requested
+
+    def report_progress(self, file_path, stage):
+        """Forward a finished processing stage as a progress message"""
+        label = STAGE_LABELS.get(stage, stage)
+        message = label if file_path is None else f"{label}: {file_path.name}"
+        self.progress.emit(message)
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """Merge the statements and emit finished, failed or cancelled"""
+        # Imported here so the GUI can start without loading pandas
+        from src.statement_merger import MergeCancelled
+
+        try:
+            merged_data = self.merger.merge_statements(
+                self.file_paths,
+                progress_callback=self.report_progress,
+                is_cancelled=self.is_cancelled
+            )
+        except MergeCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        self.finished.emit(merged_data)
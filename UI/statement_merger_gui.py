@@ -1,6 +1,11 @@
-from PyQt6 import QtWidgets
+import os
 import sys
+
+from dotenv import load_dotenv
+from PyQt6 import QtCore, QtWidgets
+
 from UI.base_window import BaseWindow
+from UI.merge_worker import MergeWorker
 
 
 class MainWindow(BaseWindow):
@@ -11,10 +16,16 @@ class MainWindow(BaseWindow):
 
     def __init__(self):
         """Initialize the main window for statement merger."""
-        super(MainWindow, self).__init__("window.ui")
+        super(MainWindow, self).__init__()
+
+        # Background merge state - set while a merge is running
+        self.merge_thread = None
+        self.merge_worker = None
+        self.merged_data = None
+        # Rates fetched by one merge are reused by the next ones (created with the first merger)
+        self.rate_memo = None
 
         # Additional UI elements specific to the main window
-        # For example, if you have a process button:
         self.process_button = self.findChild(QtWidgets.QPushButton, "processButton")
         if self.process_button:
             self.process_button.clicked.connect(self.process_files)
@@ -22,27 +33,100 @@ class MainWindow(BaseWindow):
         # Additional initialization specific to the merger application
         self.setWindowTitle("Amazon Statement Merger")
 
+    def create_merger(self):
+        """
+        Create the StatementMerger used for processing.
+        The FRED API key is read from the FRED_API_KEY environment variable
+        (or a .env file). Processing modules (pandas, fredapi) are imported
+        here rather than at startup, so the window shows quickly.
+        All mergers share one rate memo, so repeated merges do not fetch
+        the same rates again.
+        """
+        from src.rate_memo import RateMemo
+        from src.statement_merger import StatementMerger
+
+        if self.rate_memo is None:
+            self.rate_memo = RateMemo()
+
+        load_dotenv()
+        return StatementMerger(os.environ.get("FRED_API_KEY"), rate_memo=self.rate_memo)
+
     def process_files(self):
         """
-        Process the selected files.
-        This is a placeholder for the actual processing logic.
+        Process the selected files in a background thread.
+        Clicking again while a merge is running cancels it.
         """
-        # Implement the file processing logic here
+        if self.merge_thread is not None:
+            self.cancel_processing()
+            return
+
         if not self.selected_files:
-            # Show message that no files are selected
+            self.show_status("No statement files selected")
+            return
+
+        try:
+            merger = self.create_merger()
+        except ValueError as e:
+            self.show_status(f"Cannot start processing: {e}")
             return
 
-        # Process files logic would go here
-        # For example:
-        # 1. Get API key from UI
-        # 2. Create StatementMerger instance
-        # 3. Call merge_statements method
-        # 4. Handle results (display, save, etc.)
+        self.merge_thread = QtCore.QThread(self)
+        self.merge_worker = MergeWorker(merger, list(self.selected_files))
+        self.merge_worker.moveToThread(self.merge_thread)
 
-        # Update UI to show processing result
-        # This is a placeholder
+        # Signals from the worker are delivered in the GUI thread
+        self.merge_thread.started.connect(self.merge_worker.run)
+        self.merge_worker.progress.connect(self.show_status)
+        self.merge_worker.finished.connect(self.on_merge_finished)
+        self.merge_worker.failed.connect(self.on_merge_failed)
+        self.merge_worker.cancelled.connect(self.on_merge_cancelled)
+        for signal in (self.merge_worker.finished, self.merge_worker.failed, self.merge_worker.cancelled):
+            signal.connect(self.merge_thread.quit)
+        self.merge_thread.finished.connect(self.on_thread_finished)
+
+        if self.process_button:
+            self.process_button.setText("Cancel")
+        self.show_status("\nProcessing started...")
+        self.merge_thread.start()
+
+    def cancel_processing(self):
+        """Ask the running merge to stop after its current stage"""
+        if self.merge_worker is not None:
+            self.merge_worker.cancel()
+            self.show_status("Cancelling...")
+
+    def show_status(self, message):
+        """Append a status line to the file list"""
         if self.text_edit_file_list:
-            self.text_edit_file_list.append("\nProcessing complete!")
+            self.text_edit_file_list.append(message)
+
+    def on_merge_finished(self, merged_data):
+        self.merged_data = merged_data
+        self.show_status(f"\nProcessing complete! Merged {len(merged_data)} rows.")
+
+    def on_merge_failed(self, error):
+        self.show_status(f"\nProcessing failed: {error}")
+
+    def on_merge_cancelled(self):
+        self.show_status("\nProcessing cancelled.")
+
+    def closeEvent(self, event):
+        """Stop a running merge before the window (and its thread) goes away"""
+        if self.merge_thread is not None:
+            self.merge_worker.cancel()
+            self.merge_thread.quit()
+            self.merge_thread.wait()
+        super(MainWindow, self).closeEvent(event)
+
+    def on_thread_finished(self):
+        """Release the worker and thread and re-enable processing"""
+        self.merge_worker.deleteLater()
+        self.merge_thread.deleteLater()
+        self.merge_worker = None
+        self.merge_thread = None
+
+        if self.process_button:
+            self.process_button.setText("Merge the statements")
 
 
 def main():
@@ -56,4 +140,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
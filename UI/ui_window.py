@@ -0,0 +1,60 @@
+# Form implementation generated from reading ui file 'UI/window.ui'
+#
+# Created by: PyQt6 UI code generator 6.1.0
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(585, 477)
+        self.buttonAddStatements = QtWidgets.QPushButton(Dialog)
+        self.buttonAddStatements.setGeometry(QtCore.QRect(10, 10, 191, 24))
+        self.buttonAddStatements.setObjectName("buttonAddStatements")
+        self.pushButton_2 = QtWidgets.QPushButton(Dialog)
+        self.pushButton_2.setGeometry(QtCore.QRect(10, 170, 191, 24))
+        self.pushButton_2.setObjectName("pushButton_2")
+        self.lineEdit_2 = QtWidgets.QLineEdit(Dialog)
+        self.lineEdit_2.setEnabled(True)
+        self.lineEdit_2.setGeometry(QtCore.QRect(210, 170, 251, 21))
+        self.lineEdit_2.setFrame(True)
+        self.lineEdit_2.setReadOnly(True)
+        self.lineEdit_2.setObjectName("lineEdit_2")
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setGeometry(QtCore.QRect(10, 140, 171, 21))
+        self.label.setObjectName("label")
+        self.lineEdit_3 = QtWidgets.QLineEdit(Dialog)
+        self.lineEdit_3.setEnabled(True)
+        self.lineEdit_3.setGeometry(QtCore.QRect(210, 140, 251, 21))
+        self.lineEdit_3.setFrame(True)
+        self.lineEdit_3.setReadOnly(True)
+        self.lineEdit_3.setObjectName("lineEdit_3")
+        self.fileListTextEdit = QtWidgets.QTextBrowser(Dialog)
+        self.fileListTextEdit.setGeometry(QtCore.QRect(10, 40, 391, 91))
+        self.fileListTextEdit.setObjectName("fileListTextEdit")
+        self.processButton = QtWidgets.QPushButton(Dialog)
+        self.processButton.setGeometry(QtCore.QRect(10, 250, 151, 21))
+        self.processButton.setObjectName("processButton")
+        self.pushButton_4 = QtWidgets.QPushButton(Dialog)
+        self.pushButton_4.setGeometry(QtCore.QRect(220, 250, 181, 21))
+        self.pushButton_4.setObjectName("pushButton_4")
+        self.textBrowser_2 = QtWidgets.QTextBrowser(Dialog)
+        self.textBrowser_2.setGeometry(QtCore.QRect(10, 280, 391, 91))
+        self.textBrowser_2.setObjectName("textBrowser_2")
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Amazon Statements Merger"))
+        self.buttonAddStatements.setText(_translate("Dialog", "Add Statement Files"))
+        self.pushButton_2.setText(_translate("Dialog", "Save Output To..."))
+        self.label.setText(_translate("Dialog", "The name of the merged file"))
+        self.processButton.setText(_translate("Dialog", "Merge the statements"))
+        self.pushButton_4.setText(_translate("Dialog", "Close the program"))
@@ -0,0 +1,55 @@
+"""
+Benchmark DataProcessor.transform_to_us_date_format on a large synthetic
+statement against parsing and formatting every row.
+
+Run from the repository root:
+    python -m benchmarks.bench_date_transform --rows 1000000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.generator import generate_statement
+from src.data_processor import DataProcessor
+from src.rate_providers import InMemoryRateProvider
+
+
+def transform_every_row(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Reference implementation: parse, format and strip every row"""
+    transformed_dataframe = dataframe.copy()
+    transformed_dataframe['Date'] = pd.to_datetime(
+        transformed_dataframe['Date'],
+        format='%d/%m/%Y'
+    ).dt.strftime('%m/%d/%Y').str.replace('^0', '', regex=True)
+    return transformed_dataframe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=31, help='distinct dates in the statement')
+    args = parser.parse_args()
+
+    df = generate_statement(args.rows, 'AUD', days=args.days)[['Date']]
+
+    processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+
+    start = time.perf_counter()
+    expected = transform_every_row(df)
+    row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = processor.transform_to_us_date_format(df)
+    unique_time = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+    print(f"rows={args.rows} distinct dates={args.days}")
+    print(f"every row:      {row_time:.3f}s")
+    print(f"distinct dates: {unique_time:.3f}s")
+    print(f"speedup:        {row_time / unique_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
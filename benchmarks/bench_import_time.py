@@ -0,0 +1,122 @@
+"""
+Measure cold-start import latency of the application entry points with
+python -X importtime, to track startup time as a regression metric.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time --json import_time.json --max-ms src.cli=150
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Entry points in the order they matter for startup
+DEFAULT_MODULES = ['src.cli', 'UI.statement_merger_gui', 'src.statement_merger']
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module: str, repeat: int = 3) -> dict:
+    """
+    Import a module in fresh interpreters and keep the fastest run
+
+    Args:
+        module: Dotted module name
+        repeat: Number of cold interpreter runs
+
+    Returns:
+        dict with the module's cumulative import time (ms) and its heaviest top-level
+        imports, or with an 'error' if it could not be measured
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            error_lines = result.stderr.strip().splitlines()
+            return {'module': module, 'error': error_lines[-1] if error_lines else f'exit code {result.returncode}'}
+
+        # importtime prints a package after its children, indenting each
+        # nesting level by two spaces; the -c script's imports have one space
+        total_ms = None
+        children = {}
+        pending = {}
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if not match:
+                continue
+            depth, name, cumulative_ms = len(match.group(3)), match.group(4), int(match.group(2)) / 1000
+            if depth == 3:
+                pending[name] = cumulative_ms
+            elif depth == 1:
+                if name == module.split('.')[0] or name == module:
+                    total_ms = cumulative_ms if total_ms is None else max(total_ms, cumulative_ms)
+                    children.update(pending)
+                pending = {}
+
+        if total_ms is not None and (best is None or total_ms < best['total_ms']):
+            heaviest = sorted(children.items(), key=lambda item: item[1], reverse=True)[:5]
+            best = {
+                'module': module,
+                'total_ms': round(total_ms, 1),
+                'heaviest_ms': {name: round(ms, 1) for name, ms in heaviest}
+            }
+
+    if best is None:
+        # e.g. a built-in module, which is never imported from a file
+        return {'module': module, 'error': 'no -X importtime line for this module'}
+    return best
+
+
+def parse_budget(values: list) -> dict:
+    """Parse MODULE=MS budget arguments"""
+    budget = {}
+    for value in values:
+        module, _, limit = value.partition('=')
+        budget[module] = float(limit)
+    return budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='write the measurements to this file')
+    parser.add_argument('--max-ms', nargs='*', default=[], metavar='MODULE=MS',
+                        help='fail (exit 1) if a module imports slower than this')
+    args = parser.parse_args()
+
+    results = [measure_import(module, args.repeat) for module in args.modules]
+    budget = parse_budget(args.max_ms)
+
+    exit_code = 0
+    for result in results:
+        if 'error' in result:
+            print(f"{result['module']:<28} not measured: {result['error']}")
+            # A module with a budget must be measurable
+            if result['module'] in budget:
+                exit_code = 1
+            continue
+
+        heaviest = ', '.join(f"{name} {ms}ms" for name, ms in result['heaviest_ms'].items())
+        print(f"{result['module']:<28} {result['total_ms']:>8.1f}ms  ({heaviest})")
+
+        limit = budget.get(result['module'])
+        if limit is not None and result['total_ms'] > limit:
+            print(f"  over budget: {result['total_ms']}ms > {limit}ms")
+            exit_code = 1
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark StatementMerger.merge_statements as the number of files grows,
+against the previous concat-inside-the-loop merge.
+
+Run from the repository root:
+    python -m benchmarks.bench_merge_statements --files 50 100 200 400 --workers 1 4 8
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.generator import generate_statement
+from src.statement_merger import StatementMerger
+
+
+def merge_in_loop(frames: list) -> pd.DataFrame:
+    """Reference implementation: concatenate into the running result per file"""
+    merged_df = None
+    for frame in frames:
+        if merged_df is None:
+            merged_df = frame
+        else:
+            merged_df = pd.concat([merged_df, frame], ignore_index=True)
+    return merged_df.copy()
+
+
+def merge_once(frames: list) -> pd.DataFrame:
+    """Current implementation: collect frames, concatenate once"""
+    return pd.concat(frames, ignore_index=True)
+
+
+def measure(func, *args) -> tuple:
+    """Wall time and peak traced memory (MB) of a call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, nargs='+', default=[50, 100, 200, 400])
+    parser.add_argument('--rows', type=int, default=2000, help='rows per statement file')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1],
+                        help='merge_statements worker counts to time')
+    parser.add_argument('--processes', action='store_true', help='use a process pool for workers')
+    args = parser.parse_args()
+
+    # US statements never ask for rates
+    mergers = {
+        workers: StatementMerger(rate_provider=object(), max_workers=workers, use_processes=args.processes)
+        for workers in args.workers
+    }
+
+    header = f"{'files':>6} {'loop concat':>12} {'single concat':>14} {'loop MB':>9} {'single MB':>10}"
+    header += ''.join(f" {f'{workers} worker(s)':>12}" for workers in args.workers)
+    print(header)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for file_count in args.files:
+            frames = [generate_statement(args.rows, 'USD', seed=i) for i in range(file_count)]
+
+            loop_time, loop_peak = measure(merge_in_loop, frames)
+            once_time, once_peak = measure(merge_once, frames)
+
+            paths = []
+            for i, frame in enumerate(frames):
+                path = Path(tmp_dir) / f"statement_{file_count}_{i}.csv"
+                frame.to_csv(path, index=False)
+                paths.append(path)
+
+            line = (f"{file_count:>6} {loop_time:>11.3f}s {once_time:>13.3f}s "
+                    f"{loop_peak:>9.1f} {once_peak:>10.1f}")
+            for merger in mergers.values():
+                start = time.perf_counter()
+                merger.merge_statements(paths)
+                line += f" {time.perf_counter() - start:>11.3f}s"
+
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
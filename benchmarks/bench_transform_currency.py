@@ -0,0 +1,79 @@
+"""
+Benchmark vectorized DataProcessor.transform_currency against the previous
+row-by-row implementation.
+
+Run from the repository root:
+    python -m benchmarks.bench_transform_currency --rows 200000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.generator import generate_statement
+from src.data_processor import DataProcessor
+from src.rate_providers import InMemoryRateProvider
+
+
+def transform_currency_row_loop(processor: DataProcessor, df: pd.DataFrame) -> pd.DataFrame:
+    """Reference implementation: the original iterrows() conversion loop"""
+    result = df.copy()
+
+    total_column = [col for col in df.columns if col.startswith('Total (')][0]
+    currency = total_column[total_column.find('(') + 1:total_column.find(')')]
+
+    numeric_cols = [
+        'Total product charges',
+        'Total promotional rebates',
+        'Amazon fees',
+        'Other',
+        f'Total ({currency})'
+    ]
+    result[numeric_cols] = result[numeric_cols].astype('float64')
+
+    for idx, row in result.iterrows():
+        date_str = pd.to_datetime(row['Date']).strftime('%Y-%m-%d')
+        rate = processor.get_exchange_rate(currency, date_str)
+
+        for col in numeric_cols:
+            if currency == 'CAD':
+                result.at[idx, col] = round(row[col] / rate, 2)
+            else:  # AUD
+                result.at[idx, col] = round(row[col] * rate, 2)
+
+    return result.rename(columns={f'Total ({currency})': 'Total (USD)'})
+
+
+def time_call(func, *args) -> tuple:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000, help='rows per statement')
+    parser.add_argument('--currency', choices=['CAD', 'AUD'], default='AUD')
+    args = parser.parse_args()
+
+    df = generate_statement(args.rows, args.currency, date_format='MM/DD/YYYY')
+    rates = {
+        day.strftime('%Y-%m-%d'): 0.65 + 0.001 * i
+        for i, day in enumerate(pd.date_range('2024-01-01', periods=31, freq='D'))
+    }
+    series_id = {'CAD': 'DEXCAUS', 'AUD': 'DEXUSAL'}[args.currency]
+    processor = DataProcessor(rate_provider=InMemoryRateProvider({series_id: rates}))
+
+    loop_time, expected = time_call(transform_currency_row_loop, processor, df)
+    vector_time, actual = time_call(processor.transform_currency, df)
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+    print(f"rows={args.rows} currency={args.currency}")
+    print(f"row loop:   {loop_time:.3f}s")
+    print(f"vectorized: {vector_time:.3f}s")
+    print(f"speedup:    {loop_time / vector_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
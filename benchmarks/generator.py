@@ -0,0 +1,147 @@
+"""
+Synthetic Amazon statements for benchmarks.
+
+Statements have exactly the columns CSVProcessor validates, dates in the
+marketplace's format from MARKETPLACE_CONFIG, and amounts whose Total is the
+sum of its components. Everything is seeded, so runs are reproducible.
+
+Write a set of files from the command line:
+    python -m benchmarks.generator out/ --files 20 --rows 50000 --currencies AUD CAD GBP
+"""
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data_processor import FILL_PADDING_DAYS
+from src.market_config import MARKETPLACE_CONFIG, strptime_format
+from src.rate_providers import InMemoryRateProvider
+
+TRANSACTION_TYPES = ['Order Payment', 'Refund', 'Service Fees', 'Adjustment', 'Transfer']
+TRANSACTION_WEIGHTS = [0.8, 0.08, 0.06, 0.04, 0.02]
+
+# Rough rate levels in each series' own quote direction
+RATE_LEVELS = {
+    'CAD': 1.35, 'AUD': 0.66, 'GBP': 1.27, 'EUR': 1.08, 'SEK': 10.5, 'PLN': 4.0,
+    'TRY': 32.0, 'JPY': 150.0, 'INR': 83.0, 'SGD': 1.34, 'AED': 3.67, 'SAR': 3.75,
+    'EGP': 48.0, 'MXN': 17.5, 'BRL': 5.2
+}
+
+
+def generate_statement(rows: int, currency: str = 'AUD', days: int = 31, start: str = '2024-01-01',
+                       seed: int = 0, date_format: Optional[str] = None) -> pd.DataFrame:
+    """
+    Build one statement as CSVProcessor would read it
+
+    Args:
+        rows: Number of transactions
+        currency: Marketplace currency (a MARKETPLACE_CONFIG key)
+        days: Number of days the statement spans, starting at start
+        start: First day (YYYY-MM-DD)
+        seed: Random seed
+        date_format: Date format in MARKETPLACE_CONFIG notation
+            (default: the marketplace's own format)
+
+    Returns:
+        pandas DataFrame in date order
+    """
+    rng = np.random.default_rng(seed)
+    date_format = date_format or MARKETPLACE_CONFIG[currency]['date_format']
+
+    dates = pd.date_range(start, periods=days, freq='D')
+    picked = dates[np.sort(rng.integers(0, days, rows))]
+
+    charges = rng.uniform(1, 200, rows).round(2)
+    rebates = -rng.uniform(0, 10, rows).round(2)
+    fees = -(charges * rng.uniform(0.08, 0.2, rows)).round(2)
+    other = rng.uniform(0, 10, rows).round(2)
+
+    order_ids = pd.Series(rng.integers(10 ** 6, 10 ** 7, rows)).astype(str)
+
+    statement_data = pd.DataFrame({
+        'Date': picked.strftime(strptime_format(date_format)),
+        'Transaction type': rng.choice(TRANSACTION_TYPES, rows, p=TRANSACTION_WEIGHTS),
+        'Order ID': '114-' + order_ids + '-' + order_ids.str[::-1],
+        'Product Details': 'Product ' + pd.Series(rng.integers(0, 500, rows)).astype(str),
+        'Total product charges': charges,
+        'Total promotional rebates': rebates,
+        'Amazon fees': fees,
+        'Other': other,
+        f'Total ({currency})': (charges + rebates + fees + other).round(2)
+    })
+
+    return statement_data
+
+
+def write_statements(directory: Path, files: int, rows: int, currencies: Sequence[str] = ('AUD',),
+                     days: int = 31, start: str = '2024-01-01', seed: int = 0) -> List[Path]:
+    """
+    Write statement CSV files, cycling through the currencies
+
+    Returns:
+        List of the written file paths
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for i in range(files):
+        currency = currencies[i % len(currencies)]
+        path = directory / f"statement_{i:04d}_{currency}.csv"
+        generate_statement(rows, currency, days=days, start=start, seed=seed + i).to_csv(path, index=False)
+        paths.append(path)
+
+    return paths
+
+
+def offline_rates(currencies: Sequence[str], days: int = 31, start: str = '2024-01-01',
+                  seed: int = 0) -> Dict[str, pd.Series]:
+    """
+    Business-day rate series for the currencies, covering the statement span
+    plus the fill padding, like FRED's H.10 series (no weekend observations)
+
+    Returns:
+        dict of series ID -> rates indexed by date
+    """
+    rng = np.random.default_rng(seed)
+    padding = pd.Timedelta(days=FILL_PADDING_DAYS)
+    business_days = pd.bdate_range(pd.Timestamp(start) - padding,
+                                   pd.Timestamp(start) + pd.Timedelta(days=days) + padding)
+
+    rates = {}
+    for currency in currencies:
+        series_id = MARKETPLACE_CONFIG[currency]['rate_series']
+        if series_id is None:
+            continue
+        level = RATE_LEVELS.get(currency, 1.0)
+        rates[series_id] = pd.Series(level * (1 + rng.normal(0, 0.002, len(business_days))).cumprod(),
+                                     index=business_days)
+
+    return rates
+
+
+def offline_provider(currencies: Sequence[str], days: int = 31, start: str = '2024-01-01') -> InMemoryRateProvider:
+    """In-memory rate provider with offline_rates for the currencies"""
+    return InMemoryRateProvider(offline_rates(currencies, days=days, start=start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic Amazon statement CSV files.")
+    parser.add_argument('directory', type=Path)
+    parser.add_argument('--files', type=int, default=1)
+    parser.add_argument('--rows', type=int, default=10_000, help='rows per file')
+    parser.add_argument('--currencies', nargs='+', default=['AUD'], choices=list(MARKETPLACE_CONFIG))
+    parser.add_argument('--days', type=int, default=31, help='days spanned by each statement')
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_statements(args.directory, args.files, args.rows, args.currencies,
+                             days=args.days, start=args.start, seed=args.seed)
+    print(f"Wrote {len(paths)} statement file(s) to {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
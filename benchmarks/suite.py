@@ -0,0 +1,222 @@
+"""
+Benchmark suite for the statement pipeline hot paths: read, date transform,
+FX conversion and merge. Statements come from benchmarks.generator and rates
+from an offline in-memory provider, so runs need no network and are
+comparable between versions.
+
+Run from the repository root:
+    python -m benchmarks.suite --rows 100000 --json report.json
+    python -m benchmarks.suite --rows 100000 --compare report.json --fail-over 1.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generator import generate_statement, offline_provider, write_statements
+from src.csv_processor import CSVProcessor
+from src.data_processor import DataProcessor
+from src.statement_merger import StatementMerger
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REPORT_VERSION = 1
+
+# name -> setup(workdir, args) returning the timed callable and the rows it processes
+BENCHMARKS: Dict[str, Callable[[Path, argparse.Namespace], Tuple[Callable[[], object], int]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under a name"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('read')
+def setup_read(workdir: Path, args: argparse.Namespace):
+    """CSVProcessor.read_file: parse, schema and validation of one statement"""
+    path, = write_statements(workdir / 'read', 1, args.rows, [args.currency], days=args.days)
+    processor = CSVProcessor(engine=args.engine)
+    return lambda: processor.read_file(path), args.rows
+
+
+@benchmark('dates')
+def setup_dates(workdir: Path, args: argparse.Namespace):
+    """Date format detection plus transform_to_us_date_format"""
+    statement_data = generate_statement(args.rows, args.currency, days=args.days)
+    processor = DataProcessor(rate_provider=offline_provider([args.currency], days=args.days))
+
+    def run():
+        date_format = processor.detect_date_format(statement_data['Date'], args.currency)
+        return processor.transform_to_us_date_format(statement_data, date_format)
+
+    return run, args.rows
+
+
+@benchmark('fx')
+def setup_fx(workdir: Path, args: argparse.Namespace):
+    """transform_currency with a fresh DataProcessor, so the rate fetch is included"""
+    statement_data = generate_statement(args.rows, args.currency, days=args.days, date_format='MM/DD/YYYY')
+    provider = offline_provider([args.currency], days=args.days)
+    return lambda: DataProcessor(rate_provider=provider).transform_currency(statement_data), args.rows
+
+
+@benchmark('merge')
+def setup_merge(workdir: Path, args: argparse.Namespace):
+    """StatementMerger.merge_statements over several files and currencies"""
+    paths = write_statements(workdir / 'merge', args.files, args.rows // args.files, args.currencies,
+                             days=args.days)
+    provider = offline_provider(args.currencies, days=args.days)
+
+    def run():
+        merger = StatementMerger(rate_provider=provider, max_workers=args.workers)
+        return merger.merge_statements(paths)
+
+    return run, (args.rows // args.files) * args.files
+
+
+def run_benchmark(func: Callable[[], object], rows: int, repeat: int) -> dict:
+    """
+    Time a benchmark: one warm-up call, `repeat` timed calls, then one
+    call under tracemalloc for the peak memory (kept out of the timings)
+    """
+    func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        'rows': rows,
+        'repeat': repeat,
+        'min_s': min(timings),
+        'median_s': median,
+        'mean_s': statistics.fmean(timings),
+        'rows_per_s': rows / median if median else None,
+        'peak_mb': peak / 2 ** 20
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the benchmarked tree, if it is a git checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    """Run the selected benchmarks and build the report"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in args.benchmarks:
+            func, rows = BENCHMARKS[name](Path(tmp_dir), args)
+            results[name] = run_benchmark(func, rows, args.repeat)
+            print(f"{name:>8}: {results[name]['median_s']:.4f}s median, "
+                  f"{results[name]['rows_per_s']:,.0f} rows/s, {results[name]['peak_mb']:.1f} MB peak",
+                  file=sys.stderr)
+
+    return {
+        'version': REPORT_VERSION,
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform()
+        },
+        'params': {
+            'rows': args.rows,
+            'files': args.files,
+            'days': args.days,
+            'currency': args.currency,
+            'currencies': args.currencies,
+            'workers': args.workers,
+            'engine': args.engine
+        },
+        'results': results
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> Dict[str, float]:
+    """
+    Median time ratio current / baseline per benchmark present in both
+    (> 1 is slower than the baseline)
+    """
+    return {
+        name: result['median_s'] / baseline['results'][name]['median_s']
+        for name, result in current['results'].items()
+        if name in baseline.get('results', {}) and baseline['results'][name]['median_s']
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('benchmarks', nargs='*', default=list(BENCHMARKS), metavar='BENCHMARK',
+                        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--rows', type=int, default=100_000, help='rows per benchmark (split over --files for merge)')
+    parser.add_argument('--files', type=int, default=10, help='statement files in the merge benchmark')
+    parser.add_argument('--days', type=int, default=31, help='days spanned by each statement')
+    parser.add_argument('--currency', default='AUD', help='currency of the single-statement benchmarks')
+    parser.add_argument('--currencies', nargs='+', default=['AUD', 'CAD', 'GBP', 'USD'],
+                        help='currencies cycled through the merge benchmark files')
+    parser.add_argument('--workers', type=int, default=1, help='merge_statements worker count')
+    parser.add_argument('--engine', choices=['c', 'pyarrow'], default='c', help='CSV engine for the read benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per benchmark')
+    parser.add_argument('--json', type=Path, help='write the report to this file')
+    parser.add_argument('--compare', type=Path, help='baseline report to compare median times against')
+    parser.add_argument('--fail-over', type=float,
+                        help='with --compare: exit 1 if any benchmark is slower than this ratio')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s) {unknown}, choose from {list(BENCHMARKS)}")
+
+    report = run_suite(args)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        ratios = compare_reports(json.loads(args.compare.read_text()), report)
+        for name, ratio in ratios.items():
+            print(f"{name:>8}: {ratio:.2f}x baseline median", file=sys.stderr)
+        if args.fail_over and any(ratio > args.fail_over for ratio in ratios.values()):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
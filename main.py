@@ -1,4 +1,10 @@
-from UI.statement_merger_gui import main
+import sys
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # Headless run: keep PyQt6 out of the process entirely
+        from src.cli import main
+        sys.exit(main())
+
+    from UI.statement_merger_gui import main
+    main()
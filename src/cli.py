@@ -0,0 +1,186 @@
+"""
+Headless command-line entry point for merging Amazon statements.
+
+Does not import PyQt6, so it starts quickly and runs on servers and in cron:
+    python main.py statements/*.csv -o merged.csv --rates-file rates.csv
+"""
+import argparse
+import glob
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from .statement_merger import StatementMerger
+
+EXIT_OK = 0
+EXIT_PROCESSING_ERROR = 1
+EXIT_USAGE_ERROR = 2
+
+# Same values as exporters.EXPORT_FORMATS, rate_calendar.FILL_POLICIES and
+# money.ROUNDING_MODES, repeated so that parsing arguments (and --help) does not import pandas
+OUTPUT_FORMATS = ('csv', 'xlsx', 'parquet', 'feather')
+
+FILL_POLICY_CHOICES = ('ffill', 'bfill', 'nearest', 'none')
+
+MONEY_MODE_CHOICES = ('half_even', 'half_up')
+
+# Statement files picked up from input directories
+STATEMENT_SUFFIXES = ('.csv', '.xlsx')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='amz-statements',
+        description="Convert and merge Amazon non-US statements into one US-format statement."
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help="statement files, glob patterns or directories (all *.csv and *.xlsx inside)")
+    parser.add_argument('-o', '--output', required=True, help="merged output file")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS,
+                        help="output format (default: from the output file extension)")
+    parser.add_argument('--workers', type=int, default=1, help="statements processed in parallel")
+    parser.add_argument('--processes', action='store_true', help="use worker processes instead of threads")
+    parser.add_argument('--chunksize', type=int,
+                        help="stream statements in chunks of this many rows (bounded memory)")
+    parser.add_argument('--profile', nargs='?', const='time', choices=('time', 'memory'),
+                        help="print per-stage timings, rows and rate lookup counts to stderr; "
+                             "'memory' also traces peak allocations per stage (slower)")
+    parser.add_argument('--store',
+                        help="folder keeping converted statements; unchanged files are not processed "
+                             "again (not used with --chunksize)")
+    parser.add_argument('--money-mode', choices=MONEY_MODE_CHOICES,
+                        help="convert amounts in exact cents with banker's (half_even) or "
+                             "half-up rounding instead of rounding floats")
+    parser.add_argument('--reconcile', action='store_true',
+                        help="fail if any merged Total (USD) differs from the sum of its components "
+                             "(not used with --chunksize)")
+
+    rates = parser.add_argument_group('exchange rates')
+    rates.add_argument('--api-key', default=None,
+                       help="FRED API key (default: FRED_API_KEY environment variable or .env)")
+    rates.add_argument('--rates-file', help="offline CSV/Parquet rate table instead of FRED")
+    rates.add_argument('--rate-cache', help="SQLite file for the persistent rate cache")
+    rates.add_argument('--fill-policy', choices=FILL_POLICY_CHOICES, default='ffill',
+                       help="rate for days without a published rate (default: ffill)")
+    return parser
+
+
+def expand_inputs(inputs: List[str]) -> List[Path]:
+    """
+    Resolve files, glob patterns and directories to a sorted, de-duplicated list of files
+
+    Args:
+        inputs: Command-line input arguments
+
+    Returns:
+        List of statement file paths, in argument order
+    """
+    file_paths = []
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(match for suffix in STATEMENT_SUFFIXES for match in path.glob(f'*{suffix}'))
+        elif glob.has_magic(pattern):
+            matches = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+        else:
+            matches = [path] if path.exists() else []
+
+        file_paths.extend(match for match in matches if match.is_file() and match not in file_paths)
+
+    return file_paths
+
+
+def output_format(args: argparse.Namespace) -> str:
+    """Format given with --format, otherwise taken from the output file extension"""
+    if args.format:
+        return args.format
+
+    suffix = Path(args.output).suffix.lower().lstrip('.')
+    if suffix not in OUTPUT_FORMATS:
+        raise ValueError(f"Cannot infer output format from '{args.output}'. Use --format {'/'.join(OUTPUT_FORMATS)}")
+    return suffix
+
+
+def create_merger(args: argparse.Namespace) -> 'StatementMerger':
+    """Build a StatementMerger from the rate and worker options"""
+    # Processing modules are imported only once there is work to do
+    from .instrumentation import PipelineProfile
+    from .rate_providers import FileRateProvider
+    from .statement_merger import StatementMerger
+
+    rate_provider = FileRateProvider(args.rates_file) if args.rates_file else None
+    api_key = args.api_key or os.environ.get('FRED_API_KEY')
+    profile = PipelineProfile(trace_memory=args.profile == 'memory') if args.profile else None
+
+    return StatementMerger(
+        api_key,
+        cache_path=args.rate_cache,
+        fill_policy=None if args.fill_policy == 'none' else args.fill_policy,
+        rate_provider=rate_provider,
+        max_workers=args.workers,
+        use_processes=args.processes,
+        store_dir=args.store,
+        profile=profile,
+        money_mode=args.money_mode
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+
+    Returns:
+        int: Exit code - 0 on success, 1 if processing failed, 2 on usage errors
+    """
+    from dotenv import load_dotenv
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    load_dotenv()
+
+    file_paths = expand_inputs(args.inputs)
+    if not file_paths:
+        print(f"error: no statement files match {args.inputs}", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+
+    if args.reconcile and args.chunksize:
+        print("error: --reconcile needs the whole merge and cannot be used with --chunksize", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+
+    try:
+        fmt = output_format(args)
+        merger = create_merger(args)
+    except (ValueError, OSError, ImportError) as e:
+        # Bad options: missing --rates-file, unusable --store folder, missing optional dependency
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+
+    try:
+        if args.chunksize:
+            rows = merger.stream_statements(file_paths, args.output, chunksize=args.chunksize,
+                                            output_format=fmt)
+        else:
+            merger.merge_statements(file_paths)
+            if args.reconcile:
+                mismatched = merger.reconcile()
+                if not mismatched.empty:
+                    raise ValueError(f"{len(mismatched)} row(s) do not reconcile: Total (USD) differs from "
+                                     f"the sum of its components, e.g. by {mismatched['Difference (cents)'].iloc[0]} cent(s)")
+            rows = merger.export(args.output, fmt)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_PROCESSING_ERROR
+
+    print(f"Merged {len(file_paths)} statement file(s), {rows} rows -> {args.output}")
+    if args.profile:
+        print(merger.profile.format_table(), file=sys.stderr)
+    return EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
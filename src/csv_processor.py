@@ -1,13 +1,68 @@
+import datetime
+import time
+from contextlib import closing
 import pandas as pd
-from typing import Union
+from typing import Iterator, List, Union
 from pathlib import Path
-from .market_config import MARKETPLACE_CONFIG
+from .instrumentation import NULL_PROFILE
+from .market_config import MARKETPLACE_CONFIG, strptime_format
+
+# Explicit types of the required statement columns, so reads skip type
+# inference: categorical transaction types, float money columns, text IDs
+STATEMENT_DTYPES = {
+    'Date': str,
+    'Transaction type': 'category',
+    'Order ID': str,
+    'Product Details': str,
+    'Total product charges': 'float64',
+    'Total promotional rebates': 'float64',
+    'Amazon fees': 'float64',
+    'Other': 'float64'
+}
+TOTAL_COLUMN_DTYPE = 'float64'
+
+# dtype mapping passed to read_csv; columns missing from a file are ignored
+READ_DTYPES = {
+    **STATEMENT_DTYPES,
+    **{f'Total ({currency})': TOTAL_COLUMN_DTYPE for currency in MARKETPLACE_CONFIG}
+}
+
+# Workbook statements, read with openpyxl's streaming read-only mode
+XLSX_SUFFIXES = ('.xlsx', '.xlsm')
+
+
+def statement_dtypes(columns) -> dict:
+    """
+    Explicit dtypes for the statement columns present in `columns`
+
+    Args:
+        columns: Column names of a statement DataFrame
+
+    Returns:
+        dict of column name -> dtype, usable with DataFrame.astype
+    """
+    dtypes = {column: dtype for column, dtype in STATEMENT_DTYPES.items() if column in columns}
+    dtypes.update({column: TOTAL_COLUMN_DTYPE for column in columns if column.startswith('Total (')})
+    return dtypes
+
+
+def is_xlsx(file_source) -> bool:
+    """Check if a statement file is an Excel workbook, by its extension"""
+    return isinstance(file_source, (str, Path)) and Path(file_source).suffix.lower() in XLSX_SUFFIXES
 
 
 class CSVProcessor:
-    def __init__(self):
+    def __init__(self, engine: str = 'c', profile=None):
+        """
+        Args:
+            engine: pandas CSV parser engine; 'pyarrow' is tried first when
+                requested and falls back to 'c' if unavailable or unsupported
+            profile: Optional PipelineProfile recording the 'read' and 'validate' stages
+        """
         self.raw_data = None
         self.current_market = None
+        self.engine = engine
+        self.profile = profile or NULL_PROFILE
 
     def validate_marketplace(self, marketplace: str) -> None:
         """
@@ -28,7 +83,7 @@ class CSVProcessor:
             df: pandas DataFrame containing Amazon statement data
 
         Returns:
-            str: Currency code (USD, CAD, AUD)
+            str: Currency code (a MARKETPLACE_CONFIG key, e.g. USD, CAD, EUR)
         """
         total_column = next(
             (col for col in df.columns if col.startswith('Total (')),
@@ -51,17 +106,25 @@ class CSVProcessor:
         Read Amazon statement file and perform validation
 
         Args:
-            file_source: CSV file (path or bytes)
+            file_source: CSV file (path or bytes) or .xlsx workbook path
 
         Returns:
             pandas DataFrame with the file content
         """
         try:
-            df_amazon_statement = pd.read_csv(file_source)
-            self.validate_amazon_statement(df_amazon_statement)
+            with self.profile.stage('read') as stage:
+                if is_xlsx(file_source):
+                    df_amazon_statement = pd.concat(self._read_xlsx_chunks(file_source), ignore_index=True)
+                else:
+                    df_amazon_statement = self._read_csv(file_source)
+                stage.rows = len(df_amazon_statement)
+
+            with self.profile.stage('validate') as stage:
+                self.validate_amazon_statement(df_amazon_statement)
 
-            currency = self.detect_marketplace_currency(df_amazon_statement)
-            self.validate_marketplace(currency)
+                currency = self.detect_marketplace_currency(df_amazon_statement)
+                self.validate_marketplace(currency)
+                stage.rows = len(df_amazon_statement)
 
             self.current_market = MARKETPLACE_CONFIG[currency]
             self.raw_data = df_amazon_statement
@@ -72,22 +135,154 @@ class CSVProcessor:
             raise Exception(f"Error reading file: {str(e)}")
 
 
+    def _read_csv(self, file_source: Union[str, Path]) -> pd.DataFrame:
+        """Read a whole CSV with the statement schema using the configured engine"""
+        if self.engine == 'pyarrow':
+            try:
+                return pd.read_csv(file_source, dtype=READ_DTYPES, engine='pyarrow')
+            except (ImportError, ValueError):
+                # pyarrow missing or unable to handle the file: use the C parser
+                if hasattr(file_source, 'seek'):
+                    file_source.seek(0)
+
+        return pd.read_csv(file_source, dtype=READ_DTYPES)
+
+    def read_columns(self, file_source: Union[str, Path], columns: List[str]) -> pd.DataFrame:
+        """
+        Read only some columns of a whole statement, e.g. to scan its dates
+        before it is streamed in chunks. Only the requested columns are kept,
+        so memory stays small even for large files.
+
+        Args:
+            file_source: CSV file or .xlsx workbook path
+            columns: Column names to read; those missing from the file are skipped
+
+        Returns:
+            pandas DataFrame with the requested columns present in the file, as text
+        """
+        wanted = set(columns)
+        with self.profile.stage('date_scan') as stage:
+            if is_xlsx(file_source):
+                with closing(self._read_xlsx_chunks(file_source)) as chunks:
+                    frame = pd.concat([chunk[[column for column in chunk.columns if column in wanted]]
+                                       for chunk in chunks], ignore_index=True)
+            else:
+                frame = pd.read_csv(file_source, usecols=lambda column: column in wanted, dtype=str)
+            stage.rows = len(frame)
+
+        return frame
+
+    def iter_file(self, file_source: Union[str, Path], chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Read Amazon statement file in fixed-size chunks, validating the header once.
+        Chunks are not kept in memory, so memory stays bounded for any file size.
+
+        Args:
+            file_source: CSV file or .xlsx workbook path
+            chunksize: Number of rows per chunk
+
+        Yields:
+            pandas DataFrame chunks of the file content
+        """
+        try:
+            if is_xlsx(file_source):
+                reader = closing(self._read_xlsx_chunks(file_source, chunksize))
+            else:
+                # The pyarrow engine cannot read in chunks, so always use the C parser here
+                reader = pd.read_csv(file_source, dtype=READ_DTYPES, chunksize=chunksize)
+        except Exception as e:
+            raise Exception(f"Error reading file: {str(e)}")
+
+        with reader as chunks:
+            first_chunk = True
+            while True:
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                self.profile.add('read', time.perf_counter() - start, len(chunk))
+
+                if first_chunk:
+                    try:
+                        self.validate_amazon_statement(chunk)
+
+                        currency = self.detect_marketplace_currency(chunk)
+                        self.validate_marketplace(currency)
+                    except Exception as e:
+                        raise Exception(f"Error reading file: {str(e)}")
+
+                    self.current_market = MARKETPLACE_CONFIG[currency]
+                    first_chunk = False
+
+                yield chunk
+
+
+    def _read_xlsx_chunks(self, file_path: Union[str, Path], chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream the first worksheet of a workbook as DataFrame chunks with the
+        statement schema. openpyxl's read-only mode parses rows as they are
+        iterated instead of loading the whole workbook, so at most one chunk of
+        rows is held at a time. The header must be the first non-empty row;
+        at least one (possibly empty) chunk is yielded, so the header can
+        always be validated.
+
+        Raises:
+            ImportError: If openpyxl is not installed
+        """
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("Reading .xlsx statements needs openpyxl: pip install openpyxl")
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = (row for row in workbook.worksheets[0].iter_rows(values_only=True)
+                    if any(value is not None for value in row))
+
+            header = next(rows, ())
+            # Read-only sheets can report trailing empty header cells
+            positions = [i for i, name in enumerate(header) if name is not None]
+            columns = [str(header[i]).strip() for i in positions]
+
+            # Real Excel dates are written back in the marketplace's text format
+            currency = next((column[column.find('(') + 1:column.find(')')]
+                             for column in columns if column.startswith('Total (')), None)
+            date_format = strptime_format(MARKETPLACE_CONFIG.get(currency, {}).get('date_format', 'MM/DD/YYYY'))
+
+            chunk_rows = []
+            yielded = False
+            for row in rows:
+                chunk_rows.append([row[i] if i < len(row) else None for i in positions])
+                if len(chunk_rows) == chunksize:
+                    yield self._xlsx_frame(chunk_rows, columns, date_format)
+                    chunk_rows = []
+                    yielded = True
+
+            if chunk_rows or not yielded:
+                yield self._xlsx_frame(chunk_rows, columns, date_format)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _xlsx_frame(rows: List[list], columns: List[str], date_format: str) -> pd.DataFrame:
+        """Build one chunk from worksheet rows and apply the statement schema"""
+        chunk = pd.DataFrame.from_records(rows, columns=columns)
+
+        if 'Date' in chunk.columns:
+            chunk['Date'] = [
+                value.strftime(date_format) if isinstance(value, (datetime.date, datetime.datetime)) else value
+                for value in chunk['Date']
+            ]
+
+        return chunk.astype(statement_dtypes(chunk.columns))
+
     def validate_amazon_statement(self, df_amazon_statement: pd.DataFrame) -> None:
         """
         Check if the file looks like an Amazon statement
         Raises ValueError if validation fails
         """
 
-        required_columns = [
-            'Date',
-            'Transaction type',
-            'Order ID',
-            'Product Details',
-            'Total product charges',
-            'Total promotional rebates',
-            'Amazon fees',
-            'Other'
-        ]
+        required_columns = list(STATEMENT_DTYPES)
 
         missing_columns = [column for column in required_columns if column not in df_amazon_statement.columns]
 
@@ -1,6 +1,30 @@
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
 import pandas as pd
-from fredapi import Fred
-import pandas as pd
+
+from .instrumentation import NULL_PROFILE
+from .market_config import MARKETPLACE_CONFIG, QUOTE_PER_USD, strptime_format
+from .money import COMPONENT_COLUMNS, ROUNDING_MODES, convert_cents, from_cents, to_cents
+from .rate_cache import RateCache
+from .rate_calendar import RateCalendar
+from .rate_memo import RateMemo
+from .rate_providers import AsyncFredRateProvider, RateProvider
+
+# Days fetched on each side of a window so weekends/holidays at its edges can be filled
+FILL_PADDING_DAYS = 7
+
+# Time zone statements are normalized to, and the timestamp column it applies to
+US_TIMEZONE = 'America/Los_Angeles'
+TIMESTAMP_COLUMN = 'date/time'
+
+# Date formats a statement can be in, US first; and how many distinct dates
+# are checked when detecting a file's format
+US_DATE_FORMAT = MARKETPLACE_CONFIG['USD']['date_format']
+DATE_FORMATS = tuple(dict.fromkeys(config['date_format'] for config in MARKETPLACE_CONFIG.values()))
+DATE_SAMPLE_SIZE = 10_000
 
 class DataProcessor:
     """
@@ -9,41 +33,286 @@ class DataProcessor:
     - Currency conversion
     - Statement merging
     """
-    def __init__(self, api_key):
-        self.fred = Fred(api_key=api_key)
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[Union[str, Path]] = None,
+                 fill_policy: Optional[str] = 'ffill', rate_provider: Optional[RateProvider] = None,
+                 profile=None, rate_memo: Optional[RateMemo] = None, money_mode: Optional[str] = None):
+        """
+        Args:
+            api_key: FRED API key, used when no rate_provider is given
+            cache_path: Optional SQLite file for a persistent exchange-rate cache
+            fill_policy: How days without a FRED observation (weekends, US holidays)
+                get a rate: 'ffill', 'bfill', 'nearest', or None to raise instead
+            rate_provider: Source of exchange-rate series (FRED, local file, in-memory)
+            profile: Optional PipelineProfile recording stage timings and rate lookup counters
+            rate_memo: In-process memo of looked up rates and fetched series; pass
+                one shared RateMemo to reuse rates across processors (default: a new one)
+            money_mode: Convert amounts as exact int64 cents with this rounding
+                ('half_even' or 'half_up', see src.money) instead of rounding floats
+
+        Raises:
+            ValueError: If neither api_key nor rate_provider is given, or money_mode is unknown
+        """
+        if money_mode is not None and money_mode not in ROUNDING_MODES:
+            raise ValueError(f"Unknown money mode: {money_mode}. Supported modes: {list(ROUNDING_MODES)}")
+
+        if rate_provider is None:
+            if not api_key:
+                raise ValueError("Either api_key or rate_provider is required")
+            rate_provider = AsyncFredRateProvider(api_key)
+
+        self.rate_provider = rate_provider
+        # currency -> rate series ID, from the marketplace registry
         self.series_ids = {
-            'CAD': 'DEXCAUS',  # Canadian Dollar to USD
-            'AUD': 'DEXUSAL'   # Australian Dollar to USD
+            currency: config['rate_series']
+            for currency, config in MARKETPLACE_CONFIG.items() if config['rate_series']
         }
+        self.rate_cache = RateCache(cache_path) if cache_path else None
+        self.fill_policy = fill_policy
+        # currency -> daily RateCalendar built from the last bulk fetch
+        self.rate_calendars = {}
+        self.rate_memo = rate_memo if rate_memo is not None else RateMemo()
+        self.money_mode = money_mode
+        self.profile = profile or NULL_PROFILE
+
+    def seed_rates(self, currency: str, rates: pd.Series) -> None:
+        """
+        Pre-seed the rate memo with known rates, which are then used instead
+        of fetching
+
+        Args:
+            currency: Currency code (e.g. CAD, EUR)
+            rates: Rates in the currency's series quote, indexed by date
+        """
+        for date, rate in rates.items():
+            self.rate_memo.rates.put((currency, pd.Timestamp(date).strftime('%Y-%m-%d'), self.fill_policy),
+                                     float(rate))
+
+    def seed_series(self, currency: str, series_data: pd.Series) -> None:
+        """
+        Pre-seed the rate memo with a currency's rate series; windows within
+        its first and last date are served from it instead of the provider
+
+        Args:
+            currency: Currency code (e.g. CAD, EUR)
+            series_data: Observations of the currency's series, indexed by date
+        """
+        series_id = self.series_ids.get(currency)
+        if not series_id:
+            raise ValueError(f"Unsupported currency: {currency}")
+
+        series_data = pd.Series(series_data, dtype='float64')
+        series_data.index = pd.DatetimeIndex(series_data.index)
+        if series_data.empty:
+            return
+        self.rate_memo.store_series(series_id, series_data.index.min().strftime('%Y-%m-%d'),
+                                    series_data.index.max().strftime('%Y-%m-%d'), series_data)
+
+    def clear_rate_memo(self) -> None:
+        """Forget all rates held in memory, so the next lookups ask the provider (or persistent cache) again"""
+        self.rate_memo.clear()
+        self.rate_calendars.clear()
+
+    def rate_memo_stats(self) -> dict:
+        """Size, hits, misses and evictions of the rate memo: {'rates': {...}, 'series': {...}}"""
+        return self.rate_memo.stats()
+
+    def detect_date_format(self, dates: pd.Series, currency: str) -> str:
+        """
+        Detect the date format of a statement's Date column.
+
+        Every distinct date (or a random sample of DATE_SAMPLE_SIZE of them) is
+        parsed under each format in DATE_FORMATS with one vectorized call per
+        format. Formats that fail on any date are ruled out. If more than one
+        is left (e.g. 03/04/2024 only has days <= 12), the marketplace's
+        format from MARKETPLACE_CONFIG wins.
+
+        Args:
+            dates: 'Date' column of the statement
+            currency: Currency code of the statement's marketplace
+
+        Returns:
+            str: Date format in MARKETPLACE_CONFIG notation, e.g. 'DD/MM/YYYY'
+
+        Raises:
+            ValueError: If no known format parses every date
+        """
+        preferred = MARKETPLACE_CONFIG.get(currency, {}).get('date_format', US_DATE_FORMAT)
+
+        unique_dates = pd.Series(dates.dropna().unique())
+        if len(unique_dates) > DATE_SAMPLE_SIZE:
+            unique_dates = unique_dates.sample(DATE_SAMPLE_SIZE, random_state=0)
+        if unique_dates.empty:
+            return preferred
 
+        with self.profile.stage('date_detection') as stage:
+            valid_formats = [
+                date_format for date_format in DATE_FORMATS
+                if pd.to_datetime(unique_dates, format=strptime_format(date_format), errors='coerce').notna().all()
+            ]
+            stage.rows = len(unique_dates)
+        if not valid_formats:
+            raise ValueError(f"Unrecognized date format, e.g. '{unique_dates.iloc[0]}'")
 
+        return preferred if preferred in valid_formats else valid_formats[0]
 
-    def transform_to_us_date_format(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+    def transform_to_us_date_format(self, dataframe: pd.DataFrame,
+                                    date_format: str = 'DD/MM/YYYY') -> pd.DataFrame:
         """
         Transform date format from DD/MM/YYYY to US format (MM/DD/YYYY) in the dataframe.
 
         Args:
             dataframe: pandas DataFrame containing 'Date' column in DD/MM/YYYY format
+            date_format: Format of the 'Date' column if not DD/MM/YYYY, in
+                MARKETPLACE_CONFIG notation (see detect_date_format)
 
         Returns:
             pandas DataFrame with 'Date' column converted to MM/DD/YYYY format
         """
         transformed_dataframe = dataframe.copy()
 
-        # Convert string dates to datetime then back to string in US format
-        transformed_dataframe['Date'] = pd.to_datetime(
-            transformed_dataframe['Date'],
-            format='%d/%m/%Y'
-        ).dt.strftime('%m/%d/%Y').str.replace('^0', '', regex=True)
+        with self.profile.stage('dates') as stage:
+            # Statements hold only a few distinct dates: parse and format each
+            # distinct date once, then map the results back onto every row
+            codes, unique_dates = pd.factorize(transformed_dataframe['Date'])
+
+            us_dates = pd.to_datetime(
+                pd.Series(unique_dates),
+                format=strptime_format(date_format)
+            ).dt.strftime('%m/%d/%Y').str.replace('^0', '', regex=True)
+
+            # Rows with a missing date (code -1) stay missing
+            transformed_dataframe['Date'] = us_dates.reindex(codes).set_axis(transformed_dataframe.index)
+            stage.rows = len(transformed_dataframe)
 
         return transformed_dataframe
 
+    def normalize_timezone(self, dataframe: pd.DataFrame, currency: str,
+                           date_format: Optional[str] = None) -> pd.DataFrame:
+        """
+        Convert the statement's 'date/time' column from the marketplace's local
+        time (MARKETPLACE_CONFIG timezone) to US Pacific time in one vectorized
+        pass. The 'Date' column follows the converted timestamps, so a row that
+        crosses midnight gets the US date, and the rate of that day.
+        Statements without a 'date/time' column are returned unchanged.
+
+        Args:
+            dataframe: pandas DataFrame with 'Date' already in US format (MM/DD/YYYY)
+            currency: Currency code of the statement's marketplace
+            date_format: Date format of the file as read, which 'date/time' is
+                also in (see detect_date_format); default: the marketplace's format
+
+        Returns:
+            pandas DataFrame with 'date/time' in US Pacific time ('MM/DD/YYYY HH:MM:SS TZ')
+
+        Raises:
+            ValueError: If a 'date/time' value cannot be parsed
+        """
+        timezone = MARKETPLACE_CONFIG[currency]['timezone']
+        if TIMESTAMP_COLUMN not in dataframe.columns or timezone == US_TIMEZONE:
+            return dataframe
+
+        date_format = date_format or MARKETPLACE_CONFIG[currency]['date_format']
+        result = dataframe.copy()
+        with self.profile.stage('timezone') as stage:
+            # Local times skipped or repeated by a DST change cannot be placed and stay as they are
+            timestamps = self._parse_timestamps(result[TIMESTAMP_COLUMN], date_format, timezone)
+            us_timestamps = timestamps.dt.tz_convert(US_TIMEZONE)
+
+            converted = us_timestamps.notna()
+            result[TIMESTAMP_COLUMN] = us_timestamps.dt.strftime('%m/%d/%Y %H:%M:%S %Z').where(
+                converted, result[TIMESTAMP_COLUMN]
+            )
+            if 'Date' in result.columns:
+                us_dates = us_timestamps.dt.strftime('%m/%d/%Y').str.replace('^0', '', regex=True)
+                result['Date'] = us_dates.where(converted, result['Date'])
+            stage.rows = len(result)
+
+        return result
+
+    @staticmethod
+    def _parse_timestamps(values: pd.Series, date_format: str, timezone: str) -> pd.Series:
+        """
+        Parse a timestamp column into time zone aware timestamps. The column is
+        tried in one call as the file's date format followed by a time, then as
+        ISO 8601 (with or without an offset). Anything else, such as 12-hour
+        times, zone abbreviations or mixed offsets, falls back to parsing each
+        distinct value (see _parse_timestamp). Timestamps without an offset are
+        marketplace local time; those a DST change skips or repeats are NaT.
+        Numeric dates are never guessed month first, so a day-first 03/04/2024
+        stays 3 April.
+
+        Raises:
+            ValueError: If a value cannot be parsed as a timestamp
+        """
+        date_part = strptime_format(date_format)
+        for timestamp_format in (f'{date_part} %H:%M:%S', f'{date_part} %H:%M', 'ISO8601'):
+            try:
+                timestamps = pd.to_datetime(values, format=timestamp_format)
+            except (ValueError, TypeError):
+                continue
+            if timestamps.dt.tz is None:
+                timestamps = timestamps.dt.tz_localize(timezone, ambiguous='NaT', nonexistent='NaT')
+            return timestamps
+
+        codes, unique_values = pd.factorize(values)
+        dayfirst = date_format.startswith('DD')
+        with warnings.catch_warnings():
+            # pandas warns when an ISO 8601 value is read with dayfirst
+            warnings.simplefilter('ignore', UserWarning)
+            parsed = [DataProcessor._parse_timestamp(value, dayfirst, timezone) for value in unique_values]
+
+        unparsed = [value for value, timestamp in zip(unique_values, parsed) if timestamp is None]
+        if unparsed:
+            rows = int(np.isin(codes, [i for i, timestamp in enumerate(parsed) if timestamp is None]).sum())
+            raise ValueError(f"Unrecognized {TIMESTAMP_COLUMN} value in {rows} row(s), e.g. '{unparsed[0]}'")
+
+        # Rows with a missing timestamp (code -1) stay missing
+        return pd.Series(pd.DatetimeIndex(parsed, tz='UTC')).reindex(codes).set_axis(values.index)
+
+    @staticmethod
+    def _parse_timestamp(value, dayfirst: bool, timezone: str) -> Optional[pd.Timestamp]:
+        """
+        Parse one timestamp in any layout pandas recognizes, in UTC. A trailing
+        zone abbreviation pandas does not know (e.g. AEST) must be one the
+        marketplace time zone uses at that time, and settles DST ambiguity.
+
+        Returns:
+            UTC timestamp; NaT for a local time a DST change skips or repeats;
+            None if the value is not a recognizable timestamp
+        """
+        text = str(value).strip()
+        abbreviation = None
+        try:
+            timestamp = pd.to_datetime(text, dayfirst=dayfirst)
+        except (ValueError, OverflowError):
+            text, _, abbreviation = text.rpartition(' ')
+            if not abbreviation.isalpha():
+                return None
+            try:
+                timestamp = pd.to_datetime(text, dayfirst=dayfirst)
+            except (ValueError, OverflowError):
+                return None
+        if timestamp is pd.NaT:
+            return None
+
+        if timestamp.tzinfo is None:
+            if abbreviation is None:
+                timestamp = timestamp.tz_localize(timezone, ambiguous='NaT', nonexistent='NaT')
+            else:
+                localized = [timestamp.tz_localize(timezone, ambiguous=is_dst, nonexistent='NaT')
+                             for is_dst in (True, False)]
+                matching = [local for local in localized if local is not pd.NaT and local.tzname() == abbreviation]
+                if not matching:
+                    return None
+                timestamp = matching[0]
+        return timestamp.tz_convert('UTC')
+
     def get_exchange_rate(self, currency: str, date: str) -> float:
         """
-        Get exchange rate for specified currency and date from FRED API
+        Get exchange rate for specified currency and date from the rate provider
 
         Args:
-            currency: Currency code (CAD, AUD)
+            currency: Currency code (e.g. CAD, EUR)
             date: Date string in YYYY-MM-DD format
 
         Returns:
@@ -56,31 +325,327 @@ class DataProcessor:
         if not series_id:
             raise ValueError(f"Unsupported currency: {currency}")
 
+        self.profile.count('rate_lookups')
+        memo_key = (currency, date, self.fill_policy)
+        rate = self.rate_memo.rates.get(memo_key)
+        if rate is not None:
+            return rate
+
         try:
-            # Get the series data for the specific date
-            series_data = self.fred.get_series(series_id, date)
-
-            # Extract the rate for our specific date
-            if date in series_data.index:
-                rate = series_data[date]
-                if pd.isna(rate):  # Check for NaN value
-                    raise ValueError(f"No exchange rate data available for {currency} on {date}")
-                return float(rate)
+            calendar = self.rate_calendars.get(currency)
+            if calendar is not None and calendar.covers(date, date):
+                self.profile.count('calendar_hits')
             else:
+                # Get the series data for the window around our date
+                window_start, window_end = self._rate_window(date)
+                calendar = self._build_calendar(currency, window_start, window_end)
+
+            rate = calendar.rate_for(date)
+            if pd.isna(rate):  # Check for NaN value
                 raise ValueError(f"No exchange rate data available for {currency} on {date}")
+            self.rate_memo.rates.put(memo_key, rate)
+            return rate
+
+        except Exception as e:
+            raise Exception(f"Failed to fetch exchange rate: {str(e)}")
+
+    def prefetch_exchange_rates(self, currency: str, dates: pd.Series) -> None:
+        """
+        Fetch the whole rate series between the earliest and latest statement
+        date in a single request, so every per-row lookup is answered from memory
+
+        Args:
+            currency: Currency code (e.g. CAD, EUR)
+            dates: 'Date' column of the statement in US format (MM/DD/YYYY)
+        """
+        self.prefetch_many({currency: dates})
+
+    def prefetch_many(self, dates_by_currency: Dict[str, pd.Series]) -> None:
+        """
+        Prefetch the rates of several currencies in one batch. The window of
+        every currency whose calendar does not span its dates yet is handed to
+        the provider together, so providers with get_many (AsyncFredRateProvider)
+        fetch them concurrently instead of one after another
+
+        Args:
+            dates_by_currency: Currency code -> 'Date' values in US format (MM/DD/YYYY)
+        """
+        windows = {}
+        for currency, dates in dates_by_currency.items():
+            parsed_dates = self._parse_dates(dates.dropna().unique())
+            if parsed_dates.empty or self._memoized_rates(currency, parsed_dates) is not None:
+                continue
+
+            start = parsed_dates.min().strftime('%Y-%m-%d')
+            end = parsed_dates.max().strftime('%Y-%m-%d')
+            calendar = self.rate_calendars.get(currency)
+            if calendar is not None and calendar.covers(start, end):
+                self.profile.count('calendar_hits')
+                continue
+            windows[currency] = (start, end)
+
+        if not windows:
+            return
 
+        try:
+            self._build_calendars(windows)
         except Exception as e:
             raise Exception(f"Failed to fetch exchange rate: {str(e)}")
 
+    def _calendar_for(self, currency: str, parsed_dates: pd.DatetimeIndex) -> RateCalendar:
+        """Return the currency's calendar, fetching it if it does not span the dates"""
+        start = parsed_dates.min().strftime('%Y-%m-%d')
+        end = parsed_dates.max().strftime('%Y-%m-%d')
+
+        calendar = self.rate_calendars.get(currency)
+        if calendar is not None and calendar.covers(start, end):
+            self.profile.count('calendar_hits')
+            return calendar
+
+        return self._build_calendar(currency, start, end)
+
+    def _build_calendar(self, currency: str, start: str, end: str) -> RateCalendar:
+        """
+        Fetch a currency's series for a window (padded so the edges can be
+        filled) and keep it as a daily calendar for later lookups
+
+        Args:
+            currency: Currency code (e.g. CAD, EUR)
+            start: First date (YYYY-MM-DD)
+            end: Last date (YYYY-MM-DD)
+
+        Returns:
+            RateCalendar covering start..end
+        """
+        return self._build_calendars({currency: (start, end)})[currency]
+
+    def _build_calendars(self, windows: Dict[str, Tuple[str, str]]) -> Dict[str, RateCalendar]:
+        """
+        _build_calendar for several currencies, with their series fetched in one batch
+
+        Args:
+            windows: Currency code -> (first date, last date), YYYY-MM-DD
+
+        Returns:
+            dict of currency code -> RateCalendar
+        """
+        padding = pd.Timedelta(days=FILL_PADDING_DAYS if self.fill_policy else 0)
+        requests = []
+        for currency, (start, end) in windows.items():
+            series_id = self.series_ids.get(currency)
+            if not series_id:
+                raise ValueError(f"Unsupported currency: {currency}")
+            requests.append((
+                series_id,
+                (pd.Timestamp(start) - padding).strftime('%Y-%m-%d'),
+                (pd.Timestamp(end) + padding).strftime('%Y-%m-%d')
+            ))
+
+        self.profile.count('calendar_builds', len(windows))
+        calendars = {}
+        for (currency, (start, end)), series_data in zip(windows.items(), self._fetch_many(requests)):
+            calendars[currency] = RateCalendar(series_data, start, end, fill_policy=self.fill_policy)
+            self.rate_calendars[currency] = calendars[currency]
+
+        return calendars
+
+    @staticmethod
+    def _parse_dates(dates) -> pd.DatetimeIndex:
+        """Parse US-format statement dates (MM/DD/YYYY) in one vectorized call"""
+        return pd.DatetimeIndex(pd.to_datetime(pd.Index(dates), format='%m/%d/%Y'))
+
+    def _rate_window(self, date: str) -> Tuple[str, str]:
+        """
+        Window fetched for a single date lookup: the whole calendar year
+        (up to today) when caching, so the rest of the statement is served
+        from the cache. Without a cache only the date itself is fetched.
+        """
+        if self.rate_cache is None:
+            return date, date
+
+        year = pd.Timestamp(date).year
+        year_end = min(pd.Timestamp(year=year, month=12, day=31), pd.Timestamp.today().normalize())
+        return f"{year}-01-01", max(year_end.strftime('%Y-%m-%d'), date)
+
+    def _fetch_many(self, requests: List[Tuple[str, str, str]]) -> List[pd.Series]:
+        """
+        Fetch several (series_id, start, end) windows. Windows neither the rate
+        memo nor the persistent cache can answer go to the provider in one batch: a single get_many
+        call when the provider has one, else one get_series call each
+
+        Returns:
+            List of rate Series indexed by date, in request order
+        """
+        results = [self.rate_memo.get_series(*request) for request in requests]
+        if self.rate_cache is not None:
+            for i, (series_id, start, end) in enumerate(requests):
+                if results[i] is not None:
+                    continue
+                results[i] = self.rate_cache.get_rates(series_id, start, end)
+                self.profile.count('rate_cache_hits' if results[i] is not None else 'rate_cache_misses')
+                if results[i] is not None:
+                    self.rate_memo.store_series(series_id, start, end, results[i])
+
+        pending = [i for i, series_data in enumerate(results) if series_data is None]
+        if not pending:
+            return results
+        to_fetch = [requests[i] for i in pending]
+
+        try:
+            with self.profile.stage('rate_fetch') as stage:
+                if hasattr(self.rate_provider, 'get_many'):
+                    fetched = self.rate_provider.get_many(to_fetch)
+                else:
+                    fetched = [self.rate_provider.get_series(*request) for request in to_fetch]
+                stage.rows = sum(len(series_data) for series_data in fetched)
+        except Exception:
+            # Offline: fall back to expired cache entries rather than failing
+            if self.rate_cache is None:
+                raise
+            fetched = [self.rate_cache.get_rates(*request, allow_stale=True) for request in to_fetch]
+            if any(series_data is None for series_data in fetched):
+                raise
+        else:
+            for request, series_data in zip(to_fetch, fetched):
+                self.rate_memo.store_series(*request, series_data)
+                if self.rate_cache is not None:
+                    self.rate_cache.store(*request, series_data)
+
+        for i, series_data in zip(pending, fetched):
+            results[i] = series_data
+
+        return results
+
+    @staticmethod
+    def _round_amounts(amounts: pd.DataFrame, decimals: int = 2) -> pd.DataFrame:
+        """
+        Round amounts to cents with the same results as Python's round()
+
+        NumPy rounds by scaling, which can land on the other side of a tie
+        than Python's correctly rounded round(). Values close to a tie are
+        re-rounded with round() so the output matches the per-cell loop.
+        """
+        values = amounts.to_numpy(dtype='float64', copy=True)
+        rounded = np.round(values, decimals)
+
+        scaled = values * 10 ** decimals
+        near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+        for position in zip(*np.nonzero(near_tie)):
+            rounded[position] = round(float(values[position]), decimals)
+
+        return pd.DataFrame(rounded, index=amounts.index, columns=amounts.columns)
+
+    def _convert_exact(self, amounts: pd.DataFrame, total_column: str, rates: pd.Series,
+                       quote: str) -> pd.DataFrame:
+        """
+        Money mode conversion: every amount is converted as int64 cents and
+        rounded once with the money_mode rounding. Rows whose Total equals the
+        sum of its components get the sum of the converted components as
+        Total, so they still reconcile in USD; other rows have their Total
+        converted on its own
+
+        Args:
+            amounts: Component columns and the Total column as floats
+            total_column: Name of the Total column, e.g. 'Total (CAD)'
+            rates: Exchange rate per row
+            quote: Quote direction of the rates
+
+        Returns:
+            DataFrame of the converted amounts (floats with exact cents)
+        """
+        rate_values = rates.to_numpy(dtype='float64')
+
+        converted = {}
+        source_sum = np.zeros(len(amounts), dtype='int64')
+        converted_sum = np.zeros(len(amounts), dtype='int64')
+        for column in COMPONENT_COLUMNS:
+            cents, missing = to_cents(amounts[column])
+            usd_cents = convert_cents(cents, rate_values, quote, self.money_mode)
+            source_sum += cents
+            converted_sum += usd_cents
+            converted[column] = from_cents(usd_cents, missing)
+
+        total_cents, total_missing = to_cents(amounts[total_column])
+        usd_total = np.where(
+            total_cents == source_sum,
+            converted_sum,
+            convert_cents(total_cents, rate_values, quote, self.money_mode)
+        )
+        converted[total_column] = from_cents(usd_total, total_missing)
+
+        return pd.DataFrame(converted, index=amounts.index, columns=amounts.columns)
+
+    def _map_exchange_rates(self, currency: str, dates: pd.Series) -> pd.Series:
+        """
+        Build a date -> rate lookup for the distinct dates of a statement
+        and map it back onto every row
+
+        Args:
+            currency: Currency code (e.g. CAD, EUR)
+            dates: 'Date' column in US format (MM/DD/YYYY)
+
+        Returns:
+            pandas Series of exchange rates aligned with dates
+
+        Raises:
+            ValueError: If rows have no date, so no rate can be picked for them
+        """
+        undated = dates.index[dates.isna()]
+        if len(undated):
+            shown = ', '.join(str(row) for row in undated[:5]) + (', ...' if len(undated) > 5 else '')
+            raise ValueError(f"No Date in {len(undated)} row(s) ({shown}), so their amounts cannot be converted")
+
+        unique_dates = dates.unique()
+        parsed_dates = self._parse_dates(unique_dates)
+        if parsed_dates.empty:
+            return pd.Series(index=dates.index, dtype='float64')
+        self.profile.count('rate_lookups', len(parsed_dates))
+
+        rates = self._memoized_rates(currency, parsed_dates)
+        if rates is None:
+            try:
+                calendar = self._calendar_for(currency, parsed_dates)
+            except Exception as e:
+                raise Exception(f"Failed to fetch exchange rate: {str(e)}")
+            rates = calendar.rates_for(parsed_dates)
+            for date, rate in zip(parsed_dates.strftime('%Y-%m-%d'), rates):
+                if not np.isnan(rate):
+                    self.rate_memo.rates.put((currency, date, self.fill_policy), float(rate))
+
+        missing = np.isnan(rates)
+        if missing.any():
+            date = parsed_dates[missing][0].strftime('%Y-%m-%d')
+            raise Exception(
+                f"Failed to fetch exchange rate: No exchange rate data available for {currency} on {date}"
+            )
+
+        rate_by_date = pd.Series(rates, index=unique_dates, dtype='float64')
+
+        return dates.map(rate_by_date)
+
+    def _memoized_rates(self, currency: str, parsed_dates: pd.DatetimeIndex) -> Optional[np.ndarray]:
+        """Rates of all the dates from the rate memo, or None if any of them is not memoized"""
+        rates = np.empty(len(parsed_dates), dtype='float64')
+        for i, date in enumerate(parsed_dates.strftime('%Y-%m-%d')):
+            rate = self.rate_memo.rates.get((currency, date, self.fill_policy))
+            if rate is None:
+                return None
+            rates[i] = rate
+        return rates
+
     def transform_currency(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Transform marketplace DataFrame:
-        - Convert all numeric values from CAD/AUD to USD
-        - Rename currency column from Total (CAD/AUD) to Total (USD)
+        - Convert all numeric values from the marketplace currency to USD
+        - Rename currency column from Total (XXX) to Total (USD)
+
+        The quote direction of the currency's rate series (MARKETPLACE_CONFIG)
+        decides whether amounts are divided or multiplied by the rates; the
+        whole statement is converted in one vectorized pass. In money mode the
+        conversion is done in exact cents (see _convert_exact).
 
         Args:
             df: pandas DataFrame with marketplace data
-            marketplace: str, marketplace code ('CA' for Canada, 'AU' for Australia)
 
         Returns:
             DataFrame with transformed currency and renamed column
@@ -90,8 +655,14 @@ class DataProcessor:
 
         # Get currency from Total column name
         total_column = [col for col in df.columns if col.startswith('Total (')][
-            0]  # finds 'Total (CAD)' or 'Total (AUD)'
-        currency = total_column[total_column.find('(') + 1:total_column.find(')')]  # extracts 'CAD' or 'AUD'
+            0]  # finds e.g. 'Total (CAD)'
+        currency = total_column[total_column.find('(') + 1:total_column.find(')')]  # extracts e.g. 'CAD'
+
+        config = MARKETPLACE_CONFIG.get(currency)
+        if config is None:
+            raise ValueError(f"Unsupported currency: {currency}")
+        if config['quote'] is None:  # Already USD
+            return result
 
         # Numeric columns that need conversion
         numeric_cols = [
@@ -102,18 +673,22 @@ class DataProcessor:
             f'Total ({currency})'
         ]
 
-        # Convert each row using the date's exchange rate
-        for idx, row in result.iterrows():
-            # Get exchange rate for this date
-            date_str = pd.to_datetime(row['Date']).strftime('%Y-%m-%d')
-            rate = self.get_exchange_rate(currency, date_str)
-
-            # Convert numeric columns
-            for col in numeric_cols:
-                if currency == 'CAD':
-                    result.at[idx, col] = round(row[col] / rate, 2)
-                else:  # AUD
-                    result.at[idx, col] = round(row[col] * rate, 2)
+        with self.profile.stage('fx') as stage:
+            # Fetch the statement's date window once, then look up each distinct
+            # date in the daily calendar and map the rates onto every row
+            rates = self._map_exchange_rates(currency, result['Date'])
+
+            # Convert all numeric columns in one pass
+            amounts = result[numeric_cols].astype('float64')
+            if self.money_mode:
+                result[numeric_cols] = self._convert_exact(amounts, f'Total ({currency})', rates, config['quote'])
+            else:
+                if config['quote'] == QUOTE_PER_USD:
+                    converted = amounts.div(rates, axis=0)
+                else:  # QUOTE_USD_PER_UNIT
+                    converted = amounts.mul(rates, axis=0)
+                result[numeric_cols] = self._round_amounts(converted)
+            stage.rows = len(result)
 
         # Rename currency column
         result = result.rename(columns={f'Total ({currency})': 'Total (USD)'})
@@ -0,0 +1,233 @@
+"""
+Writers for the merged statement: CSV, XLSX, Parquet and Feather.
+
+Every writer takes the data chunk by chunk, so a merge can be streamed to
+disk without holding a second full copy of it in memory:
+
+    with open_writer('merged.parquet') as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+xlsxwriter (XLSX) and pyarrow (Parquet, Feather) are optional and only
+imported when their format is used.
+"""
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from .csv_processor import statement_dtypes
+
+EXPORT_FORMATS = ('csv', 'xlsx', 'parquet', 'feather')
+
+# Rows per worksheet, including the header row (Excel's limit)
+XLSX_MAX_ROWS = 1_048_576
+
+
+def export_format(output_path: Union[str, Path], output_format: Optional[str] = None) -> str:
+    """
+    Resolve the export format, from the output file extension if not given
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred
+    """
+    output_format = output_format or Path(output_path).suffix.lower().lstrip('.')
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{output_format}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+    return output_format
+
+
+def open_writer(output_path: Union[str, Path], output_format: Optional[str] = None) -> 'StatementWriter':
+    """
+    Create the writer for an output file
+
+    Args:
+        output_path: File to write
+        output_format: One of EXPORT_FORMATS (default: from the file extension)
+
+    Returns:
+        StatementWriter, to be used as a context manager
+    """
+    writers = {
+        'csv': CSVStatementWriter,
+        'xlsx': XLSXStatementWriter,
+        'parquet': ParquetStatementWriter,
+        'feather': FeatherStatementWriter,
+    }
+    return writers[export_format(output_path, output_format)](output_path)
+
+
+def write_statement(statement_data: pd.DataFrame, output_path: Union[str, Path],
+                    output_format: Optional[str] = None, chunksize: int = 100_000) -> int:
+    """
+    Write a DataFrame in slices of chunksize rows
+
+    Returns:
+        int: Number of rows written
+    """
+    with open_writer(output_path, output_format) as writer:
+        for start in range(0, len(statement_data), chunksize):
+            writer.write(statement_data.iloc[start:start + chunksize])
+        if len(statement_data) == 0:
+            writer.write(statement_data)
+    return writer.rows_written
+
+
+class StatementWriter:
+    """
+    Base class for chunked writers. The first chunk fixes the column order;
+    later chunks are written in that order.
+    """
+
+    def __init__(self, output_path: Union[str, Path]):
+        self.output_path = Path(output_path)
+        self.columns = None
+        self.rows_written = 0
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Append a chunk of rows"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self._open(chunk)
+        elif set(chunk.columns) != set(self.columns):
+            raise ValueError(f"Columns {list(chunk.columns)} differ from the first chunk's {self.columns}")
+
+        self._write(chunk[self.columns])
+        self.rows_written += len(chunk)
+
+    def close(self) -> None:
+        """Finish the file"""
+
+    def _open(self, first_chunk: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def _write(self, chunk: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def __enter__(self) -> 'StatementWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class CSVStatementWriter(StatementWriter):
+    """CSV output with a single header row"""
+
+    def _open(self, first_chunk: pd.DataFrame) -> None:
+        self.output_file = open(self.output_path, 'w', newline='', encoding='utf-8')
+        # The header is written here: the first chunk can be empty (header-only statement)
+        first_chunk.iloc[:0].to_csv(self.output_file, index=False)
+
+    def _write(self, chunk: pd.DataFrame) -> None:
+        chunk.to_csv(self.output_file, header=False, index=False)
+
+    def close(self) -> None:
+        if self.columns is not None:
+            self.output_file.close()
+
+
+class XLSXStatementWriter(StatementWriter):
+    """
+    XLSX output through xlsxwriter's constant_memory mode, which flushes each
+    row to disk once the next one starts. Rows beyond Excel's sheet limit
+    continue on a new worksheet with the same header.
+    """
+
+    def _open(self, first_chunk: pd.DataFrame) -> None:
+        try:
+            import xlsxwriter
+        except ImportError:
+            raise ImportError("XLSX export needs xlsxwriter: pip install xlsxwriter")
+
+        self.workbook = xlsxwriter.Workbook(str(self.output_path), {'constant_memory': True})
+        self.worksheet = None
+        self.sheet_row = XLSX_MAX_ROWS
+
+    def _write(self, chunk: pd.DataFrame) -> None:
+        # NaN cannot be written as a number; None leaves the cell empty
+        values = chunk.astype(object).where(chunk.notna(), None)
+
+        for row in values.itertuples(index=False, name=None):
+            if self.sheet_row == XLSX_MAX_ROWS:
+                self._add_worksheet()
+            self.worksheet.write_row(self.sheet_row, 0, row)
+            self.sheet_row += 1
+
+    def _add_worksheet(self) -> None:
+        sheet_number = len(self.workbook.worksheets()) + 1
+        self.worksheet = self.workbook.add_worksheet('Statement' if sheet_number == 1 else f'Statement {sheet_number}')
+        self.worksheet.write_row(0, 0, self.columns)
+        self.sheet_row = 1
+
+    def close(self) -> None:
+        if self.columns is not None:
+            if self.worksheet is None:
+                self._add_worksheet()
+            self.workbook.close()
+
+
+class _ArrowStatementWriter(StatementWriter):
+    """
+    Shared conversion for the Arrow-based formats. The Arrow schema comes from
+    the statement schema (statement_dtypes), not from the first chunk's data,
+    which can be empty or all missing in a column: amount columns are doubles,
+    everything else is written as strings. Categorical columns are written as
+    plain strings too, because their categories differ from chunk to chunk.
+    """
+
+    def _open(self, first_chunk: pd.DataFrame) -> None:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Parquet and Feather export need pyarrow: pip install pyarrow")
+
+        self.pa = pa
+        dtypes = statement_dtypes(first_chunk.columns)
+        # Columns outside the statement schema can hold anything: numbers in one
+        # chunk, text or nothing in another
+        self.text_columns = [column for column in first_chunk.columns if column not in dtypes]
+        self.schema = pa.schema([
+            (column, pa.float64() if dtypes.get(column) == 'float64' else pa.string())
+            for column in first_chunk.columns
+        ])
+        self._open_file()
+
+    def _to_table(self, chunk: pd.DataFrame):
+        chunk = chunk.astype({column: 'string' for column in self.text_columns})
+        return self.pa.Table.from_pandas(chunk, preserve_index=False).cast(self.schema)
+
+    def _open_file(self) -> None:
+        raise NotImplementedError
+
+
+class ParquetStatementWriter(_ArrowStatementWriter):
+    """Parquet output, one row group per chunk"""
+
+    def _open_file(self) -> None:
+        import pyarrow.parquet as pq
+
+        self.writer = pq.ParquetWriter(str(self.output_path), self.schema)
+
+    def _write(self, chunk: pd.DataFrame) -> None:
+        self.writer.write_table(self._to_table(chunk))
+
+    def close(self) -> None:
+        if self.columns is not None:
+            self.writer.close()
+
+
+class FeatherStatementWriter(_ArrowStatementWriter):
+    """Feather (Arrow IPC file) output, one record batch per chunk"""
+
+    def _open_file(self) -> None:
+        import pyarrow.ipc
+
+        self.writer = pyarrow.ipc.new_file(str(self.output_path), self.schema)
+
+    def _write(self, chunk: pd.DataFrame) -> None:
+        self.writer.write_table(self._to_table(chunk))
+
+    def close(self) -> None:
+        if self.columns is not None:
+            self.writer.close()
@@ -0,0 +1,247 @@
+"""
+Asynchronous client for the FRED series/observations API.
+
+Requests for several series or date windows run concurrently over a small
+pool of keep-alive HTTP connections, so a multi-currency merge waits for the
+slowest request instead of the sum of all of them:
+
+    client = AsyncFredClient(api_key)
+    rates = asyncio.run(client.fetch_many([('DEXCAUS', '2024-01-01', '2024-01-31'),
+                                           ('DEXUSAL', '2024-01-01', '2024-01-31')]))
+
+Only the standard library is used: blocking http.client requests run in
+worker threads through asyncio.to_thread, at most `max_concurrency` at a time.
+Rate limiting (HTTP 429), server errors (5xx) and dropped connections are
+retried with exponential backoff.
+"""
+import asyncio
+import http.client
+import json
+import socket
+import threading
+from typing import List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import pandas as pd
+
+FRED_API_URL = 'https://api.stlouisfed.org/fred'
+
+# Connection failures worth retrying: dropped keep-alive connections and
+# timeouts. Other OS errors (e.g. no DNS when offline) fail at once
+RETRY_ERRORS = (ConnectionError, socket.timeout, http.client.HTTPException)
+
+# Backoff before retry n (0-based) is backoff * 2 ** n seconds, or the
+# server's Retry-After, capped at MAX_BACKOFF_SECONDS
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class FredHTTPError(Exception):
+    """A FRED request answered with an error status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        """Rate limiting and server errors are worth retrying, client errors are not"""
+        return self.status == 429 or self.status >= 500
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections to one host, shared by the worker threads
+    of an AsyncFredClient. Idle connections are reused; a connection is
+    dropped when it fails or the server asks to close it.
+    """
+
+    def __init__(self, base_url: str, size: int, timeout: float):
+        """
+        Args:
+            base_url: Scheme, host and path prefix, e.g. https://api.stlouisfed.org/fred
+            size: Most idle connections kept open
+            timeout: Socket timeout in seconds
+
+        Raises:
+            ValueError: If base_url is not an http(s) URL
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Invalid FRED API URL: {base_url}")
+
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path.rstrip('/')
+        self.size = size
+        self.timeout = timeout
+        # Number of connections opened so far
+        self.opened = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def get(self, path: str, params: dict) -> Tuple[int, Optional[str], bytes]:
+        """
+        Send one GET request on a pooled connection (blocking)
+
+        Returns:
+            (status, Retry-After header or None, response body)
+        """
+        connection = self._acquire()
+        try:
+            connection.request('GET', f"{self.path}{path}?{urlencode(params)}",
+                               headers={'Accept': 'application/json'})
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+
+        return response.status, response.getheader('Retry-After'), body
+
+    def close(self) -> None:
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def __getstate__(self):
+        # Connections and locks cannot be pickled (DataProcessor travels to
+        # worker processes); the copy starts with an empty pool
+        state = self.__dict__.copy()
+        state['_idle'] = []
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.opened += 1
+        return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+
+class AsyncFredClient:
+    """Fetches FRED observations concurrently over pooled keep-alive connections"""
+
+    def __init__(self, api_key: str, base_url: str = FRED_API_URL, max_concurrency: int = 4,
+                 max_retries: int = 3, backoff: float = 0.5, timeout: float = 30.0):
+        """
+        Args:
+            api_key: FRED API key
+            base_url: API root, e.g. a local stub server in tests
+            max_concurrency: Most requests in flight at once (and pooled connections)
+            max_retries: Retries of a request after a 429, 5xx or connection error
+            backoff: Delay before the first retry in seconds, doubled for each next one
+            timeout: Socket timeout in seconds
+        """
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pool = ConnectionPool(base_url, max_concurrency, timeout)
+
+    async def fetch_series(self, series_id: str, start: str, end: str) -> pd.Series:
+        """Fetch one series between two dates (inclusive)"""
+        return (await self.fetch_many([(series_id, start, end)]))[0]
+
+    async def fetch_many(self, requests: Sequence[Tuple[str, str, str]]) -> List[pd.Series]:
+        """
+        Fetch several (series_id, start, end) windows concurrently
+
+        Returns:
+            List of rate Series indexed by date, in request order
+
+        Raises:
+            FredHTTPError: If a request fails with a non-retryable status or
+                still fails after max_retries
+        """
+        # Created here, inside the running loop (each asyncio.run has its own)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return list(await asyncio.gather(*(
+            self._fetch(semaphore, series_id, start, end) for series_id, start, end in requests
+        )))
+
+    def close(self) -> None:
+        """Close the pooled connections"""
+        self.pool.close()
+
+    async def _fetch(self, semaphore: asyncio.Semaphore, series_id: str, start: str, end: str) -> pd.Series:
+        params = {
+            'series_id': series_id,
+            'observation_start': start,
+            'observation_end': end,
+            'api_key': self.api_key,
+            'file_type': 'json'
+        }
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            async with semaphore:
+                try:
+                    status, retry_after, body = await asyncio.to_thread(
+                        self.pool.get, '/series/observations', params
+                    )
+                except RETRY_ERRORS as e:
+                    error = e
+                else:
+                    if status == 200:
+                        return parse_observations(body, series_id)
+                    error = FredHTTPError(status, f"FRED request for {series_id} failed with HTTP {status}"
+                                                  f"{_error_detail(body)}")
+                    if not error.retryable:
+                        raise error
+
+            if attempt == self.max_retries:
+                raise error
+            # Sleep outside the semaphore so other requests can use the slot
+            await asyncio.sleep(self._delay(attempt, retry_after))
+
+    def _delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before the next attempt, honouring a numeric Retry-After"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff * 2 ** attempt
+        return min(max(delay, 0.0), MAX_BACKOFF_SECONDS)
+
+
+def parse_observations(body: bytes, series_id: str = '') -> pd.Series:
+    """
+    Parse a series/observations JSON response into rates indexed by date.
+    FRED marks days without a rate with '.', which become NaN.
+    """
+    observations = json.loads(body).get('observations', [])
+
+    return pd.Series(
+        pd.to_numeric([observation['value'] for observation in observations], errors='coerce'),
+        index=pd.DatetimeIndex([observation['date'] for observation in observations]),
+        dtype='float64',
+        name=series_id or None
+    )
+
+
+def _error_detail(body: bytes) -> str:
+    """FRED's error_message from an error response, if it has one"""
+    try:
+        message = json.loads(body).get('error_message')
+    except (ValueError, AttributeError):
+        return ''
+    return f": {message}" if message else ''
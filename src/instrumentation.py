@@ -0,0 +1,188 @@
+"""
+Per-stage timing, row and memory instrumentation for the statement pipeline.
+
+CSVProcessor, DataProcessor and StatementMerger accept a `profile`. Each
+stage they run ('read', 'validate', 'dates', 'fx', 'concat', ...) is recorded
+in it with its wall time and rows, together with counters such as rate
+lookups and cache hits:
+
+    profile = PipelineProfile()
+    merger = StatementMerger(api_key, profile=profile)
+    merger.merge_statements(files)
+    print(profile.format_table())
+
+Without a profile the components use NULL_PROFILE, which records nothing.
+Stages that run in worker processes (use_processes=True) are not recorded,
+since each process works on its own copy of the profile.
+"""
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class StageRecord:
+    """Totals of one pipeline stage over all of its calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.peak_traced_mb = None
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'rows_per_s': self.rows / self.seconds if self.seconds and self.rows else None,
+            'peak_traced_mb': self.peak_traced_mb
+        }
+
+
+class StageRows:
+    """Handed out by PipelineProfile.stage, so the stage can report the rows it processed"""
+
+    def __init__(self):
+        self.rows = 0
+
+
+class PipelineProfile:
+    """
+    Collects stage timings and counters. Safe to share between the threads
+    of a threaded merge.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Args:
+            trace_memory: Record each stage's peak Python allocation with
+                tracemalloc. Slows the pipeline down, so it is off by default
+        """
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, StageRecord] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRows]:
+        """
+        Time a block as one call of a stage. Set `.rows` on the yielded
+        object to record the rows it processed.
+        """
+        stage_rows = StageRows()
+
+        # Tracing runs only inside stages. A stage nested in another (or
+        # running alongside it in another thread) resets the shared peak,
+        # so peaks are approximate in that case
+        start_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield stage_rows
+        finally:
+            seconds = time.perf_counter() - start
+            peak_mb = None
+            if self.trace_memory:
+                peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            if start_tracing:
+                tracemalloc.stop()
+            self.add(name, seconds, stage_rows.rows, peak_mb)
+
+    def add(self, name: str, seconds: float, rows: int = 0, peak_traced_mb: Optional[float] = None) -> None:
+        """Record one call of a stage that was timed by the caller"""
+        with self._lock:
+            record = self.stages.setdefault(name, StageRecord())
+            record.calls += 1
+            record.seconds += seconds
+            record.rows += rows
+            if peak_traced_mb is not None:
+                record.peak_traced_mb = max(record.peak_traced_mb or 0.0, peak_traced_mb)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increase a counter, e.g. 'rate_lookups' or 'rate_cache_hits'"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> dict:
+        """
+        Structured report of everything recorded
+
+        Returns:
+            dict with 'wall_seconds' since the profile was created, 'peak_rss_mb'
+            of the process (None where unavailable), 'stages' and 'counters'
+        """
+        with self._lock:
+            return {
+                'wall_seconds': time.perf_counter() - self._started,
+                'peak_rss_mb': peak_rss_mb(),
+                'stages': {name: record.to_dict() for name, record in self.stages.items()},
+                'counters': dict(self.counters)
+            }
+
+    def format_table(self) -> str:
+        """Report as a plain-text table, for the CLI's --profile"""
+        report = self.report()
+        lines = [f"{'stage':<16} {'calls':>6} {'seconds':>9} {'rows':>10} {'rows/s':>12} {'peak MB':>8}"]
+        for name, stage in report['stages'].items():
+            rows_per_s = f"{stage['rows_per_s']:,.0f}" if stage['rows_per_s'] else '-'
+            peak = f"{stage['peak_traced_mb']:.1f}" if stage['peak_traced_mb'] is not None else '-'
+            lines.append(f"{name:<16} {stage['calls']:>6} {stage['seconds']:>9.3f} {stage['rows']:>10} "
+                         f"{rows_per_s:>12} {peak:>8}")
+
+        lines.append(f"wall time: {report['wall_seconds']:.3f}s")
+        if report['peak_rss_mb'] is not None:
+            lines.append(f"peak RSS: {report['peak_rss_mb']:.1f} MB")
+        for name, value in report['counters'].items():
+            lines.append(f"{name}: {value}")
+
+        return '\n'.join(lines)
+
+    def __getstate__(self):
+        # Locks cannot be pickled (the profile travels to worker processes)
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class NullProfile:
+    """Profile that records nothing, used when instrumentation is off"""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRows]:
+        yield StageRows()
+
+    def add(self, name: str, seconds: float, rows: int = 0, peak_traced_mb: Optional[float] = None) -> None:
+        pass
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+
+NULL_PROFILE = NullProfile()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where it is not available"""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
@@ -1,14 +1,131 @@
+# How a rate series is quoted, which decides how amounts are converted to USD
+QUOTE_PER_USD = 'per_usd'            # units of the currency per 1 USD: divide
+QUOTE_USD_PER_UNIT = 'usd_per_unit'  # USD per 1 unit of the currency: multiply
+
+# Marketplace registry keyed by the currency of the statement's 'Total (XXX)' column.
+#   market: Amazon marketplace code(s)
+#   date_format: date format used in the statement's Date column
+#   timezone: local time zone of the marketplace's report timestamps
+#   rate_series: daily rate series ID. FRED H.10 series where FRED publishes one;
+#       'XXX_PER_USD' IDs are not on FRED and must come from a rate file
+#       (--rates-file / FileRateProvider) with a column of that name
+#   quote: QUOTE_PER_USD or QUOTE_USD_PER_UNIT, how rate_series is quoted
 MARKETPLACE_CONFIG = {
     'USD': {
         'market': 'US',
-        'date_format': 'MM/DD/YYYY'  # American format
+        'date_format': 'MM/DD/YYYY',  # American format
+        'timezone': 'America/Los_Angeles',
+        'rate_series': None,
+        'quote': None
     },
     'CAD': {
         'market': 'CA',
-        'date_format': 'DD/MM/YYYY'  # Like most other countries
+        'date_format': 'DD/MM/YYYY',  # Like most other countries
+        'timezone': 'America/Los_Angeles',
+        'rate_series': 'DEXCAUS',
+        'quote': QUOTE_PER_USD
     },
     'AUD': {
         'market': 'AU',
-        'date_format': 'DD/MM/YYYY'  # Like most other countries
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Australia/Sydney',
+        'rate_series': 'DEXUSAL',
+        'quote': QUOTE_USD_PER_UNIT
+    },
+    'GBP': {
+        'market': 'UK',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Europe/London',
+        'rate_series': 'DEXUSUK',
+        'quote': QUOTE_USD_PER_UNIT
+    },
+    'EUR': {
+        'market': 'DE/FR/IT/ES/NL/BE/IE',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Europe/Berlin',
+        'rate_series': 'DEXUSEU',
+        'quote': QUOTE_USD_PER_UNIT
+    },
+    'SEK': {
+        'market': 'SE',
+        'date_format': 'YYYY-MM-DD',
+        'timezone': 'Europe/Stockholm',
+        'rate_series': 'DEXSDUS',
+        'quote': QUOTE_PER_USD
+    },
+    'PLN': {
+        'market': 'PL',
+        'date_format': 'DD.MM.YYYY',
+        'timezone': 'Europe/Warsaw',
+        'rate_series': 'PLN_PER_USD',
+        'quote': QUOTE_PER_USD
+    },
+    'TRY': {
+        'market': 'TR',
+        'date_format': 'DD.MM.YYYY',
+        'timezone': 'Europe/Istanbul',
+        'rate_series': 'TRY_PER_USD',
+        'quote': QUOTE_PER_USD
+    },
+    'JPY': {
+        'market': 'JP',
+        'date_format': 'YYYY/MM/DD',
+        'timezone': 'Asia/Tokyo',
+        'rate_series': 'DEXJPUS',
+        'quote': QUOTE_PER_USD
+    },
+    'INR': {
+        'market': 'IN',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Asia/Kolkata',
+        'rate_series': 'DEXINUS',
+        'quote': QUOTE_PER_USD
+    },
+    'SGD': {
+        'market': 'SG',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Asia/Singapore',
+        'rate_series': 'DEXSIUS',
+        'quote': QUOTE_PER_USD
+    },
+    'AED': {
+        'market': 'AE',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Asia/Dubai',
+        'rate_series': 'AED_PER_USD',
+        'quote': QUOTE_PER_USD
+    },
+    'SAR': {
+        'market': 'SA',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Asia/Riyadh',
+        'rate_series': 'SAR_PER_USD',
+        'quote': QUOTE_PER_USD
+    },
+    'EGP': {
+        'market': 'EG',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'Africa/Cairo',
+        'rate_series': 'EGP_PER_USD',
+        'quote': QUOTE_PER_USD
+    },
+    'MXN': {
+        'market': 'MX',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'America/Mexico_City',
+        'rate_series': 'DEXMXUS',
+        'quote': QUOTE_PER_USD
+    },
+    'BRL': {
+        'market': 'BR',
+        'date_format': 'DD/MM/YYYY',
+        'timezone': 'America/Sao_Paulo',
+        'rate_series': 'DEXBZUS',
+        'quote': QUOTE_PER_USD
     }
-}
\ No newline at end of file
+}
+
+
+def strptime_format(date_format: str) -> str:
+    """Turn a MARKETPLACE_CONFIG date format ('DD/MM/YYYY') into a strptime/strftime format"""
+    return date_format.replace('DD', '%d').replace('MM', '%m').replace('YYYY', '%Y')
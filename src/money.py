@@ -0,0 +1,118 @@
+"""
+Exact fixed-point money arithmetic for currency conversion.
+
+In money mode amounts are converted as int64 cents and rates as int64
+millionths, so every result is rounded exactly once, with a chosen rounding
+mode, using NumPy integer operations only:
+- 'half_even': ties go to the even cent (banker's rounding)
+- 'half_up': ties go away from zero (commercial rounding)
+
+A statement's Total is the sum of its component columns. reconcile() checks
+that in exact cents, so it can be verified after conversion.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .market_config import QUOTE_PER_USD
+
+ROUNDING_MODES = ('half_even', 'half_up')
+
+# Amount columns whose sum is the statement's Total
+COMPONENT_COLUMNS = ['Total product charges', 'Total promotional rebates', 'Amazon fees', 'Other']
+
+CENTS = 100
+# FRED publishes rates with 4 decimals; millionths keep them exact. int64 holds
+# cents * RATE_SCALE for amounts up to about 9 billion in any currency
+RATE_SCALE = 10 ** 6
+
+
+def to_cents(amounts) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Amounts as int64 cents
+
+    Args:
+        amounts: Array-like of amounts with (up to) 2 decimals; NaN allowed
+
+    Returns:
+        (cents with missing amounts as 0, boolean mask of the missing amounts)
+    """
+    values = np.asarray(amounts, dtype='float64')
+    missing = np.isnan(values)
+    cents = np.rint(np.where(missing, 0.0, values) * CENTS).astype('int64')
+    return cents, missing
+
+
+def from_cents(cents: np.ndarray, missing: Optional[np.ndarray] = None) -> np.ndarray:
+    """Cents back to float amounts, with the missing amounts as NaN"""
+    amounts = cents / CENTS
+    if missing is not None:
+        amounts[missing] = np.nan
+    return amounts
+
+
+def divide_rounded(numerator: np.ndarray, denominator: np.ndarray, rounding: str = 'half_even') -> np.ndarray:
+    """
+    Integer division rounded to the nearest integer, exactly
+
+    Args:
+        numerator: int64 array
+        denominator: Positive int64 array (or scalar)
+        rounding: One of ROUNDING_MODES, used for exact ties
+
+    Returns:
+        int64 array
+    """
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unknown rounding mode: {rounding}. Supported modes: {list(ROUNDING_MODES)}")
+
+    quotient, remainder = np.divmod(numerator, denominator)  # 0 <= remainder < denominator
+    twice = 2 * remainder
+    if rounding == 'half_even':
+        tie_up = quotient % 2 == 1
+    else:
+        # The floor of a negative tie (e.g. -2.5 -> -3) is already away from zero
+        tie_up = numerator > 0
+
+    return quotient + ((twice > denominator) | ((twice == denominator) & tie_up))
+
+
+def convert_cents(cents: np.ndarray, rates: np.ndarray, quote: str, rounding: str = 'half_even') -> np.ndarray:
+    """
+    Convert cents to USD cents with exact rounding
+
+    Args:
+        cents: int64 amounts in the marketplace currency
+        rates: float rates per row, in the series' quote direction
+        quote: QUOTE_PER_USD (divide by the rate) or QUOTE_USD_PER_UNIT (multiply)
+        rounding: One of ROUNDING_MODES
+
+    Returns:
+        int64 USD cents
+    """
+    rate_units = np.rint(np.asarray(rates, dtype='float64') * RATE_SCALE).astype('int64')
+    if quote == QUOTE_PER_USD:
+        return divide_rounded(cents * RATE_SCALE, rate_units, rounding)
+    return divide_rounded(cents * rate_units, RATE_SCALE, rounding)
+
+
+def reconcile(df: pd.DataFrame, total_column: str = 'Total (USD)') -> pd.DataFrame:
+    """
+    Rows whose Total differs from the sum of its components, in exact cents
+    (missing amounts count as 0)
+
+    Args:
+        df: Statement or merged DataFrame
+        total_column: Total column to check
+
+    Returns:
+        The mismatched rows, with a 'Difference (cents)' column (Total minus
+        the sum of the components); empty if everything reconciles
+    """
+    total, _ = to_cents(df[total_column])
+    components = sum(to_cents(df[column])[0] for column in COMPONENT_COLUMNS)
+
+    difference = total - components
+    mismatched = difference != 0
+    return df[mismatched].assign(**{'Difference (cents)': difference[mismatched]})
@@ -0,0 +1,142 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import pandas as pd
+
+# Days after a date when its published rates are final (FRED H.10 rates come
+# out with a delay of a few business days)
+DEFAULT_SETTLE_DAYS = 7
+
+
+class RateCache:
+    """
+    Persistent on-disk store of exchange-rate observations keyed by (series_id, date).
+
+    Every bulk fetch is recorded together with its date window, so a later
+    lookup knows whether a window is already covered. Staleness policy:
+    - a window fetched at least `settle_days` after its last date is final
+      and never expires (published H.10 rates do not change)
+    - any other window is fresh for `max_age_hours` after it was fetched
+    Stale windows can still be read with allow_stale=True, which lets the
+    processor keep working offline once the cache is warm.
+    """
+
+    def __init__(self, path: Union[str, Path], max_age_hours: float = 24,
+                 settle_days: int = DEFAULT_SETTLE_DAYS):
+        """
+        Open (and create if needed) the cache database
+
+        Args:
+            path: SQLite database file
+            max_age_hours: How long a not yet settled window stays fresh
+            settle_days: Days after a window's end after which its rates are final
+        """
+        self.path = Path(path)
+        self.max_age_hours = max_age_hours
+        self.settle_days = settle_days
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rates ("
+                "series_id TEXT NOT NULL, date TEXT NOT NULL, rate REAL, "
+                "PRIMARY KEY (series_id, date))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fetches ("
+                "series_id TEXT NOT NULL, start TEXT NOT NULL, end TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _is_fresh(self, end: str, fetched_at: float) -> bool:
+        """Apply the staleness policy to a recorded fetch window"""
+        settled_at = pd.Timestamp(end) + pd.Timedelta(days=self.settle_days)
+        if fetched_at >= settled_at.timestamp():
+            return True
+        return time.time() - fetched_at <= self.max_age_hours * 3600
+
+    def covers(self, series_id: str, start: str, end: str, allow_stale: bool = False) -> bool:
+        """
+        Check if a single recorded fetch covers the whole window
+
+        Args:
+            series_id: FRED series ID
+            start: First date (YYYY-MM-DD)
+            end: Last date (YYYY-MM-DD)
+            allow_stale: Accept windows that expired under the staleness policy
+
+        Returns:
+            bool: True if rates for the window can be served from the cache
+        """
+        with self._connect() as conn:
+            windows = conn.execute(
+                "SELECT end, fetched_at FROM fetches WHERE series_id = ? AND start <= ? AND end >= ?",
+                (series_id, start, end)
+            ).fetchall()
+
+        return any(allow_stale or self._is_fresh(window_end, fetched_at)
+                   for window_end, fetched_at in windows)
+
+    def get_rates(self, series_id: str, start: str, end: str,
+                  allow_stale: bool = False) -> Optional[pd.Series]:
+        """
+        Read cached rates for a date window
+
+        Args:
+            series_id: FRED series ID
+            start: First date (YYYY-MM-DD)
+            end: Last date (YYYY-MM-DD)
+            allow_stale: Accept windows that expired under the staleness policy
+
+        Returns:
+            pandas Series of rates indexed by date, or None if the window is not covered
+        """
+        if not self.covers(series_id, start, end, allow_stale=allow_stale):
+            return None
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT date, rate FROM rates WHERE series_id = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (series_id, start, end)
+            ).fetchall()
+
+        return pd.Series(
+            [rate for _, rate in rows],
+            index=pd.DatetimeIndex([date for date, _ in rows]),
+            dtype='float64'
+        )
+
+    def store(self, series_id: str, start: str, end: str, series: pd.Series) -> None:
+        """
+        Save the result of a bulk fetch and record its window
+
+        Args:
+            series_id: FRED series ID
+            start: First date of the fetched window (YYYY-MM-DD)
+            end: Last date of the fetched window (YYYY-MM-DD)
+            series: Rates indexed by date as returned by FRED
+        """
+        rows = [
+            (series_id, pd.Timestamp(date).strftime('%Y-%m-%d'), None if pd.isna(rate) else float(rate))
+            for date, rate in series.items()
+        ]
+
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO rates VALUES (?, ?, ?)", rows)
+            conn.execute(
+                "INSERT INTO fetches VALUES (?, ?, ?, ?)",
+                (series_id, start, end, time.time())
+            )
@@ -0,0 +1,101 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+FILL_POLICIES = ('ffill', 'bfill', 'nearest')
+
+
+class RateCalendar:
+    """
+    Daily exchange-rate calendar for one currency.
+
+    FRED H.10 series have no observations on weekends and US holidays.
+    The calendar holds one rate per calendar day, with the gaps filled
+    according to the fill policy:
+    - 'ffill': last published rate on or before the day
+    - 'bfill': first published rate on or after the day
+    - 'nearest': rate of the closest business day
+    - None: no filling, days without an observation stay NaN
+
+    Rates are kept in a NumPy array indexed by day offset, so a lookup is
+    a single array access.
+    """
+
+    def __init__(self, series: pd.Series, start: str, end: str, fill_policy: Optional[str] = 'ffill'):
+        """
+        Build the calendar from a fetched series
+
+        Args:
+            series: Rates indexed by date, as returned by FRED. Should extend a
+                few days past start/end so the edges can be filled
+            start: First calendar day (YYYY-MM-DD)
+            end: Last calendar day (YYYY-MM-DD)
+            fill_policy: One of FILL_POLICIES, or None to disable filling
+        """
+        if fill_policy is not None and fill_policy not in FILL_POLICIES:
+            raise ValueError(
+                f"Unknown fill policy: {fill_policy}. "
+                f"Supported policies: {list(FILL_POLICIES)}"
+            )
+
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end)
+        self.fill_policy = fill_policy
+
+        observed = series.dropna().astype('float64')
+        observed.index = pd.DatetimeIndex(observed.index).normalize()
+        observed = observed[~observed.index.duplicated(keep='last')].sort_index()
+
+        days = pd.date_range(self.start, self.end, freq='D')
+        if fill_policy is None or observed.empty:
+            filled = observed.reindex(days).to_numpy(dtype='float64')
+        elif fill_policy == 'nearest':
+            filled = self._fill_nearest(observed, days)
+        else:
+            filled = observed.reindex(days, method=fill_policy).to_numpy(dtype='float64')
+
+        self.rates = filled
+
+    @staticmethod
+    def _fill_nearest(observed: pd.Series, days: pd.DatetimeIndex) -> np.ndarray:
+        """Take the closest observation for each day, the earlier one on ties"""
+        observed_days = pd.Series(observed.index, index=observed.index)
+
+        previous_rate = observed.reindex(days, method='ffill').to_numpy(dtype='float64')
+        next_rate = observed.reindex(days, method='bfill').to_numpy(dtype='float64')
+        previous_gap = (days - pd.DatetimeIndex(observed_days.reindex(days, method='ffill'))).days.to_numpy()
+        next_gap = (pd.DatetimeIndex(observed_days.reindex(days, method='bfill')) - days).days.to_numpy()
+
+        use_next = np.isnan(previous_rate) | (next_gap < previous_gap)
+        return np.where(use_next, next_rate, previous_rate)
+
+    def covers(self, start: str, end: str) -> bool:
+        """Check if the calendar spans the whole date window"""
+        return self.start <= pd.Timestamp(start) and pd.Timestamp(end) <= self.end
+
+    def rate_for(self, date: str) -> float:
+        """
+        Rate for a single day
+
+        Args:
+            date: Date string in YYYY-MM-DD format, inside the calendar
+
+        Returns:
+            float: Exchange rate, NaN if no rate is available for the day
+        """
+        return float(self.rates[(pd.Timestamp(date) - self.start).days])
+
+    def rates_for(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Rates for many days at once
+
+        Args:
+            dates: Days inside the calendar
+
+        Returns:
+            NumPy array of rates aligned with dates, NaN where no rate is available
+        """
+        offsets = (dates.normalize() - self.start).days.to_numpy()
+        return self.rates[offsets]
@@ -0,0 +1,149 @@
+"""
+Bounded in-process memo of exchange rates.
+
+DataProcessor keeps every single-date rate it looks up and every series
+window it fetches in a RateMemo, so within a process the same question is
+never sent to the rate provider twice. Unlike RateCache nothing is written
+to disk and nothing expires; entries are only evicted, least recently used
+first, once a limit is reached. Share one RateMemo between processors
+(StatementMerger(rate_memo=...)) to reuse rates across successive merges.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+# Default limits: single-date rates are a few dozen bytes each, series
+# windows up to a few years of daily observations
+DEFAULT_MAX_RATES = 100_000
+DEFAULT_MAX_SERIES = 256
+
+
+class LRUCache:
+    """
+    Thread-safe mapping holding at most `maxsize` entries, evicting the least
+    recently used one. Counts hits, misses and evictions.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Args:
+            maxsize: Most entries kept; 0 disables the cache
+        """
+        if maxsize < 0:
+            raise ValueError(f"maxsize must not be negative, got {maxsize}")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Value of a key (marking it as recently used), or default"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def find(self, predicate: Callable[[Hashable], bool]) -> Optional[Tuple[Hashable, Any]]:
+        """
+        First (key, value) whose key matches the predicate, most recently
+        used first, or None. Counts as one hit or miss.
+        """
+        with self._lock:
+            for key in reversed(self._entries):
+                if predicate(key):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return key, self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond maxsize"""
+        if self.maxsize == 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries; the counters are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Current size and the hit, miss and eviction counters"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Locks cannot be pickled (processors travel to worker processes)
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class RateMemo:
+    """
+    Memo of single-date rates, keyed by (currency, date, fill policy), and of
+    fetched series windows, keyed by (series_id, start, end). A series lookup
+    is answered by any memoized window of the series that spans it.
+    """
+
+    def __init__(self, max_rates: int = DEFAULT_MAX_RATES, max_series: int = DEFAULT_MAX_SERIES):
+        """
+        Args:
+            max_rates: Most single-date rates kept
+            max_series: Most series windows kept
+        """
+        self.rates = LRUCache(max_rates)
+        self.series = LRUCache(max_series)
+
+    def get_series(self, series_id: str, start: str, end: str) -> Optional[pd.Series]:
+        """
+        Rates of a series between two dates (YYYY-MM-DD, inclusive) from a
+        memoized window spanning them, or None
+        """
+        found = self.series.find(
+            lambda key: key[0] == series_id and key[1] <= start and end <= key[2]
+        )
+        if found is None:
+            return None
+        return found[1].sort_index().loc[start:end]
+
+    def store_series(self, series_id: str, start: str, end: str, series_data: pd.Series) -> None:
+        """Keep a fetched window of a series"""
+        self.series.put((series_id, start, end), series_data)
+
+    def stats(self) -> dict:
+        """Counters of both caches: {'rates': {...}, 'series': {...}}"""
+        return {'rates': self.rates.stats(), 'series': self.series.stats()}
+
+    def clear(self) -> None:
+        """Forget all rates and series, e.g. to pick up newly published rates"""
+        self.rates.clear()
+        self.series.clear()
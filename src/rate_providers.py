@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Protocol, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .fred_client import FRED_API_URL, AsyncFredClient
+
+
+class RateProvider(Protocol):
+    """
+    Source of exchange-rate series used by DataProcessor.
+
+    Implementations return the observations of a series between two dates
+    (inclusive) as a pandas Series of floats indexed by date. Days without
+    an observation may be missing or NaN.
+
+    Providers may also offer get_many(requests), fetching a list of
+    (series_id, start, end) windows at once; DataProcessor uses it to fetch
+    every currency of a merge in one batch.
+    """
+
+    def get_series(self, series_id: str, start: str, end: str) -> pd.Series:
+        ...
+
+    def identity(self) -> str:
+        """
+        Name of the rate source that changes whenever its rates can, so
+        stored conversions are not reused with other rates
+        """
+        ...
+
+
+def provider_identity(provider) -> str:
+    """Identity of a rate provider, its class name if it does not define identity()"""
+    if hasattr(provider, 'identity'):
+        return provider.identity()
+    return f"{type(provider).__module__}.{type(provider).__qualname__}"
+
+
+def _window(series: pd.Series, start: str, end: str) -> pd.Series:
+    """Slice a date-indexed series to start..end (inclusive)"""
+    return series.sort_index().loc[start:end]
+
+
+class FredRateProvider:
+    """Fetches rate series from the FRED API"""
+
+    def __init__(self, api_key: str):
+        """
+        Args:
+            api_key: FRED API key
+        """
+        # Imported on first use, so offline runs never load fredapi
+        from fredapi import Fred
+
+        self.fred = Fred(api_key=api_key)
+
+    def get_series(self, series_id: str, start: str, end: str) -> pd.Series:
+        return self.fred.get_series(series_id, observation_start=start, observation_end=end)
+
+    def identity(self) -> str:
+        return 'fred'
+
+
+class AsyncFredRateProvider:
+    """
+    Fetches rate series from the FRED API with AsyncFredClient: batches of
+    windows are requested concurrently over keep-alive connections
+    """
+
+    def __init__(self, api_key: str, base_url: str = FRED_API_URL, max_concurrency: int = 4,
+                 max_retries: int = 3):
+        """
+        Args:
+            api_key: FRED API key
+            base_url: API root (a local stub server in tests)
+            max_concurrency: Most requests in flight at once
+            max_retries: Retries after rate limiting or server errors
+        """
+        self.client = AsyncFredClient(api_key, base_url=base_url, max_concurrency=max_concurrency,
+                                      max_retries=max_retries)
+
+    def get_series(self, series_id: str, start: str, end: str) -> pd.Series:
+        return self.get_many([(series_id, start, end)])[0]
+
+    def get_many(self, requests: Sequence[Tuple[str, str, str]]) -> List[pd.Series]:
+        """Fetch several (series_id, start, end) windows concurrently, in request order"""
+        fetch = self.client.fetch_many(requests)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            # Called from code already running an event loop: use a loop of our own
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(asyncio.run, fetch).result()
+
+        return asyncio.run(fetch)
+
+    def close(self) -> None:
+        self.client.close()
+
+    def identity(self) -> str:
+        return 'fred'
+
+
+class InMemoryRateProvider:
+    """Serves rate series held in memory, e.g. for tests and benchmarks"""
+
+    def __init__(self, rates: Dict[str, pd.Series]):
+        """
+        Args:
+            rates: Mapping of series ID to rates indexed by date
+        """
+        self.rates = {}
+        for series_id, series in rates.items():
+            series = pd.Series(series, dtype='float64')
+            series.index = pd.DatetimeIndex(series.index)
+            self.rates[series_id] = series
+
+    def get_series(self, series_id: str, start: str, end: str) -> pd.Series:
+        if series_id not in self.rates:
+            raise ValueError(f"No rates for series {series_id}")
+        return _window(self.rates[series_id], start, end)
+
+    def identity(self) -> str:
+        """Hash of all the rates held"""
+        digest = hashlib.sha256()
+        for series_id in sorted(self.rates):
+            digest.update(series_id.encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(self.rates[series_id]).to_numpy().tobytes())
+        return f"rates:{digest.hexdigest()}"
+
+
+class FileRateProvider(InMemoryRateProvider):
+    """
+    Serves rate series from a local CSV or Parquet rate table.
+
+    Two layouts are accepted:
+    - wide: a 'date' column plus one column per series ID (like a FRED download)
+    - long: 'series_id', 'date' and 'rate' columns
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Rate table file (.csv or .parquet)
+        """
+        self.path = Path(path)
+
+        if self.path.suffix.lower() == '.parquet':
+            table = pd.read_parquet(self.path)
+        elif self.path.suffix.lower() == '.csv':
+            table = pd.read_csv(self.path)
+        else:
+            raise ValueError(f"Unsupported rate table format: {self.path.suffix}. Use .csv or .parquet")
+
+        table.columns = [str(column).strip() for column in table.columns]
+        if 'date' not in table.columns:
+            raise ValueError(f"Rate table {self.path} has no 'date' column")
+
+        if {'series_id', 'rate'} <= set(table.columns):
+            table = table.pivot(index='date', columns='series_id', values='rate').reset_index()
+
+        table['date'] = pd.to_datetime(table['date'])
+        table = table.set_index('date')
+
+        super().__init__({
+            column: pd.to_numeric(table[column], errors='coerce')
+            for column in table.columns
+        })
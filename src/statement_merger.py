@@ -1,9 +1,71 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Union, List
+from typing import Callable, Dict, Union, List, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
 
-from .csv_processor import CSVProcessor
-from .data_processor import DataProcessor
+from .csv_processor import CSVProcessor, statement_dtypes
+from .data_processor import TIMESTAMP_COLUMN, US_DATE_FORMAT, DataProcessor
+from .exporters import open_writer, write_statement
+from .instrumentation import NULL_PROFILE, PipelineProfile
+from .market_config import MARKETPLACE_CONFIG
+from .money import reconcile
+from .rate_cache import DEFAULT_SETTLE_DAYS
+from .rate_memo import RateMemo
+from .rate_providers import RateProvider, provider_identity
+from .statement_store import StatementStore
+from .summary import combine_aggregates, partial_aggregate, summarize
+
+
+# Callback receiving (file_path, stage) when a stage finishes for a file;
+# file_path is None for the final 'merge' stage
+ProgressCallback = Callable[[Optional[Path], str], None]
+
+
+class MergeCancelled(Exception):
+    """Raised when a merge is cancelled through its is_cancelled callback"""
+
+
+def _read_statement(file_path: Path, csv_processor: CSVProcessor, data_processor: DataProcessor,
+                    date_format: Optional[str] = None) -> Tuple[pd.DataFrame, str, str]:
+    """
+    Read and validate one statement, transform its dates if needed and
+    normalize its timestamps to US time. Module-level so it can run in a
+    worker process.
+
+    Args:
+        date_format: Date format already detected for this file, if any
+
+    Returns:
+        Tuple of the statement DataFrame, its currency and the file's original date format
+    """
+    try:
+        # Read and validate CSV
+        statement_data = csv_processor.read_file(file_path)
+        currency = csv_processor.detect_marketplace_currency(statement_data)
+
+        # Transform dates if needed
+        if date_format is None:
+            date_format = data_processor.detect_date_format(statement_data['Date'], currency)
+        if date_format != US_DATE_FORMAT:
+            statement_data = data_processor.transform_to_us_date_format(statement_data, date_format)
+
+        # Local marketplace timestamps to US Pacific time (moves 'Date' across midnight)
+        statement_data = data_processor.normalize_timezone(statement_data, currency, date_format)
+
+        return statement_data, currency, date_format
+
+    except Exception as e:
+        raise Exception(f"Error processing {file_path}: {str(e)}")
+
+
+def _convert_statement(file_path: Path, statement_data: pd.DataFrame,
+                       data_processor: DataProcessor) -> pd.DataFrame:
+    """Convert one statement's currency with already prefetched rates"""
+    try:
+        return data_processor.transform_currency(statement_data)
+    except Exception as e:
+        raise Exception(f"Error processing {file_path}: {str(e)}")
 
 
 class StatementMerger:
@@ -11,34 +73,83 @@ class StatementMerger:
     Handles merging of multiple Amazon marketplace statements into a single DataFrame
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[Union[str, Path]] = None,
+                 fill_policy: Optional[str] = 'ffill', rate_provider: Optional[RateProvider] = None,
+                 max_workers: int = 1, use_processes: bool = False,
+                 store_dir: Optional[Union[str, Path]] = None, profile: Optional[PipelineProfile] = None,
+                 rate_memo: Optional[RateMemo] = None, money_mode: Optional[str] = None):
         """
         Initialize merger with required processors
 
         Args:
-            api_key: FRED API key for currency conversion
+            api_key: FRED API key, used when no rate_provider is given
+            cache_path: Optional SQLite file for a persistent exchange-rate cache
+            fill_policy: Rate fill policy for weekends and US holidays
+                ('ffill', 'bfill', 'nearest', or None to raise)
+            rate_provider: Source of exchange-rate series (FRED, local file, in-memory)
+            max_workers: Number of statements processed in parallel (1 = sequential)
+            use_processes: Use a process pool instead of a thread pool for max_workers > 1
+            store_dir: Optional folder for incremental merges; converted statements
+                are kept there and unchanged files are not processed again
+            profile: Optional PipelineProfile recording per-stage timings, rows,
+                memory and rate lookup counters of every run
+            rate_memo: Optional RateMemo shared with other mergers, so rates fetched
+                for one merge are reused by the next
+            money_mode: Convert amounts in exact cents with 'half_even' or
+                'half_up' rounding (see src.money); None rounds floats
         """
-        self.csv_processor = CSVProcessor()
-        self.data_processor = DataProcessor(api_key)
+        self.profile = profile or NULL_PROFILE
+        self.csv_processor = CSVProcessor(profile=profile)
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.data_processor = DataProcessor(
+            api_key,
+            cache_path=cache_path,
+            fill_policy=fill_policy,
+            rate_provider=rate_provider,
+            profile=profile,
+            rate_memo=rate_memo,
+            money_mode=money_mode
+        )
         self.merged_data = None
+        # Marketplace code of every merged row, and the files and row counts of the last merge
+        self.marketplaces = None
+        self.merged_files = []
+        # file path -> detected date format, so each file is only inspected once
+        self.date_formats = {}
+        # file path -> detected currency
+        self.currencies = {}
 
+        # Results depend on the fill policy, money mode and rate source, so they
+        # are part of every fingerprint
+        self.statement_store = None
+        if store_dir is not None:
+            settings = f"fill_policy={fill_policy}"
+            if money_mode:
+                settings += f",money_mode={money_mode}"
+            settings += f",rates={provider_identity(self.data_processor.rate_provider)}"
+            self.statement_store = StatementStore(store_dir, settings=settings)
 
-    def _needs_currency_conversion(self, df: pd.DataFrame) -> bool:
-        """Check if currency needs conversion"""
-        total_col = next(col for col in df.columns if col.startswith('Total ('))
-        return 'USD' not in total_col
-
-    def merge_statements(self, file_paths: Union[str, Path, List[Union[str, Path]]]) -> pd.DataFrame:
+    def merge_statements(self, file_paths: Union[str, Path, List[Union[str, Path]]],
+                         progress_callback: Optional[ProgressCallback] = None,
+                         is_cancelled: Optional[Callable[[], bool]] = None) -> pd.DataFrame:
         """
         Process and merge one or multiple Amazon statement files
 
         Args:
             file_paths: Single file path or list of file paths to process
+            progress_callback: Called with (file_path, stage) after each finished
+                stage: 'read', 'dates', 'fx' per file ('cached' instead when an
+                unchanged file is loaded from the store) and 'merge' at the end.
+                Always called from the calling thread
+            is_cancelled: Polled between files and stages; returning True stops
+                the merge with MergeCancelled
 
         Returns:
             pandas DataFrame containing merged and processed data
 
         Raises:
+            MergeCancelled: If is_cancelled returned True
             Exception: If file processing fails
         """
         # Convert single path to list for uniform processing
@@ -48,37 +159,321 @@ class StatementMerger:
         # Convert all paths to Path objects
         file_paths = [Path(f) for f in file_paths]
 
-        merged_df = None
+        if not file_paths:
+            raise ValueError("No statement files to merge")
+
+        report_progress = progress_callback or (lambda file_path, stage: None)
 
-        for file_path in file_paths:
+        def check_cancelled():
+            if is_cancelled is not None and is_cancelled():
+                raise MergeCancelled("Merge cancelled")
+
+        statement_frames = [None] * len(file_paths)
+        fingerprints = []
+        if self.statement_store is not None:
+            fingerprints = [self.statement_store.fingerprint(file_path) for file_path in file_paths]
+            for i, fingerprint in enumerate(fingerprints):
+                with self.profile.stage('store_load') as stage:
+                    statement_frames[i] = self.statement_store.load(fingerprint)
+                    stage.rows = 0 if statement_frames[i] is None else len(statement_frames[i])
+                if statement_frames[i] is not None:
+                    self.currencies[file_paths[i]] = self.statement_store.currency(fingerprint)
+                    self.profile.count('store_hits')
+                    report_progress(file_paths[i], 'cached')
+
+        # Only new or changed files are read and converted
+        pending = [i for i, statement_data in enumerate(statement_frames) if statement_data is None]
+        if pending:
+            executor = self._create_executor(len(pending))
             try:
-                # Read and validate CSV
-                statement_data = self.csv_processor.read_file(file_path)
+                processed = self._process_statements(
+                    [file_paths[i] for i in pending], executor, report_progress, check_cancelled
+                )
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
 
-                # Transform dates if needed
-                if self._needs_date_conversion(statement_data):
-                    statement_data = self.data_processor.transform_to_us_date_format(statement_data)
-                    statement_data = self.data_processor.transform_currency(statement_data)
+            for i, statement_data in zip(pending, processed):
+                statement_frames[i] = statement_data
+                # Rates of recent dates may still be revised, so those statements are converted again next time
+                if self.statement_store is not None and self._is_settled(statement_data):
+                    self.statement_store.save(fingerprints[i], file_paths[i], statement_data,
+                                              currency=self.currencies[file_paths[i]])
 
-                # Merge with existing data or create new DataFrame
-                if merged_df is None:
-                    merged_df = statement_data
-                else:
-                    merged_df = pd.concat([merged_df, statement_data], ignore_index=True)
+            if self.statement_store is not None:
+                self.statement_store.write_manifest()
 
-            except Exception as e:
-                raise Exception(f"Error processing {file_path}: {str(e)}")
+        with self.profile.stage('concat') as stage:
+            # Concatenate once at the end, so merging n files copies every row
+            # once instead of n times. Output keeps the input file order.
+            merged_data = pd.concat(statement_frames, ignore_index=True)
 
+            # Categories differ between files, which makes concat fall back to plain strings
+            self.merged_data = merged_data.astype(statement_dtypes(merged_data.columns))
+            stage.rows = len(self.merged_data)
 
-        self.merged_data = merged_df.copy()
+            # Statements stored before currencies were recorded have no marketplace
+            self.merged_files = [(file_path, len(statement_data))
+                                 for file_path, statement_data in zip(file_paths, statement_frames)]
+            markets = [MARKETPLACE_CONFIG[self.currencies[file_path]]['market'] if self.currencies.get(file_path)
+                       else None for file_path in file_paths]
+            self.marketplaces = pd.Series(
+                pd.Categorical(np.repeat(np.array(markets, dtype=object), [rows for _, rows in self.merged_files])),
+                index=self.merged_data.index, name='marketplace'
+            )
+        report_progress(None, 'merge')
 
         return self.merged_data
 
-    def _needs_date_conversion(self, df: pd.DataFrame) -> bool:
-        """Check if date format needs conversion"""
+    def stream_statements(self, file_paths: Union[str, Path, List[Union[str, Path]]],
+                          output_path: Union[str, Path], chunksize: int = 100_000,
+                          output_format: Optional[str] = None) -> int:
+        """
+        Process statements chunk by chunk and append each chunk straight to the
+        output file. Only one chunk is held in memory at a time, so memory
+        stays bounded no matter how big the inputs are.
+
+        Args:
+            file_paths: Single file path or list of file paths to process
+            output_path: File to write the merged result to
+            chunksize: Number of rows read, converted and written at a time
+            output_format: 'csv', 'xlsx', 'parquet' or 'feather'
+                (default: from the output file extension)
+
+        Returns:
+            int: Number of rows written
+
+        Raises:
+            Exception: If file processing fails
+        """
+        if isinstance(file_paths, (str, Path)):
+            file_paths = [file_paths]
+
+        file_paths = [Path(f) for f in file_paths]
+
+        if not file_paths:
+            raise ValueError("No statement files to merge")
+
+        with open_writer(output_path, output_format) as writer:
+            for file_path in file_paths:
+                try:
+                    currency = None
+
+                    for chunk in self.csv_processor.iter_file(file_path, chunksize=chunksize):
+                        # One pass over the file's dates before its first chunk: they decide
+                        # the date format, as in merge_statements (the first chunk alone can
+                        # hold only ambiguous dates), and the file's rates are fetched in one
+                        # request instead of one per chunk
+                        if currency is None:
+                            currency = self.csv_processor.detect_marketplace_currency(chunk)
+                            dates = self.csv_processor.read_columns(file_path, ['Date', TIMESTAMP_COLUMN])
+                            if file_path not in self.date_formats:
+                                self.date_formats[file_path] = self.data_processor.detect_date_format(
+                                    dates['Date'], currency
+                                )
+                            date_format = self.date_formats[file_path]
+
+                            if MARKETPLACE_CONFIG[currency]['quote']:
+                                if date_format != US_DATE_FORMAT:
+                                    dates = self.data_processor.transform_to_us_date_format(dates, date_format)
+                                dates = self.data_processor.normalize_timezone(dates, currency, date_format)
+                                self.data_processor.prefetch_exchange_rates(currency, dates['Date'])
+
+                        if date_format != US_DATE_FORMAT:
+                            chunk = self.data_processor.transform_to_us_date_format(chunk, date_format)
+                        chunk = self.data_processor.normalize_timezone(chunk, currency, date_format)
+                        chunk = self.data_processor.transform_currency(chunk)
+
+                        with self.profile.stage('write') as stage:
+                            writer.write(chunk)
+                            stage.rows = len(chunk)
+
+                except Exception as e:
+                    raise Exception(f"Error processing {file_path}: {str(e)}")
+
+        return writer.rows_written
+
+    def export(self, output_path: Union[str, Path], output_format: Optional[str] = None,
+               chunksize: int = 100_000) -> int:
+        """
+        Write the result of the last merge_statements call, chunk by chunk
+
+        Args:
+            output_path: File to write
+            output_format: 'csv', 'xlsx', 'parquet' or 'feather'
+                (default: from the output file extension)
+            chunksize: Number of rows written at a time
+
+        Returns:
+            int: Number of rows written
+
+        Raises:
+            ValueError: If nothing has been merged yet
+        """
+        if self.merged_data is None:
+            raise ValueError("No merged data to export. Run merge_statements first")
+
+        with self.profile.stage('write') as stage:
+            stage.rows = write_statement(self.merged_data, output_path, output_format, chunksize=chunksize)
+        return stage.rows
+
+    def reconcile(self) -> pd.DataFrame:
+        """
+        Rows of the last merge whose Total (USD) is not the sum of its
+        components, in exact cents (see src.money.reconcile)
+
+        Returns:
+            The mismatched rows with a 'Difference (cents)' column; empty if all reconcile
+
+        Raises:
+            ValueError: If nothing has been merged yet
+        """
+        if self.merged_data is None:
+            raise ValueError("No merged data to reconcile. Run merge_statements first")
+
+        return reconcile(self.merged_data)
+
+    def aggregate(self, per_file: bool = False) -> Union[pd.DataFrame, Dict[Path, pd.DataFrame]]:
+        """
+        Partial aggregate of the last merge: amount sums and row counts per
+        month, Transaction type and marketplace (see src.summary). Keep these
+        to build later reports with summarize(partials=...) without rescanning rows.
+
+        Args:
+            per_file: Return one partial aggregate per merged file instead
+
+        Returns:
+            DataFrame indexed by month, Transaction type and marketplace, or
+            dict of file path -> such a DataFrame
+
+        Raises:
+            ValueError: If nothing has been merged yet
+        """
+        if self.merged_data is None:
+            raise ValueError("No merged data to aggregate. Run merge_statements first")
+
+        if not per_file:
+            return partial_aggregate(self.merged_data, self.marketplaces)
+
+        partials = {}
+        start = 0
+        for file_path, rows in self.merged_files:
+            rows_slice = slice(start, start + rows)
+            partials[file_path] = partial_aggregate(self.merged_data.iloc[rows_slice],
+                                                    self.marketplaces.iloc[rows_slice])
+            start += rows
+        return partials
+
+    def summarize(self, by: Sequence[str] = ('month',),
+                  partials: Optional[Sequence[pd.DataFrame]] = None) -> pd.DataFrame:
+        """
+        Totals of the amount columns per month, Transaction type and/or
+        marketplace, with Amazon fees as a percentage of product charges
+
+        Args:
+            by: Keys to group by, any of 'month', 'Transaction type', 'marketplace'
+            partials: Precomputed partial aggregates (from aggregate(), e.g. of
+                monthly merges) to combine instead of scanning the merged rows
+
+        Returns:
+            DataFrame with one row per key combination
+
+        Raises:
+            ValueError: If there are no partials and nothing has been merged yet
+        """
+        aggregate = combine_aggregates(partials) if partials is not None else self.aggregate()
+        return summarize(aggregate, by)
+
+    def _is_settled(self, statement_data: pd.DataFrame) -> bool:
+        """
+        Whether every date of a converted statement is older than the rate
+        settle window, so its rates are final and it can be stored
+        """
+        rate_cache = self.data_processor.rate_cache
+        settle_days = rate_cache.settle_days if rate_cache is not None else DEFAULT_SETTLE_DAYS
+
+        dates = pd.to_datetime(pd.Series(statement_data['Date'].dropna().unique()), format='%m/%d/%Y')
+        if dates.empty:
+            return True
+        return dates.max() <= pd.Timestamp.today().normalize() - pd.Timedelta(days=settle_days)
+
+    def _create_executor(self, file_count: int) -> Optional[Executor]:
+        """Worker pool for the run, or None to process statements inline"""
+        workers = min(self.max_workers, file_count)
+        if workers <= 1:
+            return None
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _process_statements(self, file_paths: List[Path], executor: Optional[Executor],
+                            report_progress: ProgressCallback,
+                            check_cancelled: Callable[[], None]) -> List[pd.DataFrame]:
+        """
+        Read, transform and convert statements in two passes:
+        1. read, validate and transform dates of every file
+        2. prefetch the rates of all currencies in one batch, each for the
+           dates of all its files, then convert currencies with the shared
+           rate calendars
+        Workers never fetch rates themselves, and results keep input order.
+        Progress is reported and cancellation checked as each result arrives.
+        """
+        map_function = map if executor is None else executor.map
+
+        if executor is None:
+            csv_processors = [self.csv_processor] * len(file_paths)
+        else:
+            # Worker processes would only record into their own copy of the profile
+            profile = None if self.use_processes else self.profile
+            csv_processors = [CSVProcessor(profile=profile) for _ in file_paths]
+
+        statement_frames = []
+        currencies = []
+        check_cancelled()
+        for file_path, (statement_data, currency, date_format) in zip(file_paths, map_function(
+            _read_statement,
+            file_paths,
+            csv_processors,
+            [self.data_processor] * len(file_paths),
+            [self.date_formats.get(file_path) for file_path in file_paths]
+        )):
+            statement_frames.append(statement_data)
+            currencies.append(currency)
+            self.currencies[file_path] = currency
+            self.date_formats[file_path] = date_format
+            report_progress(file_path, 'read')
+            if date_format != US_DATE_FORMAT:
+                report_progress(file_path, 'dates')
+            check_cancelled()
+
+        # Currency conversion does not depend on the date format: every
+        # non-USD statement is converted
+        to_convert = [i for i, currency in enumerate(currencies) if MARKETPLACE_CONFIG[currency]['quote']]
+        if not to_convert:
+            return statement_frames
+
+        # One bulk rate fetch per currency covering all of its statements
+        dates_by_currency = {}
+        for i in to_convert:
+            dates_by_currency.setdefault(currencies[i], []).append(statement_frames[i]['Date'])
+
+        check_cancelled()
         try:
-            # Try parsing first date as DD/MM/YYYY
-            sample_date = pd.to_datetime(df['Date'].iloc[0], format='%d/%m/%Y')
-            return True  # If successful, needs conversion
-        except ValueError:
-            return False  # Already in US format
+            self.data_processor.prefetch_many({
+                currency: pd.concat(dates, ignore_index=True) for currency, dates in dates_by_currency.items()
+            })
+        except Exception as e:
+            raise Exception(f"Error processing {', '.join(dates_by_currency)} statements: {str(e)}")
+
+        converted = map_function(
+            _convert_statement,
+            [file_paths[i] for i in to_convert],
+            [statement_frames[i] for i in to_convert],
+            [self.data_processor] * len(to_convert)
+        )
+        for i, statement_data in zip(to_convert, converted):
+            statement_frames[i] = statement_data
+            report_progress(file_paths[i], 'fx')
+            check_cancelled()
+
+        return statement_frames
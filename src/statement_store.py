@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class StatementStore:
+    """
+    Cache of processed statements for incremental merges.
+
+    Each input file is fingerprinted by a SHA-256 hash of its content (plus
+    the conversion settings), and its converted DataFrame is kept as a
+    Parquet file named after the fingerprint. manifest.json maps every
+    fingerprint to its Parquet file, row count, source currency and the
+    source paths it was seen at. Unchanged files are loaded from the store instead of being
+    parsed and converted again; new or edited files get a new fingerprint.
+    """
+
+    def __init__(self, directory: Union[str, Path], settings: str = ''):
+        """
+        Open (and create if needed) the store
+
+        Args:
+            directory: Folder holding manifest.json and the Parquet files
+            settings: Conversion settings mixed into every fingerprint, so
+                results produced with other settings are not reused
+
+        Raises:
+            ImportError: If pyarrow (needed for Parquet) is not installed
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Incremental merges store results as Parquet and need pyarrow: pip install pyarrow")
+
+        self.directory = Path(directory)
+        self.settings = settings
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        manifest_path = self.directory / MANIFEST_NAME
+        self.manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    def fingerprint(self, file_path: Union[str, Path]) -> str:
+        """
+        Hash a statement file's content together with the store settings
+
+        Args:
+            file_path: Statement file
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = hashlib.sha256(self.settings.encode('utf-8'))
+        with open(file_path, 'rb') as statement_file:
+            for block in iter(lambda: statement_file.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def load(self, fingerprint: str) -> Optional[pd.DataFrame]:
+        """
+        Load the converted statement stored for a fingerprint
+
+        Returns:
+            pandas DataFrame, or None if the fingerprint is not in the store
+        """
+        entry = self.manifest.get(fingerprint)
+        if entry is None:
+            return None
+
+        output_path = self.directory / entry['output']
+        if not output_path.exists():
+            return None
+
+        return pd.read_parquet(output_path)
+
+    def currency(self, fingerprint: str) -> Optional[str]:
+        """Currency of the source statement stored for a fingerprint, if recorded"""
+        return self.manifest.get(fingerprint, {}).get('currency')
+
+    def save(self, fingerprint: str, file_path: Union[str, Path], statement_data: pd.DataFrame,
+             currency: Optional[str] = None) -> None:
+        """
+        Store a converted statement and record it in the manifest
+
+        Args:
+            fingerprint: Fingerprint of the source file
+            file_path: Source statement file
+            statement_data: Converted statement
+            currency: Currency of the source statement
+        """
+        output_name = f"{fingerprint}.parquet"
+        statement_data.to_parquet(self.directory / output_name, index=False)
+
+        entry = self.manifest.setdefault(fingerprint, {'output': output_name, 'sources': []})
+        entry['rows'] = len(statement_data)
+        if currency is not None:
+            entry['currency'] = currency
+        if str(file_path) not in entry['sources']:
+            entry['sources'].append(str(file_path))
+
+    def write_manifest(self) -> None:
+        """Persist the manifest atomically, so an interrupted run never corrupts it"""
+        manifest_path = self.directory / MANIFEST_NAME
+        temp_path = manifest_path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(temp_path, manifest_path)
@@ -0,0 +1,104 @@
+"""
+Summaries of merged statements: totals per month, transaction type and
+marketplace, and Amazon fees as a percentage of product charges.
+
+Rows are scanned once into a partial aggregate: sums of the amount columns
+and row counts per (month, Transaction type, marketplace), grouped over
+categorical keys. Partial aggregates of separate files or months combine by
+adding them up, so a year-level report can be built from monthly partials
+without reading any rows again:
+
+    partials = [partial_aggregate(monthly_merge, marketplaces) for ...]
+    yearly = summarize(combine_aggregates(partials), by=['marketplace'])
+"""
+from typing import Iterable, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .money import COMPONENT_COLUMNS
+
+SUMMARY_KEYS = ['month', 'Transaction type', 'marketplace']
+AMOUNT_COLUMNS = COMPONENT_COLUMNS + ['Total (USD)']
+ROWS_COLUMN = 'Rows'
+FEES_PERCENT_COLUMN = 'Fees % of product charges'
+
+
+def statement_months(dates: pd.Series) -> pd.Categorical:
+    """
+    Month ('YYYY-MM') of every US-format date (MM/DD/YYYY), as a categorical.
+    Each distinct date is parsed once; missing dates have no month.
+    """
+    codes, unique_dates = pd.factorize(dates)
+    months = pd.to_datetime(pd.Series(unique_dates), format='%m/%d/%Y').dt.strftime('%Y-%m')
+
+    month_codes, categories = pd.factorize(months, sort=True)
+    # Rows with a missing date (code -1) keep code -1, i.e. no month
+    row_codes = np.where(codes >= 0, month_codes[codes], -1) if len(month_codes) else codes
+    return pd.Categorical.from_codes(row_codes, categories=categories)
+
+
+def partial_aggregate(statement_data: pd.DataFrame, marketplace: Union[str, pd.Series, pd.Categorical]) -> pd.DataFrame:
+    """
+    Sum the amount columns and count rows per (month, Transaction type,
+    marketplace) in one grouped pass
+
+    Args:
+        statement_data: Converted statement or merged statements (US dates, Total (USD))
+        marketplace: Marketplace code of every row, or one code for the whole statement
+
+    Returns:
+        DataFrame indexed by SUMMARY_KEYS with AMOUNT_COLUMNS and a 'Rows' count
+    """
+    if isinstance(marketplace, str):
+        marketplace = pd.Categorical([marketplace] * len(statement_data))
+
+    keys = pd.DataFrame({
+        'month': statement_months(statement_data['Date']),
+        'Transaction type': pd.Categorical(statement_data['Transaction type']),
+        'marketplace': pd.Categorical(marketplace)
+    }, index=statement_data.index)
+
+    amounts = statement_data[AMOUNT_COLUMNS].astype('float64').assign(**{ROWS_COLUMN: 1})
+    return amounts.groupby([keys[key] for key in SUMMARY_KEYS], observed=True, dropna=False, sort=True).sum()
+
+
+def combine_aggregates(partials: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Add up partial aggregates (e.g. per file or per month) into one, as if
+    their rows had been aggregated together
+
+    Returns:
+        DataFrame indexed by SUMMARY_KEYS, like partial_aggregate
+    """
+    combined = pd.concat(list(partials))
+    return combined.groupby(level=SUMMARY_KEYS, dropna=False, sort=True).sum()
+
+
+def summarize(aggregate: pd.DataFrame, by: Sequence[str] = ('month',)) -> pd.DataFrame:
+    """
+    Roll a partial (or combined) aggregate up to the given keys
+
+    Args:
+        aggregate: Result of partial_aggregate or combine_aggregates
+        by: Any of SUMMARY_KEYS ('month', 'Transaction type', 'marketplace');
+            empty for grand totals
+
+    Returns:
+        DataFrame of the amount totals and row counts per key, with the fees
+        as a percentage of product charges (NaN without product charges)
+    """
+    by = list(by)
+    unknown = [key for key in by if key not in SUMMARY_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown summary key(s): {unknown}. Supported keys: {SUMMARY_KEYS}")
+
+    if by:
+        totals = aggregate.groupby(level=by, dropna=False, sort=True).sum()
+    else:
+        totals = aggregate.sum().to_frame('Total').T
+
+    charges = totals['Total product charges'].where(totals['Total product charges'] != 0)
+    totals[FEES_PERCENT_COLUMN] = (-totals['Amazon fees'] / charges * 100).round(2)
+    totals[AMOUNT_COLUMNS] = totals[AMOUNT_COLUMNS].round(2)
+    return totals
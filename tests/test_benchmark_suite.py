@@ -0,0 +1,41 @@
+import json
+
+import pandas as pd
+
+from benchmarks.generator import generate_statement, offline_provider, write_statements
+from benchmarks.suite import BENCHMARKS, compare_reports, main
+from src.csv_processor import CSVProcessor
+from src.statement_merger import StatementMerger
+
+
+def test_generated_statements_pass_validation(tmp_path):
+    """Test synthetic statements are read, validated and merged like real ones"""
+    currencies = ['AUD', 'JPY', 'USD']
+    paths = write_statements(tmp_path, 3, 50, currencies)
+
+    for path, currency in zip(paths, currencies):
+        assert CSVProcessor().read_file(path).columns[-1] == f'Total ({currency})'
+
+    merged_data = StatementMerger(rate_provider=offline_provider(currencies)).merge_statements(paths)
+    assert len(merged_data) == 150
+    assert merged_data.columns[-1] == 'Total (USD)'
+
+
+def test_generated_totals_add_up():
+    statement_data = generate_statement(100, 'GBP')
+    components = statement_data[['Total product charges', 'Total promotional rebates', 'Amazon fees', 'Other']]
+
+    pd.testing.assert_series_equal(components.sum(axis=1).round(2), statement_data['Total (GBP)'],
+                                   check_names=False)
+
+
+def test_suite_report(tmp_path):
+    """Test a small run writes a comparable JSON report for every benchmark"""
+    report_path = tmp_path / 'report.json'
+
+    assert main(['--rows', '200', '--files', '2', '--repeat', '1', '--json', str(report_path)]) == 0
+
+    report = json.loads(report_path.read_text())
+    assert list(report['results']) == list(BENCHMARKS)
+    assert all(result['rows'] == 200 and result['median_s'] > 0 for result in report['results'].values())
+    assert compare_reports(report, report) == {name: 1.0 for name in BENCHMARKS}
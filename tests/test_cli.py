@@ -0,0 +1,146 @@
+import subprocess
+import sys
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+from src.cli import main, expand_inputs, EXIT_OK, EXIT_PROCESSING_ERROR, EXIT_USAGE_ERROR
+from src.csv_processor import statement_dtypes
+
+
+@pytest.fixture
+def test_data_path():
+    return Path(__file__).parent / 'test_files_statement_merger'
+
+
+@pytest.fixture
+def rates_file(tmp_path):
+    rates_path = tmp_path / 'rates.csv'
+    rates_path.write_text("date,DEXUSAL\n2024-08-30,0.6766\n")
+    return rates_path
+
+
+def test_expand_inputs(test_data_path):
+    """Test directories, globs and plain paths resolve to unique files in argument order"""
+    us_file = test_data_path / 'us_statements' / 'valid_statement.csv'
+
+    file_paths = expand_inputs([
+        str(us_file),
+        str(test_data_path / 'mixed_statements'),
+        str(test_data_path / 'us_stat*' / '*.csv'),
+    ])
+
+    assert file_paths == [
+        us_file,
+        test_data_path / 'mixed_statements' / 'test_AUD_statement.csv',
+        test_data_path / 'mixed_statements' / 'valid_statement.csv',
+    ]
+
+
+@pytest.mark.parametrize('extra_args', [[], ['--chunksize', '1'], ['--workers', '2']])
+def test_merge_to_csv(test_data_path, rates_file, tmp_path, extra_args):
+    """Test a headless merge with an offline rate table"""
+    output_path = tmp_path / 'merged.csv'
+
+    exit_code = main([str(test_data_path / 'mixed_statements'), '-o', str(output_path),
+                      '--rates-file', str(rates_file)] + extra_args)
+
+    expected_data = pd.read_csv(test_data_path / 'expected_merged_mixed.csv')
+    actual_data = pd.read_csv(output_path)
+
+    assert exit_code == EXIT_OK
+    pd.testing.assert_frame_equal(actual_data.astype(statement_dtypes(actual_data.columns)),
+                                  expected_data.astype(statement_dtypes(expected_data.columns)))
+
+
+@pytest.mark.parametrize('extra_args', [[], ['--chunksize', '1']])
+def test_merge_to_parquet(test_data_path, rates_file, tmp_path, extra_args):
+    """Test the output format follows the output file extension"""
+    pytest.importorskip('pyarrow')
+    output_path = tmp_path / 'merged.parquet'
+
+    exit_code = main([str(test_data_path / 'mixed_statements'), '-o', str(output_path),
+                      '--rates-file', str(rates_file)] + extra_args)
+
+    expected_data = pd.read_csv(test_data_path / 'expected_merged_mixed.csv')
+    actual_data = pd.read_parquet(output_path)
+
+    assert exit_code == EXIT_OK
+    pd.testing.assert_frame_equal(actual_data.astype(statement_dtypes(actual_data.columns)),
+                                  expected_data.astype(statement_dtypes(expected_data.columns)))
+
+
+def test_profile_output(test_data_path, rates_file, tmp_path, capsys):
+    exit_code = main([str(test_data_path / 'mixed_statements'), '-o', str(tmp_path / 'merged.csv'),
+                      '--rates-file', str(rates_file), '--profile'])
+
+    stderr = capsys.readouterr().err
+    assert exit_code == EXIT_OK
+    assert stderr.startswith('stage')
+    assert 'fx' in stderr and 'rate_lookups: 1' in stderr
+
+
+def test_no_matching_inputs(tmp_path):
+    assert main([str(tmp_path / '*.csv'), '-o', str(tmp_path / 'merged.csv')]) == EXIT_USAGE_ERROR
+
+
+def test_unknown_output_format(test_data_path, rates_file, tmp_path):
+    exit_code = main([str(test_data_path / 'us_statements'), '-o', str(tmp_path / 'merged.txt'),
+                      '--rates-file', str(rates_file)])
+
+    assert exit_code == EXIT_USAGE_ERROR
+
+
+def test_processing_error(test_data_path, rates_file, tmp_path):
+    exit_code = main([str(test_data_path / 'invalid_statements'), '-o', str(tmp_path / 'merged.csv'),
+                      '--rates-file', str(rates_file)])
+
+    assert exit_code == EXIT_PROCESSING_ERROR
+
+
+@pytest.mark.parametrize('module', ['PyQt6', 'pandas', 'fredapi'])
+def test_cli_import_is_light(module):
+    """Test importing the headless entry point loads neither PyQt6 nor the processing dependencies"""
+    result = subprocess.run(
+        [sys.executable, '-c', f"import sys, src.cli; assert not any(m.split('.')[0] == '{module}' for m in sys.modules)"],
+        cwd=Path(__file__).parent.parent
+    )
+
+    assert result.returncode == 0
+
+
+def test_fill_policy_choices_match_calendar():
+    from src.cli import FILL_POLICY_CHOICES
+    from src.rate_calendar import FILL_POLICIES
+
+    assert FILL_POLICY_CHOICES == FILL_POLICIES + ('none',)
+
+
+def test_money_mode_choices_match_money():
+    from src.cli import MONEY_MODE_CHOICES
+    from src.money import ROUNDING_MODES
+
+    assert MONEY_MODE_CHOICES == ROUNDING_MODES
+
+
+def test_money_mode_reconciles(test_data_path, rates_file, tmp_path):
+    exit_code = main([str(test_data_path / 'mixed_statements'), '-o', str(tmp_path / 'merged.csv'),
+                      '--rates-file', str(rates_file), '--money-mode', 'half_up', '--reconcile'])
+
+    assert exit_code == EXIT_OK
+
+
+def test_reconcile_needs_whole_merge(test_data_path, rates_file, tmp_path):
+    exit_code = main([str(test_data_path / 'mixed_statements'), '-o', str(tmp_path / 'merged.csv'),
+                      '--rates-file', str(rates_file), '--reconcile', '--chunksize', '10'])
+
+    assert exit_code == EXIT_USAGE_ERROR
+
+
+def test_missing_rates_file(test_data_path, tmp_path, capsys):
+    exit_code = main([str(test_data_path / 'mixed_statements'), '-o', str(tmp_path / 'merged.csv'),
+                      '--rates-file', str(tmp_path / 'missing.csv')])
+
+    assert exit_code == EXIT_USAGE_ERROR
+    assert capsys.readouterr().err.startswith("error: ")
@@ -1,8 +1,9 @@
+import datetime
 from pathlib import Path
 
 import pytest
 import pandas as pd
-from src.csv_processor import CSVProcessor
+from src.csv_processor import CSVProcessor, statement_dtypes
 from src.market_config import MARKETPLACE_CONFIG
 
 
@@ -29,10 +30,10 @@ def test_validate_marketplace_invalid(csv_processor):
 def test_detect_marketplace_currency_unsupported(csv_processor):
     """Test detection of unsupported currency fails appropriately"""
     df = pd.DataFrame(columns=[
-        'Date', 'Transaction type', 'Order ID', 'Total (EUR)'
+        'Date', 'Transaction type', 'Order ID', 'Total (XYZ)'
     ])
 
-    with pytest.raises(ValueError, match="Unsupported currency: EUR"):
+    with pytest.raises(ValueError, match="Unsupported currency: XYZ"):
         csv_processor.detect_marketplace_currency(df)
 
 
@@ -87,6 +88,7 @@ def test_read_valid_statement(csv_processor, test_data_path):
         'Other': [6.99],
         'Total (USD)': [37.97]
     })
+    expected_statement_data = expected_statement_data.astype(statement_dtypes(expected_statement_data.columns))
 
     pd.testing.assert_frame_equal(actual_statement_data, expected_statement_data)
 
@@ -94,4 +96,108 @@ def test_read_invalid_statement(csv_processor, test_data_path):
     """Test reading invalid Amazon statement CSV (missing required columns)"""
     with pytest.raises(Exception,
                       match="Error reading file: Missing required columns: \\['Transaction type', 'Amazon fees'\\]"):
-        csv_processor.read_file(test_data_path / 'invalid_statement_missing columns.csv')
\ No newline at end of file
+        csv_processor.read_file(test_data_path / 'invalid_statement_missing columns.csv')
+
+def test_iter_file_chunks(csv_processor, test_data_path):
+    """Test chunked reading yields the same data as a full read"""
+    chunks = list(csv_processor.iter_file(test_data_path / 'valid_statement.csv', chunksize=1))
+
+    assert len(chunks) == 1
+    pd.testing.assert_frame_equal(chunks[0], CSVProcessor().read_file(test_data_path / 'valid_statement.csv'))
+    assert csv_processor.current_market == MARKETPLACE_CONFIG['USD']
+
+
+def test_iter_file_invalid_statement(csv_processor, test_data_path):
+    """Test chunked reading validates the header before yielding anything"""
+    with pytest.raises(Exception, match="Error reading file: Missing required columns"):
+        next(csv_processor.iter_file(test_data_path / 'invalid_statement_missing columns.csv'))
+
+
+def test_read_statement_schema(csv_processor, test_data_path):
+    """Test statements are read with explicit column types instead of inference"""
+    statement_data = csv_processor.read_file(test_data_path / 'valid_statement.csv')
+
+    assert isinstance(statement_data['Transaction type'].dtype, pd.CategoricalDtype)
+    assert statement_data['Total product charges'].dtype == 'float64'
+    assert statement_data['Total (USD)'].dtype == 'float64'
+    assert pd.api.types.is_string_dtype(statement_data['Order ID'])
+
+
+def test_read_with_pyarrow_engine(test_data_path):
+    """Test the pyarrow engine reads the same data as the C parser"""
+    pytest.importorskip('pyarrow')
+
+    pyarrow_data = CSVProcessor(engine='pyarrow').read_file(test_data_path / 'valid_statement.csv')
+    c_data = CSVProcessor().read_file(test_data_path / 'valid_statement.csv')
+
+    pd.testing.assert_frame_equal(pyarrow_data, c_data)
+
+
+def test_pyarrow_engine_falls_back(test_data_path, monkeypatch):
+    """Test reading falls back to the C parser when pyarrow cannot be used"""
+    read_csv = pd.read_csv
+
+    def read_csv_without_pyarrow(*args, **kwargs):
+        if kwargs.get('engine') == 'pyarrow':
+            raise ImportError("pyarrow is not installed")
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_csv', read_csv_without_pyarrow)
+
+    statement_data = CSVProcessor(engine='pyarrow').read_file(test_data_path / 'valid_statement.csv')
+
+    assert statement_data['Total (USD)'].tolist() == [37.97]
+
+
+def write_workbook(path, rows):
+    """Write statement rows (header first) to the first sheet of a new workbook"""
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_read_xlsx_statement(csv_processor, test_data_path, tmp_path):
+    """Test a workbook statement reads the same as its CSV version"""
+    csv_data = CSVProcessor().read_file(test_data_path / 'valid_statement.csv')
+    xlsx_path = write_workbook(tmp_path / 'statement.xlsx', [
+        list(csv_data.columns),
+        ['8/30/2024', 'Order Payment', '114-7777777-88888888', 'Test', 49, -6.99, -11.03, 6.99, 37.97],
+    ])
+
+    xlsx_data = csv_processor.read_file(xlsx_path)
+
+    pd.testing.assert_frame_equal(xlsx_data, csv_data)
+    assert csv_processor.current_market == MARKETPLACE_CONFIG['USD']
+
+
+def test_iter_xlsx_chunks(csv_processor, tmp_path):
+    """Test workbooks are streamed in chunks and Excel dates use the marketplace format"""
+    header = ['Date', 'Transaction type', 'Order ID', 'Product Details', 'Total product charges',
+              'Total promotional rebates', 'Amazon fees', 'Other', 'Total (AUD)']
+    rows = [[datetime.datetime(2024, 8, day), 'Order Payment', f'249-{day}', None, 10, 0, -1.5, 0, 8.5]
+            for day in range(1, 6)]
+    xlsx_path = write_workbook(tmp_path / 'statement.xlsx', [header] + rows)
+
+    chunks = list(csv_processor.iter_file(xlsx_path, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    statement_data = pd.concat(chunks, ignore_index=True)
+    assert statement_data['Date'].tolist() == [f'0{day}/08/2024' for day in range(1, 6)]
+    assert statement_data['Product Details'].isna().all()
+    assert statement_data['Total (AUD)'].dtype == 'float64'
+    assert csv_processor.current_market == MARKETPLACE_CONFIG['AUD']
+
+
+def test_read_invalid_xlsx_statement(csv_processor, tmp_path):
+    """Test workbooks get the same header validation as CSV files"""
+    xlsx_path = write_workbook(tmp_path / 'statement.xlsx', [
+        ['Date', 'Order ID', 'Product Details', 'Total product charges',
+         'Total promotional rebates', 'Other', 'Total (USD)'],
+    ])
+
+    with pytest.raises(Exception,
+                       match="Error reading file: Missing required columns: \\['Transaction type', 'Amazon fees'\\]"):
+        csv_processor.read_file(xlsx_path)
@@ -3,7 +3,8 @@ import pandas as pd
 from pathlib import Path
 
 from src.data_processor import DataProcessor
-from src.csv_processor import CSVProcessor
+from src.csv_processor import CSVProcessor, statement_dtypes
+from src.rate_providers import InMemoryRateProvider
 
 
 @pytest.fixture
@@ -192,6 +193,7 @@ def test_process_au_statement(csv_processor, data_processor, test_data_path):
         'Other': [4.72],  # 6.99 * 0.676
         'Total (USD)': [25.67]  # 37.97 * 0.676
     })
+    expected_data = expected_data.astype(statement_dtypes(expected_data.columns))
 
     # Compare results
     pd.testing.assert_frame_equal(
@@ -199,4 +201,220 @@ def test_process_au_statement(csv_processor, data_processor, test_data_path):
         expected_data,
         check_exact=False,
         rtol=0.1  # 10% tolerance for exchange rates
-    )
\ No newline at end of file
+    )
+
+def test_transform_currency_offline_rates():
+    """
+    Test vectorized conversion with fixed rates:
+    - one bulk FRED request for the statement's (padded) date window
+    - rounding matches Python's round() on each cell
+    """
+    rates = pd.Series([0.65, 0.5], index=pd.DatetimeIndex(['2024-01-03', '2024-01-04']))
+    requests = []
+
+    class RecordingProvider(InMemoryRateProvider):
+        def get_series(self, series_id, start, end):
+            requests.append((series_id, start, end))
+            return super().get_series(series_id, start, end)
+
+    data_processor = DataProcessor(rate_provider=RecordingProvider({'DEXUSAL': rates}))
+
+    input_data = pd.DataFrame({
+        'Date': ['1/03/2024', '1/04/2024', '1/03/2024'],
+        'Transaction type': ['Order Payment'] * 3,
+        'Order ID': ['114-7777777-88888888'] * 3,
+        'Product Details': ['Test'] * 3,
+        'Total product charges': [176.5, 10.0, 49],
+        'Total promotional rebates': [-6.99, -1.01, 0],
+        'Amazon fees': [-11.03, -2.5, -5],
+        'Other': [6.99, 0.03, 0],
+        'Total (AUD)': [165.47, 6.52, 44]
+    })
+
+    result = data_processor.transform_currency(input_data)
+
+    assert requests == [('DEXUSAL', '2023-12-27', '2024-01-11')]  # padded by a week
+    assert 'Total (USD)' in result.columns
+    for column in ['Total product charges', 'Total promotional rebates', 'Amazon fees', 'Other']:
+        expected = [
+            round(float(amount) * float(rates[pd.to_datetime(date)]), 2)
+            for amount, date in zip(input_data[column], input_data['Date'])
+        ]
+        assert result[column].tolist() == expected
+
+
+def test_rate_source_required():
+    """DataProcessor needs either a FRED API key or a rate provider"""
+    with pytest.raises(ValueError, match="Either api_key or rate_provider is required"):
+        DataProcessor()
+
+
+def test_transform_to_us_date_format_repeated_dates(data_processor):
+    """Test distinct-date parsing maps results back onto every row, keeping the index"""
+    input_data = pd.DataFrame({'Date': ['25/10/2024', '03/01/2024', None, '25/10/2024']}, index=[4, 5, 6, 7])
+
+    result = data_processor.transform_to_us_date_format(input_data)
+
+    assert result.index.tolist() == [4, 5, 6, 7]
+    assert result['Date'].tolist()[:2] == ['10/25/2024', '1/03/2024']
+    assert pd.isna(result['Date'].iloc[2])
+    assert result['Date'].iloc[3] == '10/25/2024'
+
+
+@pytest.mark.parametrize('currency, series_id, rate, expected_total', [
+    ('GBP', 'DEXUSUK', 1.25, 125.0),      # USD per GBP: multiply
+    ('JPY', 'DEXJPUS', 150.0, 0.67),      # JPY per USD: divide
+    ('PLN', 'PLN_PER_USD', 4.0, 25.0),    # not on FRED, from a rate file
+])
+def test_transform_currency_quote_direction(currency, series_id, rate, expected_total):
+    """Test the registry's series and quote direction drive the conversion"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({series_id: {'2024-08-30': rate}}))
+    input_data = pd.DataFrame({
+        'Date': ['8/30/2024'],
+        'Transaction type': ['Order Payment'],
+        'Order ID': ['1'],
+        'Product Details': ['Test'],
+        'Total product charges': [100.0],
+        'Total promotional rebates': [0.0],
+        'Amazon fees': [0.0],
+        'Other': [0.0],
+        f'Total ({currency})': [100.0]
+    })
+
+    result = data_processor.transform_currency(input_data)
+
+    assert result['Total (USD)'].tolist() == [expected_total]
+
+
+@pytest.mark.parametrize('money_mode', [None, 'half_even'])
+def test_transform_currency_missing_date(money_mode):
+    """Test rows without a date are reported instead of having their amounts blanked"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({'DEXUSAL': {'2024-08-30': 0.5}}),
+                                   money_mode=money_mode)
+    input_data = pd.DataFrame({
+        'Date': ['8/30/2024', None],
+        'Total product charges': [10.0, 10.0],
+        'Total promotional rebates': [0.0, 0.0],
+        'Amazon fees': [-2.0, -2.0],
+        'Other': [0.0, 0.0],
+        'Total (AUD)': [8.0, 8.0]
+    })
+
+    with pytest.raises(ValueError, match=r"No Date in 1 row\(s\) \(1\)"):
+        data_processor.transform_currency(input_data)
+
+
+def test_transform_currency_usd_unchanged():
+    """Test USD statements pass through without a rate lookup"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+    input_data = pd.DataFrame({'Date': ['8/30/2024'], 'Total product charges': [49.0], 'Total (USD)': [37.97]})
+
+    pd.testing.assert_frame_equal(data_processor.transform_currency(input_data), input_data)
+
+
+def test_normalize_timezone_shifts_rate_date():
+    """Test local timestamps move to US Pacific time, taking the US date (and its rate) along"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({
+        'DEXUSAL': {'2024-08-29': 0.5, '2024-08-30': 0.6766}
+    }))
+    input_data = pd.DataFrame({
+        'Date': ['8/30/2024', '8/30/2024'],
+        'date/time': ['2024-08-30 09:00:00', '2024-08-30 20:00:00'],  # Sydney, UTC+10
+        'Total product charges': [10.0, 10.0],
+        'Total promotional rebates': [0.0, 0.0],
+        'Amazon fees': [0.0, 0.0],
+        'Other': [0.0, 0.0],
+        'Total (AUD)': [10.0, 10.0]
+    })
+
+    normalized = data_processor.normalize_timezone(input_data, 'AUD')
+
+    assert normalized['date/time'].tolist() == ['08/29/2024 16:00:00 PDT', '08/30/2024 03:00:00 PDT']
+    assert normalized['Date'].tolist() == ['8/29/2024', '8/30/2024']
+    assert data_processor.transform_currency(normalized)['Total (USD)'].tolist() == [5.0, 6.77]
+
+
+def test_normalize_timezone_with_offsets():
+    """Test timestamps carrying their own UTC offsets, including mixed ones"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+    input_data = pd.DataFrame({
+        'Date': ['8/30/2024', '8/30/2024'],
+        'date/time': ['2024-08-30 06:00:00+01:00', '2024-08-30 12:00:00+00:00'],
+    })
+
+    normalized = data_processor.normalize_timezone(input_data, 'GBP')
+
+    assert normalized['date/time'].tolist() == ['08/29/2024 22:00:00 PDT', '08/30/2024 05:00:00 PDT']
+    assert normalized['Date'].tolist() == ['8/29/2024', '8/30/2024']
+
+
+@pytest.mark.parametrize('timestamps, expected_dates', [
+    (['03/04/2024 10:00:00', '13/04/2024 10:00:00'], ['4/03/2024', '4/13/2024']),
+    (['03/04/2024 10:00:00 +01:00', '13/04/2024 09:00:00 +00:00'], ['4/03/2024', '4/13/2024']),
+])
+def test_normalize_timezone_day_first_timestamps(timestamps, expected_dates):
+    """Test day-first timestamps with day <= 12 are read in the file's date format, not month first"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+    input_data = data_processor.transform_to_us_date_format(
+        pd.DataFrame({'Date': ['03/04/2024', '13/04/2024'], 'date/time': timestamps}), 'DD/MM/YYYY'
+    )
+
+    normalized = data_processor.normalize_timezone(input_data, 'GBP', 'DD/MM/YYYY')
+
+    assert normalized['Date'].tolist() == expected_dates
+    assert normalized['date/time'].tolist() == ['04/03/2024 02:00:00 PDT', '04/13/2024 02:00:00 PDT']
+
+
+def test_normalize_timezone_12_hour_timestamps():
+    """Test AM/PM timestamps and marketplace zone abbreviations are read as local time, not UTC"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+    input_data = pd.DataFrame({
+        'Date': ['8/30/2024', '8/30/2024'],
+        'date/time': ['30/08/2024 9:00:00 AM', '30/08/2024 8:00:00 PM AEST'],  # Sydney, UTC+10
+    })
+
+    normalized = data_processor.normalize_timezone(input_data, 'AUD')
+
+    assert normalized['date/time'].tolist() == ['08/29/2024 16:00:00 PDT', '08/30/2024 03:00:00 PDT']
+    assert normalized['Date'].tolist() == ['8/29/2024', '8/30/2024']
+
+
+@pytest.mark.parametrize('timestamp', ['30/08/2024 9:00:00 AM PDT', 'not a time'])
+def test_normalize_timezone_unparseable_timestamps(timestamp):
+    """Test timestamps that cannot be placed in marketplace time are reported, not passed through"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+    input_data = pd.DataFrame({'Date': ['8/30/2024', '8/30/2024'],
+                               'date/time': ['30/08/2024 9:00:00 AM', timestamp]})
+
+    with pytest.raises(ValueError, match=f"Unrecognized date/time value in 1 row.*{timestamp}"):
+        data_processor.normalize_timezone(input_data, 'AUD')
+
+
+def test_normalize_timezone_without_timestamps():
+    """Test statements without a date/time column, and US statements, are left alone"""
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+    input_data = pd.DataFrame({'Date': ['8/30/2024'], 'date/time': ['2024-08-30 01:00:00']})
+
+    pd.testing.assert_frame_equal(data_processor.normalize_timezone(input_data[['Date']], 'GBP'),
+                                  input_data[['Date']])
+    pd.testing.assert_frame_equal(data_processor.normalize_timezone(input_data, 'USD'), input_data)
+
+
+@pytest.mark.parametrize('dates, currency, expected_format', [
+    (['03/04/2024', '25/04/2024'], 'USD', 'DD/MM/YYYY'),  # later dates rule out MM/DD
+    (['03/04/2024', '04/04/2024'], 'AUD', 'DD/MM/YYYY'),  # ambiguous: the marketplace's format
+    (['03/04/2024', '04/04/2024'], 'USD', 'MM/DD/YYYY'),
+    (['8/30/2024', '8/31/2024'], 'AUD', 'MM/DD/YYYY'),    # already US format
+    (['2024/08/30', None], 'JPY', 'YYYY/MM/DD'),
+])
+def test_detect_date_format(dates, currency, expected_format):
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+
+    assert data_processor.detect_date_format(pd.Series(dates), currency) == expected_format
+
+
+def test_detect_date_format_unrecognized():
+    data_processor = DataProcessor(rate_provider=InMemoryRateProvider({}))
+
+    with pytest.raises(ValueError, match="Unrecognized date format"):
+        data_processor.detect_date_format(pd.Series(['30/08/2024', 'Aug 31, 2024']), 'AUD')
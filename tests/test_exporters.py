@@ -0,0 +1,119 @@
+import pytest
+import pandas as pd
+
+from src import exporters
+from src.csv_processor import statement_dtypes
+from src.exporters import EXPORT_FORMATS, export_format, open_writer, write_statement
+
+
+@pytest.fixture
+def statement_data():
+    statement_data = pd.DataFrame({
+        'Date': ['8/30/2024', '8/31/2024', '9/1/2024', '9/2/2024', '9/3/2024'],
+        'Transaction type': ['Order Payment', 'Refund', 'Order Payment', 'Service Fees', 'Order Payment'],
+        'Order ID': ['114-1', '114-2', '114-3', None, '114-5'],
+        'Product Details': ['A', 'B', 'C', None, 'E'],
+        'Total product charges': [49.0, -10.5, 12.0, 0.0, 7.25],
+        'Total promotional rebates': [-6.99, 0.0, 0.0, 0.0, 0.0],
+        'Amazon fees': [-11.03, 1.5, -2.0, -39.99, -1.1],
+        'Other': [6.99, 0.0, 0.0, 0.0, 0.0],
+        'Total (USD)': [37.97, -9.0, 10.0, -39.99, 6.15]
+    })
+    return statement_data.astype(statement_dtypes(statement_data.columns))
+
+
+def read_output(path, output_format):
+    """Read an exported file back with the statement column types"""
+    if output_format == 'csv':
+        actual_data = pd.read_csv(path)
+    elif output_format == 'xlsx':
+        actual_data = pd.read_excel(path)
+    elif output_format == 'parquet':
+        actual_data = pd.read_parquet(path)
+    else:
+        actual_data = pd.read_feather(path)
+    return actual_data.astype(statement_dtypes(actual_data.columns))
+
+
+@pytest.mark.parametrize('output_format', EXPORT_FORMATS)
+def test_chunked_export_round_trip(statement_data, tmp_path, output_format):
+    """Test every format writes all chunks and reads back unchanged"""
+    if output_format == 'xlsx':
+        pytest.importorskip('xlsxwriter')
+        pytest.importorskip('openpyxl')
+    elif output_format in ('parquet', 'feather'):
+        pytest.importorskip('pyarrow')
+
+    output_path = tmp_path / f'merged.{output_format}'
+
+    rows_written = write_statement(statement_data, output_path, chunksize=2)
+
+    assert rows_written == 5
+    pd.testing.assert_frame_equal(read_output(output_path, output_format), statement_data)
+
+
+@pytest.mark.parametrize('output_format', EXPORT_FORMATS)
+def test_empty_first_chunk(statement_data, tmp_path, output_format):
+    """Test an empty first chunk (header-only statement) writes the header once"""
+    if output_format == 'xlsx':
+        pytest.importorskip('xlsxwriter')
+        pytest.importorskip('openpyxl')
+    elif output_format in ('parquet', 'feather'):
+        pytest.importorskip('pyarrow')
+
+    output_path = tmp_path / f'merged.{output_format}'
+
+    with open_writer(output_path) as writer:
+        writer.write(statement_data.iloc[:0])
+        writer.write(statement_data)
+
+    assert writer.rows_written == 5
+    pd.testing.assert_frame_equal(read_output(output_path, output_format), statement_data)
+
+
+@pytest.mark.parametrize('output_format', ['parquet', 'feather'])
+@pytest.mark.parametrize('first_extra', [[], [None, None]], ids=['header_only', 'all_missing'])
+def test_arrow_extra_column_types_vary_by_chunk(statement_data, tmp_path, output_format, first_extra):
+    """Test a column outside the statement schema, empty or missing in the first chunk, takes text later"""
+    pytest.importorskip('pyarrow')
+    output_path = tmp_path / f'merged.{output_format}'
+    first_chunk = statement_data.iloc[:len(first_extra)].assign(Notes=pd.Series(first_extra, dtype='float64'))
+    later_chunk = statement_data.iloc[len(first_extra):].assign(Notes='gift')
+
+    with open_writer(output_path) as writer:
+        writer.write(first_chunk)
+        writer.write(later_chunk)
+
+    actual_data = read_output(output_path, output_format)
+    assert actual_data['Notes'].iloc[:len(first_extra)].isna().all()
+    assert actual_data['Notes'].iloc[len(first_extra):].tolist() == ['gift'] * len(later_chunk)
+    pd.testing.assert_frame_equal(actual_data.drop(columns='Notes'), statement_data)
+
+
+def test_xlsx_continues_on_new_sheet(statement_data, tmp_path, monkeypatch):
+    """Test rows beyond the sheet limit go to another sheet with the same header"""
+    pytest.importorskip('xlsxwriter')
+    pytest.importorskip('openpyxl')
+    monkeypatch.setattr(exporters, 'XLSX_MAX_ROWS', 3)
+    output_path = tmp_path / 'merged.xlsx'
+
+    write_statement(statement_data, output_path, chunksize=2)
+
+    sheets = pd.read_excel(output_path, sheet_name=None)
+    assert list(sheets) == ['Statement', 'Statement 2', 'Statement 3']
+    actual_data = pd.concat(sheets.values(), ignore_index=True)
+    pd.testing.assert_frame_equal(actual_data.astype(statement_dtypes(actual_data.columns)), statement_data)
+
+
+def test_writer_rejects_different_columns(statement_data, tmp_path):
+    with open_writer(tmp_path / 'merged.csv') as writer:
+        writer.write(statement_data)
+        with pytest.raises(ValueError, match="differ from the first chunk"):
+            writer.write(statement_data.drop(columns=['Other']))
+
+
+def test_export_format_from_extension():
+    assert export_format('merged.PARQUET') == 'parquet'
+    assert export_format('merged.out', 'feather') == 'feather'
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        export_format('merged.txt')
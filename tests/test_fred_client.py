@@ -0,0 +1,166 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+
+from src.data_processor import DataProcessor
+from src.fred_client import AsyncFredClient, FredHTTPError
+from src.rate_providers import AsyncFredRateProvider
+
+OBSERVATIONS = {
+    'DEXCAUS': [('2024-01-02', '1.3310'), ('2024-01-03', '1.3339'), ('2024-01-04', '.')],
+    'DEXUSAL': [('2024-01-02', '0.6754'), ('2024-01-03', '0.6712')]
+}
+
+
+class StubFred:
+    """Local stand-in for the FRED API: serves OBSERVATIONS, can fail or delay requests"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.failures = []  # statuses answered before serving normally
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def handler(stub):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with stub.lock:
+                    stub.requests.append((url.path, params))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    status = stub.failures.pop(0) if stub.failures else 200
+                time.sleep(stub.delay)
+
+                if status != 200:
+                    body = {'error_code': status, 'error_message': 'Stub error'}
+                elif params['series_id'] not in OBSERVATIONS:
+                    status, body = 400, {'error_code': 400, 'error_message': 'The series does not exist.'}
+                else:
+                    body = {'observations': [
+                        {'date': date, 'value': value}
+                        for date, value in OBSERVATIONS[params['series_id']]
+                        if params['observation_start'] <= date <= params['observation_end']
+                    ]}
+
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 429:
+                    self.send_header('Retry-After', '0')
+                self.end_headers()
+                self.wfile.write(payload)
+                with stub.lock:
+                    stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def stub_fred():
+    stub = StubFred()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), stub.handler())
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    stub.url = f"http://127.0.0.1:{server.server_port}/fred"
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_many_parses_observations(stub_fred):
+    client = AsyncFredClient('key', base_url=stub_fred.url)
+
+    canadian, australian = asyncio.run(client.fetch_many([
+        ('DEXCAUS', '2024-01-02', '2024-01-04'),
+        ('DEXUSAL', '2024-01-03', '2024-01-03')
+    ]))
+
+    assert canadian.index.tolist() == list(pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04']))
+    assert canadian.iloc[:2].tolist() == [1.3310, 1.3339]
+    assert pd.isna(canadian.iloc[2])
+    assert australian.tolist() == [0.6712]
+
+    path, params = stub_fred.requests[0]
+    assert path == '/fred/series/observations'
+    assert params['api_key'] == 'key' and params['file_type'] == 'json'
+
+
+def test_requests_run_concurrently_with_bounded_concurrency(stub_fred):
+    stub_fred.delay = 0.1
+    client = AsyncFredClient('key', base_url=stub_fred.url, max_concurrency=2)
+
+    asyncio.run(client.fetch_many([('DEXCAUS', '2024-01-02', '2024-01-04')] * 5))
+
+    assert len(stub_fred.requests) == 5
+    assert stub_fred.max_in_flight == 2
+
+
+def test_connections_are_reused(stub_fred):
+    provider = AsyncFredRateProvider('key', base_url=stub_fred.url, max_concurrency=1)
+
+    for _ in range(3):
+        provider.get_series('DEXUSAL', '2024-01-02', '2024-01-03')
+
+    assert provider.client.pool.opened == 1
+    provider.close()
+
+
+def test_rate_limit_is_retried(stub_fred):
+    stub_fred.failures = [429, 503]
+    client = AsyncFredClient('key', base_url=stub_fred.url, backoff=0.01)
+
+    series = asyncio.run(client.fetch_series('DEXUSAL', '2024-01-02', '2024-01-03'))
+
+    assert series.tolist() == [0.6754, 0.6712]
+    assert len(stub_fred.requests) == 3
+
+
+def test_retries_are_limited(stub_fred):
+    stub_fred.failures = [500] * 3
+    client = AsyncFredClient('key', base_url=stub_fred.url, max_retries=2, backoff=0.01)
+
+    with pytest.raises(FredHTTPError, match="HTTP 500: Stub error"):
+        asyncio.run(client.fetch_series('DEXUSAL', '2024-01-02', '2024-01-03'))
+    assert len(stub_fred.requests) == 3
+
+
+def test_client_errors_are_not_retried(stub_fred):
+    client = AsyncFredClient('key', base_url=stub_fred.url, backoff=0.01)
+
+    with pytest.raises(FredHTTPError, match="DEXXXXX failed with HTTP 400: The series does not exist") as error:
+        asyncio.run(client.fetch_series('DEXXXXX', '2024-01-02', '2024-01-03'))
+    assert error.value.status == 400
+    assert len(stub_fred.requests) == 1
+
+
+def test_prefetch_many_fetches_currencies_in_one_batch(stub_fred):
+    stub_fred.delay = 0.1
+    processor = DataProcessor(rate_provider=AsyncFredRateProvider('key', base_url=stub_fred.url),
+                              fill_policy=None)
+
+    processor.prefetch_many({
+        'CAD': pd.Series(['1/2/2024', '1/3/2024']),
+        'AUD': pd.Series(['1/3/2024'])
+    })
+
+    assert stub_fred.max_in_flight == 2
+    assert processor.get_exchange_rate('CAD', '2024-01-03') == 1.3339
+    assert processor.get_exchange_rate('AUD', '2024-01-03') == 0.6712
+    assert len(stub_fred.requests) == 2
@@ -0,0 +1,74 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from src.instrumentation import NULL_PROFILE, PipelineProfile
+from src.rate_providers import InMemoryRateProvider
+from src.statement_merger import StatementMerger
+
+
+@pytest.fixture
+def test_data_path():
+    return Path(__file__).parent / 'test_files_statement_merger'
+
+
+def test_merge_records_stages_and_counters(test_data_path):
+    """Test a merge records every pipeline stage with its rows, plus rate lookup counters"""
+    profile = PipelineProfile()
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({'DEXUSAL': {'2024-08-30': 0.6766}}),
+                             profile=profile)
+
+    merger.merge_statements(sorted((test_data_path / 'mixed_statements').glob('*.csv')))
+
+    report = profile.report()
+    assert list(report['stages']) == ['read', 'validate', 'date_detection', 'dates', 'rate_fetch', 'fx', 'concat']
+    assert report['stages']['read']['calls'] == 2
+    assert report['stages']['read']['rows'] == 2
+    assert report['stages']['fx']['rows'] == 1
+    assert report['stages']['concat']['rows'] == 2
+    # Rates are prefetched once for the AUD statement, then looked up from the calendar
+    assert report['counters'] == {'calendar_builds': 1, 'rate_lookups': 1, 'calendar_hits': 1}
+
+
+def test_rate_cache_counters(test_data_path, tmp_path):
+    """Test persistent cache hits and misses are counted"""
+    rates = InMemoryRateProvider({'DEXUSAL': {'2024-08-30': 0.6766}})
+    aud_path = test_data_path / 'non_us_statements' / 'test_AUD_statement.csv'
+    StatementMerger(rate_provider=rates, cache_path=tmp_path / 'rates.db').merge_statements(aud_path)
+
+    profile = PipelineProfile()
+    StatementMerger(rate_provider=rates, cache_path=tmp_path / 'rates.db', profile=profile).merge_statements(aud_path)
+
+    assert profile.counters['rate_cache_hits'] == 1
+    assert 'rate_fetch' not in profile.stages
+
+
+def test_trace_memory_and_table(test_data_path):
+    profile = PipelineProfile(trace_memory=True)
+    StatementMerger(rate_provider=InMemoryRateProvider({}), profile=profile).merge_statements(
+        test_data_path / 'us_statements' / 'valid_statement.csv'
+    )
+
+    assert profile.stages['read'].peak_traced_mb > 0
+    table = profile.format_table()
+    assert table.splitlines()[0].split() == ['stage', 'calls', 'seconds', 'rows', 'rows/s', 'peak', 'MB']
+    assert 'wall time:' in table
+
+
+def test_profile_pickles_for_worker_processes():
+    profile = PipelineProfile()
+    profile.count('rate_lookups', 3)
+
+    copy = pickle.loads(pickle.dumps(profile))
+    copy.count('rate_lookups')
+
+    assert copy.counters == {'rate_lookups': 4}
+    assert profile.counters == {'rate_lookups': 3}
+
+
+def test_null_profile_records_nothing():
+    with NULL_PROFILE.stage('read') as stage:
+        stage.rows = 10
+    NULL_PROFILE.count('rate_lookups')
+    NULL_PROFILE.add('read', 1.0, 10)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.generator import generate_statement, offline_provider
+from src.data_processor import DataProcessor
+from src.market_config import QUOTE_PER_USD, QUOTE_USD_PER_UNIT
+from src.money import convert_cents, divide_rounded, from_cents, reconcile, to_cents
+
+
+@pytest.mark.parametrize('rounding, expected', [
+    ('half_even', [2, 2, 4, -2, -2, 1, -1]),
+    ('half_up', [3, 2, 4, -3, -2, 1, -1]),
+])
+def test_divide_rounded_ties(rounding, expected):
+    # 2.5, 2.4, 3.5, -2.5, -2.4, 0.6, -0.6
+    numerator = np.array([25, 24, 35, -25, -24, 6, -6], dtype='int64')
+
+    assert divide_rounded(numerator, 10, rounding).tolist() == expected
+
+
+def test_divide_rounded_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown rounding mode"):
+        divide_rounded(np.array([1]), 2, 'half_down')
+
+
+def test_cents_round_trip_keeps_missing_amounts():
+    cents, missing = to_cents([19.99, -0.07, np.nan])
+
+    assert cents.tolist() == [1999, -7, 0]
+    np.testing.assert_array_equal(from_cents(cents, missing), [19.99, -0.07, np.nan])
+
+
+def test_convert_cents_is_exact():
+    cents = np.array([1000, 125], dtype='int64')
+
+    # 10.00 / 1.25 = 8.00 and 1.25 / 1.25 = 1.00 exactly; 1.25 * 0.1 = 0.125 is a tie
+    assert convert_cents(cents, np.array([1.25, 1.25]), QUOTE_PER_USD).tolist() == [800, 100]
+    assert convert_cents(np.array([125]), np.array([0.1]), QUOTE_USD_PER_UNIT, 'half_even').tolist() == [12]
+    assert convert_cents(np.array([125]), np.array([0.1]), QUOTE_USD_PER_UNIT, 'half_up').tolist() == [13]
+
+
+def test_reconcile_reports_mismatched_rows():
+    merged_data = pd.DataFrame({
+        'Total product charges': [10.0, 10.0],
+        'Total promotional rebates': [-1.0, -1.0],
+        'Amazon fees': [-2.0, -2.0],
+        'Other': [np.nan, 0.5],
+        'Total (USD)': [7.0, 7.51]
+    })
+
+    mismatched = reconcile(merged_data)
+
+    assert mismatched.index.tolist() == [1]
+    assert mismatched['Difference (cents)'].tolist() == [1]
+
+
+@pytest.mark.parametrize('currency', ['AUD', 'CAD'])
+def test_money_mode_totals_reconcile(currency):
+    """Float rounding lets converted totals drift from their components; money mode does not"""
+    statement_data = generate_statement(20_000, currency, date_format='MM/DD/YYYY')
+    provider = offline_provider([currency])
+
+    float_result = DataProcessor(rate_provider=provider).transform_currency(statement_data)
+    money_result = DataProcessor(rate_provider=provider, money_mode='half_even').transform_currency(statement_data)
+
+    assert not reconcile(float_result).empty
+    assert reconcile(money_result).empty
+    amount_columns = ['Total product charges', 'Total promotional rebates', 'Amazon fees', 'Other']
+    assert (money_result[amount_columns] - float_result[amount_columns]).abs().max().max() < 0.011
+
+
+def test_unknown_money_mode():
+    with pytest.raises(ValueError, match="Unknown money mode"):
+        DataProcessor(rate_provider=offline_provider(['AUD']), money_mode='float')
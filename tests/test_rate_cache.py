@@ -0,0 +1,106 @@
+import time
+
+import pytest
+import pandas as pd
+
+from src.rate_cache import RateCache
+from src.data_processor import DataProcessor
+from src.rate_providers import InMemoryRateProvider
+
+
+class CountingProvider(InMemoryRateProvider):
+    """In-memory provider that records the requests it receives"""
+
+    def __init__(self, rates):
+        super().__init__(rates)
+        self.calls = []
+
+    def get_series(self, series_id, start, end):
+        self.calls.append((series_id, start, end))
+        return super().get_series(series_id, start, end)
+
+
+@pytest.fixture
+def rates():
+    return pd.Series(
+        [0.6627, float('nan'), 0.6705],
+        index=pd.DatetimeIndex(['2023-12-01', '2023-12-04', '2023-12-15'])
+    )
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / 'rates.sqlite'
+
+
+def test_store_and_read_window(cache_path, rates):
+    cache = RateCache(cache_path)
+    cache.store('DEXUSAL', '2023-12-01', '2023-12-31', rates)
+
+    cached = cache.get_rates('DEXUSAL', '2023-12-01', '2023-12-15')
+
+    pd.testing.assert_series_equal(cached, rates, check_freq=False)
+
+
+def test_uncovered_window_is_a_miss(cache_path, rates):
+    cache = RateCache(cache_path)
+    cache.store('DEXUSAL', '2023-12-01', '2023-12-31', rates)
+
+    assert cache.get_rates('DEXUSAL', '2023-11-01', '2023-12-15') is None
+    assert cache.get_rates('DEXCAUS', '2023-12-01', '2023-12-15') is None
+
+
+def test_staleness_policy(cache_path, rates, monkeypatch):
+    """Unsettled windows expire after max_age_hours, settled windows never do"""
+    cache = RateCache(cache_path, max_age_hours=1, settle_days=7)
+    settled_at = pd.Timestamp('2024-01-07').timestamp()  # 2023-12-31 + 7 days
+
+    monkeypatch.setattr(time, 'time', lambda: settled_at - 86400)
+    cache.store('DEXUSAL', '2023-12-01', '2023-12-31', rates)  # fetched before settling
+    monkeypatch.setattr(time, 'time', lambda: settled_at)
+    cache.store('DEXCAUS', '2023-12-01', '2023-12-31', rates)  # fetched after settling
+
+    monkeypatch.setattr(time, 'time', lambda: settled_at + 30 * 86400)
+    assert cache.get_rates('DEXUSAL', '2023-12-01', '2023-12-31') is None
+    assert cache.get_rates('DEXUSAL', '2023-12-01', '2023-12-31', allow_stale=True) is not None
+    assert cache.get_rates('DEXCAUS', '2023-12-01', '2023-12-31') is not None
+
+
+def test_processor_reuses_cache_across_instances(cache_path, rates):
+    """One bulk fetch fills the cache, later processors never hit FRED"""
+    first = DataProcessor(cache_path=cache_path, rate_provider=CountingProvider({'DEXUSAL': rates}))
+
+    assert first.get_exchange_rate('AUD', '2023-12-01') == 0.6627
+    assert first.get_exchange_rate('AUD', '2023-12-15') == 0.6705
+    assert len(first.rate_provider.calls) == 1
+
+    second = DataProcessor(cache_path=cache_path, rate_provider=CountingProvider({'DEXUSAL': rates}))
+
+    assert second.get_exchange_rate('AUD', '2023-12-15') == 0.6705
+    assert second.rate_provider.calls == []
+
+
+def test_processor_falls_back_to_stale_cache_offline(cache_path, rates, monkeypatch):
+    processor = DataProcessor(cache_path=cache_path, rate_provider=CountingProvider({'DEXUSAL': rates}))
+    processor.get_exchange_rate('AUD', '2023-12-01')
+
+    processor.rate_cache.max_age_hours = 0
+    processor.rate_calendars.clear()
+    processor.rate_cache.settle_days = 10000
+
+    def offline(*args, **kwargs):
+        raise ConnectionError("network is unreachable")
+
+    monkeypatch.setattr(processor.rate_provider, 'get_series', offline)
+
+    assert processor.get_exchange_rate('AUD', '2023-12-15') == 0.6705
+
+
+def test_prefetch_fetches_statement_window_once(cache_path, rates):
+    processor = DataProcessor(rate_provider=CountingProvider({'DEXUSAL': rates}))
+
+    processor.prefetch_exchange_rates('AUD', pd.Series(['12/15/2023', '12/1/2023', '12/15/2023']))
+
+    assert processor.get_exchange_rate('AUD', '2023-12-01') == 0.6627
+    assert processor.get_exchange_rate('AUD', '2023-12-15') == 0.6705
+    assert processor.rate_provider.calls == [('DEXUSAL', '2023-11-24', '2023-12-22')]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import pandas as pd
+
+from src.rate_calendar import RateCalendar
+from src.data_processor import DataProcessor
+from src.rate_providers import InMemoryRateProvider
+
+
+@pytest.fixture
+def weekday_rates():
+    """Thu 2024-03-28 .. Tue 2024-04-02, no observations on the weekend, Monday missing (NaN)"""
+    return pd.Series(
+        [0.65, 0.66, float('nan'), 0.68],
+        index=pd.DatetimeIndex(['2024-03-28', '2024-03-29', '2024-04-01', '2024-04-02'])
+    )
+
+
+@pytest.mark.parametrize('fill_policy, expected', [
+    ('ffill', [0.65, 0.66, 0.66, 0.66, 0.66, 0.68]),
+    ('bfill', [0.65, 0.66, 0.68, 0.68, 0.68, 0.68]),
+    ('nearest', [0.65, 0.66, 0.66, 0.66, 0.68, 0.68]),
+])
+def test_fill_policies(weekday_rates, fill_policy, expected):
+    calendar = RateCalendar(weekday_rates, '2024-03-28', '2024-04-02', fill_policy=fill_policy)
+
+    assert calendar.rates.tolist() == expected
+
+
+def test_no_fill_policy_keeps_gaps(weekday_rates):
+    calendar = RateCalendar(weekday_rates, '2024-03-28', '2024-04-02', fill_policy=None)
+
+    assert np.isnan(calendar.rate_for('2024-03-30'))
+    assert calendar.rate_for('2024-03-29') == 0.66
+
+
+def test_unknown_fill_policy(weekday_rates):
+    with pytest.raises(ValueError, match="Unknown fill policy"):
+        RateCalendar(weekday_rates, '2024-03-28', '2024-04-02', fill_policy='linear')
+
+
+def test_vectorized_lookup(weekday_rates):
+    calendar = RateCalendar(weekday_rates, '2024-03-28', '2024-04-02')
+
+    rates = calendar.rates_for(pd.DatetimeIndex(['2024-04-02', '2024-03-31', '2024-03-28']))
+
+    assert rates.tolist() == [0.68, 0.66, 0.65]
+    assert calendar.covers('2024-03-29', '2024-04-01')
+    assert not calendar.covers('2024-03-01', '2024-04-01')
+
+
+def test_weekend_statement_converts(weekday_rates):
+    """A statement settled on a weekend converts instead of failing"""
+    processor = DataProcessor(rate_provider=InMemoryRateProvider({'DEXUSAL': weekday_rates}))
+
+    statement = pd.DataFrame({
+        'Date': ['3/30/2024', '3/31/2024', '4/2/2024'],
+        'Transaction type': ['Order Payment'] * 3,
+        'Order ID': ['114-7777777-88888888'] * 3,
+        'Product Details': ['Test'] * 3,
+        'Total product charges': [100.0] * 3,
+        'Total promotional rebates': [0.0] * 3,
+        'Amazon fees': [-10.0] * 3,
+        'Other': [0.0] * 3,
+        'Total (AUD)': [90.0] * 3
+    })
+
+    result = processor.transform_currency(statement)
+
+    assert result['Total product charges'].tolist() == [66.0, 66.0, 68.0]
+    assert processor.get_exchange_rate('AUD', '2024-03-30') == 0.66
+
+
+def test_strict_policy_raises_on_weekend(weekday_rates):
+    processor = DataProcessor(fill_policy=None, rate_provider=InMemoryRateProvider({'DEXUSAL': weekday_rates}))
+
+    with pytest.raises(Exception, match="No exchange rate data available for AUD on 2024-03-30"):
+        processor.get_exchange_rate('AUD', '2024-03-30')
@@ -0,0 +1,114 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+from src.data_processor import DataProcessor
+from src.rate_memo import LRUCache, RateMemo
+from src.rate_providers import InMemoryRateProvider
+
+
+class CountingProvider(InMemoryRateProvider):
+    """In-memory provider that records the requests it receives"""
+
+    def __init__(self, rates):
+        super().__init__(rates)
+        self.calls = []
+
+    def get_series(self, series_id, start, end):
+        self.calls.append((series_id, start, end))
+        return super().get_series(series_id, start, end)
+
+
+@pytest.fixture
+def provider():
+    return CountingProvider({
+        'DEXUSAL': pd.Series([0.66, 0.67, 0.68], index=pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04']))
+    })
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 3, 'misses': 1, 'evictions': 1}
+
+
+def test_lru_survives_pickling():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+
+    assert pickle.loads(pickle.dumps(cache)).get('a') == 1
+
+
+def test_series_memo_serves_covered_windows():
+    memo = RateMemo()
+    memo.store_series('DEXUSAL', '2024-01-01', '2024-01-31',
+                      pd.Series([0.66, 0.67], index=pd.to_datetime(['2024-01-02', '2024-01-15'])))
+
+    assert memo.get_series('DEXUSAL', '2024-01-10', '2024-01-20').tolist() == [0.67]
+    assert memo.get_series('DEXUSAL', '2023-12-31', '2024-01-20') is None
+    assert memo.get_series('DEXCAUS', '2024-01-10', '2024-01-20') is None
+
+
+def test_repeated_lookups_do_not_refetch(provider):
+    processor = DataProcessor(rate_provider=provider, fill_policy=None)
+
+    assert processor.get_exchange_rate('AUD', '2024-01-03') == 0.67
+    processor.rate_calendars.clear()
+    assert processor.get_exchange_rate('AUD', '2024-01-03') == 0.67
+
+    assert len(provider.calls) == 1
+    assert processor.rate_memo_stats()['rates']['hits'] == 1
+
+
+def test_shared_memo_reuses_rates_across_processors(provider):
+    memo = RateMemo()
+    statement_data = pd.DataFrame({
+        'Date': ['1/2/2024', '1/3/2024'],
+        'Total product charges': [100.0, 100.0],
+        'Total promotional rebates': [0.0, 0.0],
+        'Amazon fees': [0.0, 0.0],
+        'Other': [0.0, 0.0],
+        'Total (AUD)': [100.0, 100.0]
+    })
+
+    first = DataProcessor(rate_provider=provider, rate_memo=memo).transform_currency(statement_data)
+    second = DataProcessor(rate_provider=provider, rate_memo=memo).transform_currency(statement_data)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert len(provider.calls) == 1
+
+
+def test_seeded_rates_are_used_instead_of_fetching(provider):
+    processor = DataProcessor(rate_provider=provider)
+    processor.seed_rates('AUD', pd.Series([0.5], index=['2024-01-03']))
+
+    assert processor.get_exchange_rate('AUD', '2024-01-03') == 0.5
+    assert provider.calls == []
+
+
+def test_seeded_series_is_used_instead_of_fetching(provider):
+    processor = DataProcessor(rate_provider=provider, fill_policy=None)
+    processor.seed_series('AUD', pd.Series([0.5, 0.6], index=['2024-01-02', '2024-01-05']))
+
+    processor.prefetch_exchange_rates('AUD', pd.Series(['1/2/2024', '1/5/2024']))
+
+    assert processor.get_exchange_rate('AUD', '2024-01-05') == 0.6
+    assert provider.calls == []
+
+
+def test_clear_forces_a_new_fetch(provider):
+    processor = DataProcessor(rate_provider=provider)
+    processor.get_exchange_rate('AUD', '2024-01-03')
+
+    processor.clear_rate_memo()
+    processor.get_exchange_rate('AUD', '2024-01-03')
+
+    assert len(provider.calls) == 2
+    assert processor.rate_memo_stats()['series']['size'] == 1
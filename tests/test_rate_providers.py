@@ -0,0 +1,54 @@
+import pytest
+import pandas as pd
+
+from src.rate_providers import FileRateProvider, InMemoryRateProvider
+
+
+def test_in_memory_provider_window():
+    provider = InMemoryRateProvider({
+        'DEXUSAL': {'2024-01-03': 0.67, '2024-01-02': 0.68, '2024-01-05': 0.66}
+    })
+
+    series = provider.get_series('DEXUSAL', '2024-01-02', '2024-01-04')
+
+    assert series.tolist() == [0.68, 0.67]
+    assert isinstance(series.index, pd.DatetimeIndex)
+
+
+def test_in_memory_provider_unknown_series():
+    provider = InMemoryRateProvider({})
+
+    with pytest.raises(ValueError, match="No rates for series DEXCAUS"):
+        provider.get_series('DEXCAUS', '2024-01-02', '2024-01-04')
+
+
+def test_file_provider_wide_csv(tmp_path):
+    rate_table = tmp_path / 'rates.csv'
+    rate_table.write_text(
+        "date,DEXCAUS,DEXUSAL\n"
+        "2024-01-02,1.3310,0.6754\n"
+        "2024-01-03,1.3339,.\n"
+    )
+
+    provider = FileRateProvider(rate_table)
+
+    assert provider.get_series('DEXCAUS', '2024-01-02', '2024-01-03').tolist() == [1.3310, 1.3339]
+    assert provider.get_series('DEXUSAL', '2024-01-03', '2024-01-03').isna().all()
+
+
+def test_file_provider_long_csv(tmp_path):
+    rate_table = tmp_path / 'rates.csv'
+    rate_table.write_text(
+        "series_id,date,rate\n"
+        "DEXUSAL,2024-01-02,0.6754\n"
+        "DEXCAUS,2024-01-02,1.3310\n"
+    )
+
+    provider = FileRateProvider(rate_table)
+
+    assert provider.get_series('DEXUSAL', '2024-01-01', '2024-01-31').tolist() == [0.6754]
+
+
+def test_file_provider_unsupported_format(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported rate table format"):
+        FileRateProvider(tmp_path / 'rates.xls')
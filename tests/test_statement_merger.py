@@ -2,7 +2,27 @@ import pytest
 import pandas as pd
 from pathlib import Path
 
-from src.statement_merger import StatementMerger
+from src.statement_merger import MergeCancelled, StatementMerger
+from src.csv_processor import statement_dtypes
+from src.rate_providers import InMemoryRateProvider
+
+
+def read_expected(path):
+    """Read an expected-result CSV with the statement column types"""
+    expected_data = pd.read_csv(path)
+    return expected_data.astype(statement_dtypes(expected_data.columns))
+
+
+class RecordingProvider(InMemoryRateProvider):
+    """In-memory rate provider that records requested series (module level so it pickles)"""
+
+    def __init__(self, rates):
+        super().__init__(rates)
+        self.requests = []
+
+    def get_series(self, series_id, start, end):
+        self.requests.append(series_id)
+        return super().get_series(series_id, start, end)
 
 
 @pytest.fixture
@@ -35,6 +55,7 @@ def test_single_us_statement(statement_merger, test_data_path):
         'Other': [6.99],
         'Total (USD)': [37.97]
     })
+    expected_data = expected_data.astype(statement_dtypes(expected_data.columns))
 
     # Compare results
     pd.testing.assert_frame_equal(actual_data, expected_data)
@@ -47,7 +68,7 @@ def test_multiple_us_statements(statement_merger, test_data_path):
     actual_data = statement_merger.merge_statements(list(us_statements_path.glob('*.csv')))
 
     # Load pre-prepared expected result
-    expected_data = pd.read_csv(test_data_path / 'expected_merged_us.csv')
+    expected_data = read_expected(test_data_path / 'expected_merged_us.csv')
 
     pd.testing.assert_frame_equal(actual_data, expected_data)
 
@@ -59,7 +80,7 @@ def test_multiple_non_us_statements(statement_merger, test_data_path):
     actual_data = statement_merger.merge_statements(list(non_us_path.glob('*.csv')))
 
     # Load pre-prepared expected result with converted currencies and dates
-    expected_data = pd.read_csv(test_data_path / 'expected_merged_non_us.csv')
+    expected_data = read_expected(test_data_path / 'expected_merged_non_us.csv')
 
     pd.testing.assert_frame_equal(actual_data, expected_data)
 
@@ -70,7 +91,7 @@ def test_mixed_statements(statement_merger, test_data_path):
     actual_data = statement_merger.merge_statements(list(mixed_path.glob('*.csv')))
 
     # Load pre-prepared expected result
-    expected_data = pd.read_csv(test_data_path / 'expected_merged_mixed.csv')
+    expected_data = read_expected(test_data_path / 'expected_merged_mixed.csv')
 
     pd.testing.assert_frame_equal(actual_data, expected_data)
 
@@ -87,4 +108,242 @@ def test_mixed_valid_invalid_files(statement_merger, test_data_path):
     mixed_valid_invalid_path = test_data_path / 'mixed_valid_invalid'
 
     with pytest.raises(Exception, match="Error processing"):
-        statement_merger.merge_statements(list(mixed_valid_invalid_path.glob('*.csv')))
\ No newline at end of file
+        statement_merger.merge_statements(list(mixed_valid_invalid_path.glob('*.csv')))
+
+def test_non_us_statements_offline_provider(test_data_path):
+    """Test converting non-US statements with an in-memory rate table instead of FRED"""
+    provider = InMemoryRateProvider({'DEXUSAL': {'2024-08-30': 0.6766}})
+    merger = StatementMerger(rate_provider=provider)
+
+    non_us_path = test_data_path / 'non_us_statements'
+    actual_data = merger.merge_statements(sorted(non_us_path.glob('*.csv')))
+
+    expected_data = read_expected(test_data_path / 'expected_merged_non_us.csv')
+
+    pd.testing.assert_frame_equal(actual_data, expected_data)
+
+
+def test_no_statement_files(statement_merger):
+    """Test merging an empty file list fails with a clear error"""
+    with pytest.raises(ValueError, match="No statement files to merge"):
+        statement_merger.merge_statements([])
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_parallel_merge_matches_sequential(test_data_path, use_processes):
+    """Test parallel ingestion keeps input order and fetches rates once per currency"""
+    rates = {'DEXUSAL': {'2024-08-30': 0.6766}}
+    file_paths = sorted((test_data_path / 'mixed_statements').glob('*.csv')) * 3
+
+    sequential = StatementMerger(rate_provider=InMemoryRateProvider(rates))
+    expected_data = sequential.merge_statements(file_paths)
+
+    provider = RecordingProvider(rates)
+    parallel = StatementMerger(rate_provider=provider, max_workers=4, use_processes=use_processes)
+    actual_data = parallel.merge_statements(file_paths)
+
+    pd.testing.assert_frame_equal(actual_data, expected_data)
+    assert actual_data['Total (USD)'].tolist() == [25.69, 37.97] * 3
+    assert provider.requests == ['DEXUSAL']
+
+
+def test_parallel_merge_reports_failing_file(test_data_path):
+    """Test errors from worker threads name the failing file"""
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({}), max_workers=2)
+    file_paths = sorted((test_data_path / 'mixed_valid_invalid').glob('*.csv'))
+
+    with pytest.raises(Exception, match="Error processing .*invalid_statement.csv.*Missing required columns"):
+        merger.merge_statements(file_paths)
+
+
+def test_stream_statements_matches_merge(test_data_path, tmp_path):
+    """Test chunked streaming writes the same rows as an in-memory merge"""
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({'DEXUSAL': {'2024-08-30': 0.6766}}))
+    file_paths = sorted((test_data_path / 'mixed_statements').glob('*.csv'))
+    output_path = tmp_path / 'merged.csv'
+
+    rows_written = merger.stream_statements(file_paths * 2, output_path, chunksize=1)
+
+    expected_data = merger.merge_statements(file_paths * 2)
+    actual_data = read_expected(output_path)
+
+    assert rows_written == 4
+    pd.testing.assert_frame_equal(actual_data, expected_data)
+
+
+def test_stream_statements_after_header_only_statement(test_data_path, tmp_path):
+    """Test a header-only first statement does not repeat the header in the output"""
+    us_path = test_data_path / 'us_statements' / 'valid_statement.csv'
+    header_only_path = tmp_path / 'header_only.csv'
+    header_only_path.write_text(us_path.read_text(encoding='utf-8-sig').splitlines()[0] + '\n')
+    output_path = tmp_path / 'merged.csv'
+
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({}))
+    rows_written = merger.stream_statements([header_only_path, us_path], output_path)
+
+    assert rows_written == len(merger.merge_statements(us_path))
+    assert output_path.read_text().count('Transaction type') == 1
+
+
+def test_stream_statements_ambiguous_first_chunk(test_data_path, tmp_path):
+    """Test streaming detects the date format from the whole file, like merging, not from the first chunk"""
+    statement = (test_data_path / 'us_statements' / 'valid_statement.csv').read_text(encoding='utf-8-sig')
+    header, row = statement.strip().splitlines()[:2]
+    row_values = row.split(',')
+    day_first_path = tmp_path / 'day_first.csv'
+    day_first_path.write_text('\n'.join([header,
+                                         ','.join(['03/04/2024'] + row_values[1:]),
+                                         ','.join(['25/04/2024'] + row_values[1:])]))
+    output_path = tmp_path / 'merged.csv'
+
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({}))
+    merger.stream_statements(day_first_path, output_path, chunksize=1)
+
+    expected_data = StatementMerger(rate_provider=InMemoryRateProvider({})).merge_statements(day_first_path)
+    assert expected_data['Date'].tolist() == ['4/03/2024', '4/25/2024']
+    pd.testing.assert_frame_equal(read_expected(output_path), expected_data)
+
+
+def test_stream_statements_fetches_rates_once_per_file(test_data_path, tmp_path):
+    """Test streaming a file in many chunks fetches its rates in one request, not one per chunk"""
+    statement = (test_data_path / 'non_us_statements' / 'test_AUD_statement.csv').read_text(encoding='utf-8-sig')
+    header, row = statement.strip().splitlines()[:2]
+    row_values = row.split(',')
+    aud_path = tmp_path / 'aud.csv'
+    aud_path.write_text('\n'.join([header] + [','.join([date] + row_values[1:])
+                                              for date in ['2/8/2024', '16/8/2024', '30/8/2024']]))
+    provider = RecordingProvider({'DEXUSAL': {'2024-08-02': 0.65, '2024-08-16': 0.66, '2024-08-30': 0.6766}})
+
+    merger = StatementMerger(rate_provider=provider)
+    merger.stream_statements(aud_path, tmp_path / 'merged.csv', chunksize=1)
+
+    assert provider.requests == ['DEXUSAL']
+    assert read_expected(tmp_path / 'merged.csv')['Date'].tolist() == ['8/02/2024', '8/16/2024', '8/30/2024']
+
+
+def test_merge_progress_stages(test_data_path):
+    """Test progress is reported per file and stage, in order"""
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({'DEXUSAL': {'2024-08-30': 0.6766}}))
+    aud_path, us_path = sorted((test_data_path / 'mixed_statements').glob('*.csv'))
+    progress = []
+
+    merger.merge_statements([aud_path, us_path],
+                            progress_callback=lambda file_path, stage: progress.append((file_path, stage)))
+
+    assert progress == [
+        (aud_path, 'read'),
+        (aud_path, 'dates'),
+        (us_path, 'read'),
+        (aud_path, 'fx'),
+        (None, 'merge'),
+    ]
+
+
+def test_merge_cancelled(test_data_path):
+    """Test a merge stops with MergeCancelled once cancellation is requested"""
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({}))
+    file_paths = sorted((test_data_path / 'us_multiple_statements').glob('*.csv'))
+    progress = []
+
+    with pytest.raises(MergeCancelled):
+        merger.merge_statements(file_paths,
+                                progress_callback=lambda file_path, stage: progress.append(stage),
+                                is_cancelled=lambda: len(progress) >= 1)
+
+    assert progress == ['read']
+    assert merger.merged_data is None
+
+
+def test_incremental_merge_reuses_unchanged_files(test_data_path, tmp_path):
+    """Test a store skips unchanged files and reprocesses changed ones"""
+    rates = {'DEXUSAL': {'2024-08-30': 0.6766}}
+    aud_path = tmp_path / 'aud.csv'
+    us_path = tmp_path / 'us.csv'
+    aud_path.write_bytes((test_data_path / 'mixed_statements' / 'test_AUD_statement.csv').read_bytes())
+    us_path.write_bytes((test_data_path / 'mixed_statements' / 'valid_statement.csv').read_bytes())
+    store_dir = tmp_path / 'store'
+
+    first_provider = RecordingProvider(rates)
+    first = StatementMerger(rate_provider=first_provider, store_dir=store_dir).merge_statements([aud_path, us_path])
+    assert first_provider.requests == ['DEXUSAL']
+
+    # A new merger (a later run) loads both files from the store without fetching rates
+    progress = []
+    second_provider = RecordingProvider(rates)
+    second = StatementMerger(rate_provider=second_provider, store_dir=store_dir).merge_statements(
+        [aud_path, us_path], progress_callback=lambda file_path, stage: progress.append((file_path, stage))
+    )
+    assert second_provider.requests == []
+    assert progress == [(aud_path, 'cached'), (us_path, 'cached'), (None, 'merge')]
+    pd.testing.assert_frame_equal(second, first)
+
+    # Editing a file only reprocesses that file
+    us_path.write_text(us_path.read_text().replace('Test', 'Edited'))
+    progress.clear()
+    third = StatementMerger(rate_provider=RecordingProvider(rates), store_dir=store_dir).merge_statements(
+        [aud_path, us_path], progress_callback=lambda file_path, stage: progress.append((file_path, stage))
+    )
+    assert progress == [(aud_path, 'cached'), (us_path, 'read'), (None, 'merge')]
+    assert (third['Product Details'] == 'Edited').any()
+
+
+def test_incremental_merge_keys_on_fill_policy(test_data_path, tmp_path):
+    """Test results stored with one fill policy are not reused with another"""
+    aud_path = test_data_path / 'non_us_statements' / 'test_AUD_statement.csv'
+    rates = {'DEXUSAL': {'2024-08-30': 0.6766}}
+    StatementMerger(rate_provider=InMemoryRateProvider(rates), store_dir=tmp_path).merge_statements(aud_path)
+
+    provider = RecordingProvider(rates)
+    StatementMerger(rate_provider=provider, store_dir=tmp_path, fill_policy=None).merge_statements(aud_path)
+
+    assert provider.requests == ['DEXUSAL']
+
+
+def test_incremental_merge_keys_on_rate_source(test_data_path, tmp_path):
+    """Test results stored with one set of rates are not reused with other rates"""
+    aud_path = test_data_path / 'non_us_statements' / 'test_AUD_statement.csv'
+    first = StatementMerger(rate_provider=InMemoryRateProvider({'DEXUSAL': {'2024-08-30': 0.6766}}),
+                            store_dir=tmp_path).merge_statements(aud_path)
+
+    provider = RecordingProvider({'DEXUSAL': {'2024-08-30': 0.7}})
+    second = StatementMerger(rate_provider=provider, store_dir=tmp_path).merge_statements(aud_path)
+
+    assert provider.requests == ['DEXUSAL']
+    assert second['Total (USD)'].iloc[0] != first['Total (USD)'].iloc[0]
+
+
+def test_incremental_merge_skips_unsettled_statements(test_data_path, tmp_path):
+    """Test statements with dates inside the rate settle window are converted again on the next run"""
+    statement = (test_data_path / 'non_us_statements' / 'test_AUD_statement.csv').read_text(encoding='utf-8-sig')
+    header, row = statement.strip().splitlines()[:2]
+    today = pd.Timestamp.today().normalize()
+    recent_path = tmp_path / 'recent.csv'
+    recent_path.write_text('\n'.join([header, ','.join([f'{today.day}/{today.month}/{today.year}'] + row.split(',')[1:])]))
+    rates = {'DEXUSAL': pd.Series(0.6766, index=pd.date_range(today - pd.Timedelta(days=10), today))}
+    store_dir = tmp_path / 'store'
+
+    StatementMerger(rate_provider=InMemoryRateProvider(rates), store_dir=store_dir).merge_statements(recent_path)
+    provider = RecordingProvider(rates)
+    StatementMerger(rate_provider=provider, store_dir=store_dir).merge_statements(recent_path)
+
+    assert provider.requests == ['DEXUSAL']
+
+
+def test_date_format_detected_from_whole_column(test_data_path, tmp_path):
+    """Test an ambiguous first date does not decide the format, and US-dated statements are still converted"""
+    statement = (test_data_path / 'non_us_statements' / 'test_AUD_statement.csv').read_text(encoding='utf-8-sig')
+    header, row = statement.strip().splitlines()[:2]
+    row_values = row.split(',')
+    day_first_path = tmp_path / 'day_first.csv'
+    day_first_path.write_text('\n'.join([header,
+                                         ','.join(['03/04/2024'] + row_values[1:]),
+                                         ','.join(['25/04/2024'] + row_values[1:])]))
+    us_dates_path = tmp_path / 'us_dates.csv'
+    us_dates_path.write_text('\n'.join([header, ','.join(['4/25/2024'] + row_values[1:])]))
+
+    merger = StatementMerger(rate_provider=InMemoryRateProvider({'DEXUSAL': {'2024-04-03': 0.5, '2024-04-25': 0.5}}))
+    merged_data = merger.merge_statements([day_first_path, us_dates_path])
+
+    assert merged_data['Date'].tolist() == ['4/03/2024', '4/25/2024', '4/25/2024']
+    assert 'Total (AUD)' not in merged_data.columns
+    assert merger.date_formats == {day_first_path: 'DD/MM/YYYY', us_dates_path: 'MM/DD/YYYY'}
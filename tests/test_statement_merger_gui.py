@@ -2,7 +2,7 @@ import os
 import sys
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 from PyQt6 import QtWidgets, QtCore
 
 # Add the parent directory to the path to import from the src package
@@ -10,6 +10,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from UI.base_window import BaseWindow
 from UI.statement_merger_gui import MainWindow
+from UI.merge_worker import MergeWorker
+from src.statement_merger import MergeCancelled
 
 
 @pytest.fixture
@@ -26,20 +28,17 @@ def base_window(qtbot, monkeypatch):
     """
     Creates a BaseWindow instance with mocked UI components for testing.
     """
-    # Mock the resource_path function to avoid file path issues during testing
-    with patch('UI.base_window.resource_path', return_value=os.path.join("UI", "window.ui")):
-        # Mock the loadUi function to avoid actual UI loading
-        with patch('PyQt6.uic.loadUi'):
-            window = BaseWindow()
+    # The UI is precompiled (UI/ui_window.py), so no .ui file is loaded here
+    window = BaseWindow()
 
-            # Create mock UI elements as they appear in your code
-            window.button_choose_statements = MagicMock()
-            window.input_file_selection = MagicMock()
-            window.text_edit_file_list = MagicMock()
+    # Create mock UI elements as they appear in your code
+    window.button_choose_statements = MagicMock()
+    window.input_file_selection = MagicMock()
+    window.text_edit_file_list = MagicMock()
 
-            # Add window to qtbot
-            qtbot.addWidget(window)
-            return window
+    # Add window to qtbot
+    qtbot.addWidget(window)
+    return window
 
 
 def test_choose_button_exists(base_window):
@@ -162,4 +161,73 @@ def test_sequential_file_selections(base_window, monkeypatch):
 
     # Check text field updated with new files only (as per your code)
     expected_text = "\n".join(more_files)
-    base_window.text_edit_file_list.setText.assert_called_once_with(expected_text)
\ No newline at end of file
+    base_window.text_edit_file_list.setText.assert_called_once_with(expected_text)
+
+def test_merge_worker_reports_progress_and_result(qtbot):
+    """
+    Test that the worker forwards merge progress and emits the merged result.
+    """
+    merged = MagicMock()
+
+    def merge_statements(file_paths, progress_callback, is_cancelled):
+        progress_callback(Path("/path/to/file1.csv"), 'read')
+        progress_callback(None, 'merge')
+        return merged
+
+    merger = MagicMock()
+    merger.merge_statements.side_effect = merge_statements
+
+    worker = MergeWorker(merger, ["/path/to/file1.csv"])
+    messages = []
+    worker.progress.connect(messages.append)
+
+    with qtbot.waitSignal(worker.finished) as blocker:
+        worker.run()
+
+    assert blocker.args == [merged]
+    assert messages == ["Read: file1.csv", "Merged statements"]
+
+
+def test_merge_worker_cancel(qtbot):
+    """
+    Test that cancelling the worker makes the merge stop with the cancelled signal.
+    """
+    def merge_statements(file_paths, progress_callback, is_cancelled):
+        if is_cancelled():
+            raise MergeCancelled("Merge cancelled")
+
+    merger = MagicMock()
+    merger.merge_statements.side_effect = merge_statements
+
+    worker = MergeWorker(merger, ["/path/to/file1.csv"])
+    worker.cancel()
+
+    with qtbot.waitSignal(worker.cancelled):
+        worker.run()
+
+
+def test_merge_worker_failure(qtbot):
+    """
+    Test that processing errors are reported through the failed signal.
+    """
+    merger = MagicMock()
+    merger.merge_statements.side_effect = Exception("Error processing file1.csv: Missing required columns")
+
+    worker = MergeWorker(merger, ["/path/to/file1.csv"])
+
+    with qtbot.waitSignal(worker.failed) as blocker:
+        worker.run()
+
+    assert "Missing required columns" in blocker.args[0]
+
+
+def test_precompiled_ui_widgets(qtbot):
+    """
+    Test that the precompiled UI creates the widgets the windows look up by name.
+    """
+    window = MainWindow()
+    qtbot.addWidget(window)
+
+    assert window.findChild(QtWidgets.QPushButton, "buttonAddStatements") is not None
+    assert window.findChild(QtWidgets.QTextBrowser, "fileListTextEdit") is not None
+    assert window.process_button is not None
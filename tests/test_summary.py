@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.generator import offline_provider, write_statements
+from src.statement_merger import StatementMerger
+from src.summary import AMOUNT_COLUMNS, combine_aggregates, partial_aggregate, summarize
+
+CURRENCIES = ['AUD', 'CAD', 'USD']
+
+
+@pytest.fixture
+def statement_paths(tmp_path):
+    return write_statements(tmp_path / 'statements', 6, 500, CURRENCIES, days=60, start='2024-01-01')
+
+
+@pytest.fixture
+def merger():
+    return StatementMerger(rate_provider=offline_provider(CURRENCIES, days=60, start='2024-01-01'))
+
+
+def test_summary_by_month_and_marketplace(merger, statement_paths):
+    merged_data = merger.merge_statements(statement_paths)
+
+    summary = merger.summarize(by=['month', 'marketplace'])
+
+    assert list(summary.index.get_level_values('month').unique()) == ['2024-01', '2024-02']
+    assert set(summary.index.get_level_values('marketplace')) == {'AU', 'CA', 'US'}
+    assert summary['Rows'].sum() == len(merged_data)
+    np.testing.assert_allclose(summary[AMOUNT_COLUMNS].sum(), merged_data[AMOUNT_COLUMNS].sum(), atol=0.01)
+
+    total = merger.summarize(by=[])
+    expected_percent = -merged_data['Amazon fees'].sum() / merged_data['Total product charges'].sum() * 100
+    assert total['Fees % of product charges'].iloc[0] == pytest.approx(expected_percent, abs=0.005)
+
+
+def test_partials_combine_to_the_full_summary(merger, statement_paths):
+    merger.merge_statements(statement_paths)
+    full = merger.summarize(by=['Transaction type', 'marketplace'])
+
+    partials = list(merger.aggregate(per_file=True).values())
+    combined = merger.summarize(by=['Transaction type', 'marketplace'], partials=partials)
+
+    pd.testing.assert_frame_equal(combined, full, check_index_type=False, check_categorical=False)
+
+
+def test_monthly_partials_build_a_yearly_report(merger, statement_paths):
+    monthly = [StatementMerger(rate_provider=merger.data_processor.rate_provider) for _ in statement_paths[:2]]
+    partials = []
+    for monthly_merger, path in zip(monthly, statement_paths[:2]):
+        monthly_merger.merge_statements(path)
+        partials.append(monthly_merger.aggregate())
+
+    yearly = summarize(combine_aggregates(partials), by=['marketplace'])
+
+    assert yearly['Rows'].to_dict() == {'AU': 500, 'CA': 500}
+
+
+def test_rows_without_a_date_are_kept():
+    statement_data = pd.DataFrame({
+        'Date': ['1/5/2024', None],
+        'Transaction type': pd.Categorical(['Order Payment', 'Transfer']),
+        'Total product charges': [10.0, 0.0],
+        'Total promotional rebates': [0.0, 0.0],
+        'Amazon fees': [-1.5, 0.0],
+        'Other': [0.0, -20.0],
+        'Total (USD)': [8.5, -20.0]
+    })
+
+    summary = summarize(partial_aggregate(statement_data, 'US'), by=['month'])
+
+    assert summary['Rows'].tolist() == [1, 1]
+    assert summary['Fees % of product charges'].iloc[0] == 15.0
+    assert np.isnan(summary['Fees % of product charges'].iloc[1])
+
+
+def test_unknown_summary_key(merger, statement_paths):
+    merger.merge_statements(statement_paths[:1])
+
+    with pytest.raises(ValueError, match="Unknown summary key"):
+        merger.summarize(by=['week'])
+
+
+def test_summary_needs_merged_data(merger):
+    with pytest.raises(ValueError, match="No merged data to aggregate"):
+        merger.summarize()
+
+
+def test_store_keeps_marketplaces(statement_paths, tmp_path):
+    pytest.importorskip('pyarrow')
+    provider = offline_provider(CURRENCIES, days=60, start='2024-01-01')
+    StatementMerger(rate_provider=provider, store_dir=tmp_path / 'store').merge_statements(statement_paths)
+
+    merger = StatementMerger(rate_provider=provider, store_dir=tmp_path / 'store')
+    merger.merge_statements(statement_paths)
+
+    assert merger.summarize(by=['marketplace'])['Rows'].to_dict() == {'AU': 1000, 'CA': 1000, 'US': 1000}